@@ -1,11 +1,57 @@
-import re, nltk, random
+import copy, os, re, nltk, random
 from nltk.corpus import words
 from nltk import pos_tag
 from typing import Any, Dict, Optional, Tuple, List, Union
 import textarena as ta
 
-nltk.download("words")
-nltk.download('averaged_perceptron_tagger_eng')
+# The noun filter (pos_tag over the whole word list) runs once per list and version: the result
+# is stored as a plain-text artifact and shared by every env in the process. The spymaster's
+# clue index (src/codenames_index.py) loads this module and uses the same loader.
+WORD_LIST_VERSION = 1
+CACHE_DIR = os.getenv("MINDGAMES_CACHE_DIR", os.path.expanduser("~/.cache/mindgames"))
+_WORD_LISTS: Dict[Tuple[bool, str], List[str]] = {}  # (hardcore, cache dir) -> noun list
+
+
+def load_noun_list(hardcore: bool = False, cache_dir: Optional[str] = None) -> List[str]:
+    """Board words: nouns shorter than 8 letters from the NLTK 'en-basic' (or 'en') list. `cache_dir` defaults to CACHE_DIR."""
+    cache_dir = cache_dir or CACHE_DIR
+    if (hardcore, cache_dir) in _WORD_LISTS: return _WORD_LISTS[hardcore, cache_dir]
+    name = "en" if hardcore else "en-basic"
+    path = os.path.join(cache_dir, f"codenames_nouns_v{WORD_LIST_VERSION}_{name}.txt")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f: word_list = f.read().splitlines()
+    else:
+        nltk.download("words", quiet=True)
+        nltk.download("averaged_perceptron_tagger_eng", quiet=True)
+        all_words = words.words(name)
+        noun_mask = [tag == "NN" for _, tag in pos_tag(all_words)]
+        word_list = [w for w, is_noun in zip(all_words, noun_mask) if is_noun and len(w) < 8]
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"  # parallel workers may build it at the same time
+            with open(tmp, "w", encoding="utf-8") as f: f.write("\n".join(word_list))
+            os.replace(tmp, path)
+        except OSError: pass  # read-only cache dir: keep the in-memory copy only
+    _WORD_LISTS[hardcore, cache_dir] = word_list
+    return word_list
+
+
+class CodenamesSnapshot:
+    """
+    Rules state of one game for lookahead: turn bookkeeping and the game state (whose
+    turn, guessed words, last clue, guesses left). The board never changes during a game
+    and is shared, and the observation log is not part of it. Immutable, so one snapshot
+    can be restored any number of times and shared between forks.
+    """
+    __slots__ = ("turn", "current_player_id", "done", "rewards", "error_count", "game_info", "end_by_invalid", "board", "game_state")
+
+    def __init__(self, env: "CodenamesEnv"):
+        state = env.state
+        self.turn, self.current_player_id, self.done, self.error_count = state.turn, state.current_player_id, state.done, state.error_count
+        self.rewards = None if state.rewards is None else tuple(state.rewards.items())
+        self.game_info = tuple((pid, tuple(info.items())) for pid, info in state.game_info.items())
+        self.end_by_invalid, self.board = state.end_by_invalid, env.board
+        self.game_state = tuple((key, frozenset(value) if key == "guessed_words" else value) for key, value in state.game_state.items())
 
 
 class CodenamesEnv(ta.Env):
@@ -13,9 +59,7 @@ class CodenamesEnv(ta.Env):
         self._load_word_list(hardcore=hardcore)
 
     def _load_word_list(self, hardcore: bool = False) -> None:
-        word_list = words.words("en-basic" if not hardcore else "en")
-        noun_mask = [tag == "NN" for _, tag in pos_tag(word_list)]
-        self.word_list = [w for w, is_noun in zip(word_list, noun_mask) if is_noun and len(w) < 8]
+        self.word_list = load_noun_list(hardcore=bool(hardcore))
 
     def reset(self, num_players: int, seed: Optional[int] = None):
         assert num_players==4, f"The number of players must be exactly 4. Received {num_players}"
@@ -26,6 +70,28 @@ class CodenamesEnv(ta.Env):
         self.state.reset(game_state={"turn": 0, "team_turn": 0, "guessed_words": set(), "last_clue": None, "last_number": 0}, player_prompt_function=self._prompt)
         self.state.add_observation(message=self._render_player_view(), observation_type=ta.ObservationType.GAME_BOARD)
 
+    def snapshot(self) -> CodenamesSnapshot:
+        return CodenamesSnapshot(self)
+
+    def restore(self, snapshot: CodenamesSnapshot):
+        """Rewind the game to `snapshot`; observations logged since then are kept."""
+        state = self.state
+        state.turn, state.current_player_id, state.done, state.error_count = snapshot.turn, snapshot.current_player_id, snapshot.done, snapshot.error_count
+        state.rewards = None if snapshot.rewards is None else dict(snapshot.rewards)
+        state.game_info = {pid: dict(info) for pid, info in snapshot.game_info}
+        state.end_by_invalid, state.made_invalid_move, state.step_info = snapshot.end_by_invalid, False, {}
+        state.game_state = {key: set(value) if key == "guessed_words" else value for key, value in snapshot.game_state}
+        self.board = snapshot.board
+
+    def fork(self, snapshot: Optional[CodenamesSnapshot] = None) -> "CodenamesEnv":
+        """Independent copy of this game (or of `snapshot`) with an empty observation log, for playing moves ahead under the real rules."""
+        env = copy.copy(self)
+        env.state = copy.copy(self.state)
+        env.state.observations = {pid: [] for pid in self.state.observations}
+        env.state.logs = []
+        env.restore(snapshot or CodenamesSnapshot(self))
+        return env
+
     def _render_player_view(self): #, spymaster: bool = False, guessed_words: set = None):
         view = "Codenames Words:\n"
         for word in list(self.board.keys()):
@@ -4,6 +4,25 @@ from typing import Any, Dict, Optional, Tuple
 import textarena as ta
 from textarena.envs.ColonelBlotto.renderer import create_game_str
 
+
+class BlottoSnapshot:
+    """
+    Rules state of one game for lookahead: turn bookkeeping, round, scores and the units
+    placed this round. The observation log is not part of it. Immutable, so one snapshot
+    can be restored any number of times and shared between forks.
+    """
+    __slots__ = ("turn", "current_player_id", "done", "rewards", "error_count", "game_info", "current_round", "scores", "units", "allocated")
+
+    def __init__(self, env: "ColonelBlottoEnv"):
+        state, gs = env.state, env.state.game_state
+        self.turn, self.current_player_id, self.done, self.error_count = state.turn, state.current_player_id, state.done, state.error_count
+        self.rewards = None if state.rewards is None else tuple(state.rewards.items())
+        self.game_info = tuple((pid, tuple(info.items())) for pid, info in state.game_info.items())
+        self.current_round = gs['current_round']
+        self.scores = (gs['scores'][0], gs['scores'][1])
+        self.units = tuple((field['player_0_units'], field['player_1_units']) for field in gs['fields'])
+        self.allocated = (gs['player_states'][0]['allocation_complete'], gs['player_states'][1]['allocation_complete'])
+
 class ColonelBlottoEnv(ta.Env):
     def __init__(self, num_fields: int = 3, num_total_units: int = 20, num_rounds: int = 10):
         """
@@ -55,6 +74,34 @@ class ColonelBlottoEnv(ta.Env):
         # self.state.add_observation(to_id=1-self.state.current_player_id, message=f"Current game state:\n{self._render_game_state()}", observation_type=ta.ObservationType.GAME_BOARD)
         return self.state.step()
 
+    def snapshot(self) -> BlottoSnapshot:
+        return BlottoSnapshot(self)
+
+    def restore(self, snapshot: BlottoSnapshot):
+        """Rewind the game to `snapshot`; observations logged since then are kept."""
+        state = self.state
+        state.turn, state.current_player_id, state.done, state.error_count = snapshot.turn, snapshot.current_player_id, snapshot.done, snapshot.error_count
+        state.rewards = None if snapshot.rewards is None else dict(snapshot.rewards)
+        state.game_info = {pid: dict(info) for pid, info in snapshot.game_info}
+        state.made_invalid_move, state.step_info = False, {}
+        state.game_state = {
+            'fields': [{'name': name, 'value': 1, 'player_0_units': u0, 'player_1_units': u1} for name, (u0, u1) in zip(self.field_names, snapshot.units)],
+            'current_round': snapshot.current_round, 'scores': {0: snapshot.scores[0], 1: snapshot.scores[1]},
+            'player_states': {
+                pid: {'units_remaining': 0 if done else self.num_total_units, 'current_allocation': {name: units[pid] for name, units in zip(self.field_names, snapshot.units)}, 'allocation_complete': done}
+                for pid, done in enumerate(snapshot.allocated)
+            },
+        }
+
+    def fork(self, snapshot: Optional[BlottoSnapshot] = None) -> "ColonelBlottoEnv":
+        """Independent copy of this game (or of `snapshot`) with an empty observation log, for playing moves ahead under the real rules."""
+        env = copy.copy(self)
+        env.state = copy.copy(self.state)
+        env.state.observations = {pid: [] for pid in self.state.observations}
+        env.state.logs = []
+        env.restore(snapshot or BlottoSnapshot(self))
+        return env
+
     def _execute_player_move(self, action: str):
         """Parse the action to find the requested allocation. If valid, make the allocation, otherwise set it as an invalid move"""            
         allocation_dict = self._parse_allocation_input(action)
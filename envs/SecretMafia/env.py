@@ -1,5 +1,5 @@
 from enum import Enum
-import re, random
+import copy, re, random
 from typing import Tuple, Dict, Optional, List
 import textarena as ta
 
@@ -95,6 +95,28 @@ class VoteHandler:
         top_players = [pid for pid, c in counts.items() if c == top_score] # All players who received the top score (could be 1 or many)
         return random.choice(top_players) # Randomly resolve ties
 
+class MafiaSnapshot:
+    """
+    Rules state of one game for lookahead: turn bookkeeping, phase, speaking queue, alive
+    players, votes and the pending night kill. Roles are fixed at reset and shared, and the
+    observation log is not part of it. Immutable, so one snapshot can be restored any
+    number of times and shared between forks. The global `random` stream (tie-breaks,
+    speaking order) is not rewound.
+    """
+    __slots__ = ("turn", "current_player_id", "done", "rewards", "error_count", "game_info", "end_by_invalid", "phase", "next_player_ids", "game_state")
+
+    def __init__(self, env: "SecretMafiaEnv"):
+        state = env.state
+        self.turn, self.current_player_id, self.done, self.error_count = state.turn, state.current_player_id, state.done, state.error_count
+        self.rewards = None if state.rewards is None else tuple(state.rewards.items())
+        self.game_info = tuple((pid, tuple(info.items())) for pid, info in state.game_info.items())
+        self.end_by_invalid, self.phase, self.next_player_ids = state.end_by_invalid, env.phase, tuple(env.next_player_ids)
+        self.game_state = tuple(
+            (key, tuple(value) if key == "alive_players" else tuple(value.items()) if key == "votes" else value)
+            for key, value in state.game_state.items()
+        )
+
+
 class SecretMafiaEnv(ta.Env):
     voting_pattern = re.compile(r".*\[(?:player\s*)?(\d+)\].*", re.IGNORECASE)
     _ROLE_FACTORY = {
@@ -131,6 +153,28 @@ class SecretMafiaEnv(ta.Env):
         self.state.manually_set_current_player_id(self.next_player_ids.pop())
     
 
+    def snapshot(self) -> MafiaSnapshot:
+        return MafiaSnapshot(self)
+
+    def restore(self, snapshot: MafiaSnapshot):
+        """Rewind the game to `snapshot`; observations logged since then are kept."""
+        state = self.state
+        state.turn, state.current_player_id, state.done, state.error_count = snapshot.turn, snapshot.current_player_id, snapshot.done, snapshot.error_count
+        state.rewards = None if snapshot.rewards is None else dict(snapshot.rewards)
+        state.game_info = {pid: dict(info) for pid, info in snapshot.game_info}
+        state.end_by_invalid, state.made_invalid_move, state.step_info = snapshot.end_by_invalid, False, {}
+        state.game_state = {key: list(value) if key == "alive_players" else dict(value) if key == "votes" else value for key, value in snapshot.game_state}
+        self.phase, self.next_player_ids = snapshot.phase, list(snapshot.next_player_ids)
+
+    def fork(self, snapshot: Optional[MafiaSnapshot] = None) -> "SecretMafiaEnv":
+        """Independent copy of this game (or of `snapshot`) with an empty observation log, for playing moves ahead under the real rules."""
+        env = copy.copy(self)
+        env.state = copy.copy(self.state)
+        env.state.observations = {pid: [] for pid in self.state.observations}
+        env.state.logs = []
+        env.restore(snapshot or MafiaSnapshot(self))
+        return env
+
     def _assign_roles(self, num_players: int):
         self.player_roles = {}
         self.roles = {}                              # <- NEW
@@ -1,9 +1,30 @@
-import itertools, re
+import copy, itertools, re
 from typing import Any, Dict, Optional, Tuple
 
 import textarena as ta
 
 
+class IPDSnapshot:
+    """
+    Rules state of one match for lookahead: turn bookkeeping, eliminations and the game
+    state (round, phase, decisions, scores, who has acted). The observation log is not
+    part of it. Immutable, so one snapshot can be restored any number of times and shared
+    between forks.
+    """
+    __slots__ = ("turn", "current_player_id", "done", "rewards", "error_count", "game_info", "elimination_order", "end_by_invalid", "game_state")
+
+    def __init__(self, env: "ThreePlayerIPDEnv"):
+        state = env.state
+        self.turn, self.current_player_id, self.done, self.error_count = state.turn, state.current_player_id, state.done, state.error_count
+        self.rewards = None if state.rewards is None else tuple(state.rewards.items())
+        self.game_info = tuple((pid, tuple(info.items())) for pid, info in state.game_info.items())
+        self.elimination_order, self.end_by_invalid = tuple(state.elimination_order), state.end_by_invalid
+        self.game_state = tuple(
+            (key, tuple((p, tuple(row.items())) for p, row in value.items()) if key == "decisions" else tuple(value.items()) if isinstance(value, dict) else value)
+            for key, value in state.game_state.items()
+        )
+
+
 class ThreePlayerIPDEnv(ta.Env):
     def __init__(self, num_rounds: int=5, communication_turns: int=3, cooperate_reward: int=3, defect_reward: int=5, sucker_reward: int=0, mutual_defect_reward: int=1):
         self.num_rounds = num_rounds
@@ -46,6 +67,31 @@ class ThreePlayerIPDEnv(ta.Env):
         return self.state.step()
     
 
+    def snapshot(self) -> IPDSnapshot:
+        return IPDSnapshot(self)
+
+    def restore(self, snapshot: IPDSnapshot):
+        """Rewind the match to `snapshot`; observations logged since then are kept."""
+        state = self.state
+        state.turn, state.current_player_id, state.done, state.error_count = snapshot.turn, snapshot.current_player_id, snapshot.done, snapshot.error_count
+        state.rewards = None if snapshot.rewards is None else dict(snapshot.rewards)
+        state.game_info = {pid: dict(info) for pid, info in snapshot.game_info}
+        state.elimination_order, state.end_by_invalid = list(snapshot.elimination_order), snapshot.end_by_invalid
+        state.made_invalid_move, state.step_info = False, {}
+        state.game_state = {
+            key: {p: dict(row) for p, row in value} if key == "decisions" else dict(value) if isinstance(value, tuple) else value
+            for key, value in snapshot.game_state
+        }
+
+    def fork(self, snapshot: Optional[IPDSnapshot] = None) -> "ThreePlayerIPDEnv":
+        """Independent copy of this match (or of `snapshot`) with an empty observation log, for playing moves ahead under the real rules."""
+        env = copy.copy(self)
+        env.state = copy.copy(self.state)
+        env.state.observations = {pid: [] for pid in self.state.observations}
+        env.state.logs = []
+        env.restore(snapshot or IPDSnapshot(self))
+        return env
+
     def _clean_message(self, msg: str) -> str: return re.sub(r"\s+", " ", msg) # 1-2. strip() → remove edge whitespace; regex → collapse the rest
     def _conversation_phase(self, msg: str):
         cid = self.state.current_player_id
@@ -0,0 +1,116 @@
+import re
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from move_validation import _CLUE, _GUESS, _ipd_token, _parse_allocation_input, _untag
+from observation_parser import ObservationParser
+
+# Canonical action keys and interning. The same move comes back from the LLM in many
+# spellings ("[A:5, B:10, C:5]", "[A5 B10 C5]", "<action>[A:5,B:10,C:5]</action>"); each
+# game maps a move to a small structural key, and `ActionTable` gives every distinct
+# (role, key) one integer id, so branches become short int tuples for dedup and crossover.
+
+Key = Hashable
+
+
+def _text_key(action: str) -> Key:
+    return ("text", " ".join(action.lower().split()))
+
+
+def blotto_key(action: str, state, role: str = "agent") -> Key:
+    """Allocation as a tuple of units per field (omitted fields are 0, as in the env)."""
+    allocation = _parse_allocation_input(state, action)
+    if allocation is None:
+        return _text_key(action)
+    return ("alloc",) + tuple(sorted(allocation.items()))
+
+
+def ipd_key(action: str, state, role: str = "agent") -> Key:
+    """Decision map {opponent: cooperate?}; our own decisions include the env's default 'cooperate'."""
+    choices = {}
+    for pid, choice in _ipd_token().findall(action):
+        choices[int(pid)] = not choice.lower().startswith("d")
+    if not choices:
+        return _text_key(action)
+    me = state.me if role == "agent" else None
+    if me is not None:
+        choices = {p: choices.get(p, True) for p in range(3) if p != me}
+    return ("decide",) + tuple(sorted(choices.items()))
+
+
+def codenames_key(action: str, state, role: str = "agent") -> Key:
+    """('clue', word, n) or ('guess', word), lower-cased."""
+    m = _CLUE.search(action)
+    if m:
+        return ("clue", m.group(1).lower(), int(m.group(2)))
+    m = _GUESS.search(action)
+    if m:
+        return ("guess", m.group(1).lower())
+    return _text_key(action)
+
+
+_MAFIA_TARGET = re.compile(r"^\[\s*(?:player\s*)?(\d+)\s*\]$", re.I)
+
+
+def mafia_key(action: str, state, role: str = "agent") -> Key:
+    """('vote', player id) for a bare '[X]' / '[Player X]' target; discussion is keyed by its text."""
+    m = _MAFIA_TARGET.match(action.strip())
+    if m:
+        return ("vote", int(m.group(1)))
+    return _text_key(action)
+
+
+CANONICALIZERS: Dict[str, Callable[..., Key]] = {
+    "colonel blotto": blotto_key,
+    "3-player iterated prisoner's dilemma": ipd_key,
+    "codenames": codenames_key,
+    "secret mafia": mafia_key,
+}
+
+
+class ActionTable:
+    """
+    Interns tree steps as small integer ids: equal moves in any spelling share one id,
+    which keeps the first spelling seen. Lives for one episode.
+
+    Args:
+        game (str): Game name; selects the canonicalizer (unknown games key by text).
+        parser (ObservationParser, optional): The episode's parser; some keys need its state.
+    """
+
+    def __init__(self, game: str, parser: Optional[ObservationParser] = None):
+        self.game = game
+        self.parser = parser
+        self._key_fn = CANONICALIZERS.get(game)
+        self.ids: Dict[Tuple[str, Key], int] = {}
+        self.steps: List[str] = []
+
+    def key(self, action: str, role: str = "agent") -> Tuple[str, Key]:
+        """(role, canonical key) of a bare or tagged action."""
+        tag_role, bare = _untag(action)
+        role = tag_role or role
+        if self._key_fn is None or bare == "pass":
+            return role, _text_key(bare)
+        state = self.parser.state if self.parser is not None else None
+        return role, self._key_fn(bare, state, role)
+
+    def intern(self, step: str) -> int:
+        """Id of a tagged tree step, allocating one for a new move."""
+        k = self.key(step)
+        i = self.ids.get(k)
+        if i is None:
+            i = self.ids[k] = len(self.steps)
+            self.steps.append(step.strip())
+        return i
+
+    def encode(self, branch: Sequence[str]) -> Tuple[int, ...]:
+        return tuple(self.intern(step) for step in branch)
+
+    def decode(self, ids: Sequence[int]) -> List[str]:
+        return [self.steps[i] for i in ids]
+
+    def unique(self, branches: Sequence[Sequence[str]]) -> List[Tuple[int, ...]]:
+        """Encoded branches without duplicates, in first-seen order."""
+        return list(dict.fromkeys(self.encode(b) for b in branches))
+
+    def __len__(self) -> int:
+        return len(self.steps)
@@ -1,14 +1,34 @@
 from abc import ABC, abstractmethod
+import asyncio
+import json
 import os
+import re
+import threading
 import time
-from openai import AzureOpenAI, OpenAI
-from simulation_utils1 import simulate_game_tree, evaluate_best_branch, evaluate_best_branch_old
+import httpx
+from openai import AzureOpenAI, OpenAI, AsyncAzureOpenAI, AsyncOpenAI, BadRequestError, DefaultAsyncHttpxClient
+from completion_cache import completion_key
+from singleflight import SingleFlight
+from mcts import MCTS
+from tree_reuse import observed_opponent_move
+from blotto_solver import BlottoSolver, parse_blotto_setup
+from blotto_opponent import BlottoOpponentModel
+from game_router import GENERIC, EpisodeContext, detect_game, strategy_for
+from state_render import TokenReduction, render_state
+from judgment_cache import JudgmentCache
+from simulation_utils import simulate_game_tree, asimulate_game_tree, evaluate_best_branch, evaluate_best_branch_old
 import random
 from dotenv import load_dotenv
 load_dotenv()
 
 STANDARD_GAME_PROMPT = "You are a competitive game player. Make sure you read the game instructions carefully, and always follow the required format. Only output the action in the correct format without any additional text."
 
+# Moves played when the validator rejects every searched branch; the first one it accepts is used
+SAFE_MOVES = {
+    "3-player iterated prisoner's dilemma": ["I will keep cooperating as long as you both do.", "[0 cooperate] [1 cooperate] [2 cooperate]"],
+    "codenames": ["[pass]", "[signal 1]", "[thing 1]", "[idea 1]"],
+}
+
 class UnifiedAIClient:
     def __init__(
         self,
@@ -18,7 +38,10 @@ class UnifiedAIClient:
         api_key=None,
         api_version=None,
         max_tokens=4096,
-        temperature=0.5
+        temperature=0.5,
+        max_connections=64,
+        cache=None,
+        coalesce=True,
     ):
         self.client_type = client_type
         self.endpoint = endpoint or os.getenv("ENDPOINT_URL", "")
@@ -27,6 +50,11 @@ class UnifiedAIClient:
         self.api_version = os.getenv("AZURE_OPENAI_API_VERSION", "")
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.max_connections = max_connections
+        self._async_client = None
+        self.cache = cache  # optional CompletionCache shared by get_completion / aget_completion
+        self.singleflight = SingleFlight() if coalesce else None  # coalesces identical in-flight requests
+        self.supports_n = True  # flipped off the first time the backend rejects the n parameter
 
         if self.client_type == "OpenAI":
             self.client = OpenAI(
@@ -46,48 +74,309 @@ class UnifiedAIClient:
         else:
             raise ValueError("Unsupported client type")
 
-    def get_completion(
-        self,
-        messages,
-        max_tokens=None,
-        temperature=None,
-        max_retries=5,
-        initial_wait=1,
-    ):
-        max_tokens = max_tokens or self.max_tokens
-        temperature = temperature or self.temperature
+    @property
+    def async_client(self):
+        """Async client sharing one pooled HTTP connection pool, created on first use."""
+        if self._async_client is None:
+            http_client = DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                )
+            )
+            if self.client_type == "OpenAI":
+                self._async_client = AsyncOpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY", ""),
+                    http_client=http_client,
+                )
+            elif self.client_type == "AzureOpenAI":
+                self._async_client = AsyncAzureOpenAI(
+                    azure_endpoint=self.endpoint,
+                    api_key=self.api_key,
+                    api_version=self.api_version,
+                    http_client=http_client,
+                )
+            elif self.client_type == "vllm":
+                self._async_client = AsyncOpenAI(
+                    base_url=self.endpoint,
+                    api_key=self.api_key,
+                    http_client=http_client,
+                )
+            else:
+                raise ValueError("Unsupported client type")
+        return self._async_client
+
+    def _prepare_messages(self, messages):
         no_think = ""
         if self.client_type == "vllm":
             no_think = " /no_think"
         
         messages[-1]["content"] = messages[-1]["content"] + no_think
+        return messages
+
+    def _retry_wait(self, e, attempt, max_retries, initial_wait):
+        """Backoff in seconds for a retryable error, or None if the call should give up."""
+        if attempt >= max_retries - 1:
+            return None
+        if "rate limit" in str(e).lower():
+            wait_time = initial_wait * (2**attempt)  # Exponential backoff
+            print(f"Rate limit exceeded. Waiting {wait_time} seconds...")
+            return wait_time
+        if "gateway time-out" in str(e).lower():
+            wait_time = initial_wait * (2**attempt)  # Exponential backoff
+            print(f"Gateway timeout exceeded. Waiting {wait_time} seconds...")
+            return wait_time
+        return None
 
+    def cache_stats(self):
+        """Hit/miss counters of the completion cache, or None when caching is off."""
+        return self.cache.stats() if self.cache is not None else None
+
+    def coalesce_stats(self):
+        """How many calls went through the coalescing layer and how many were suppressed as duplicates."""
+        return self.singleflight.stats() if self.singleflight is not None else None
+
+    def _request_kwargs(self, messages, max_tokens, temperature, n=1):
+        kwargs = dict(
+            model=self.deployment,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=0.95,
+            frequency_penalty=0,
+            presence_penalty=0,
+        )
+        if n > 1:
+            kwargs["n"] = n
+        return kwargs
+
+    def _n_failed(self, e, n):
+        """
+        Give up on one n>1 call. Only a 400 rejecting the `n` parameter turns n off for the
+        client's lifetime; any other error (connection reset, 5xx, exhausted retries) falls
+        back to sequential sampling for this call only.
+        """
+        status = getattr(e, "status_code", None)
+        rejects_n = (isinstance(e, BadRequestError) or status == 400) and (
+            getattr(e, "param", None) == "n" or re.search(r"""['"`]n['"`]|\bn\s*(?:must|should|is|>|=)""", str(e).lower())
+        )
+        if rejects_n:
+            print(f"n={n} sampling rejected ({e}); falling back to sequential sampling.")
+            self.supports_n = False
+        else:
+            print(f"n={n} sampling failed ({e}); sampling this call sequentially.")
+
+    def _request_n(self, messages, n, max_tokens, temperature, max_retries, initial_wait):
+        """`n` samples in one call when the backend allows it, topped up sequentially otherwise."""
+        samples = []
+        if n > 1 and self.supports_n:
+            for attempt in range(max_retries):
+                try:
+                    response = self.client.chat.completions.create(
+                        **self._request_kwargs(messages, max_tokens, temperature, n=n)
+                    )
+                    samples = [c.message.content.strip() for c in response.choices if c.message.content]
+                    break
+                except Exception as e:
+                    wait_time = self._retry_wait(e, attempt, max_retries, initial_wait)
+                    if wait_time is None:
+                        self._n_failed(e, n)
+                        break
+                    time.sleep(wait_time)
+        while len(samples) < n:
+            samples.append(self._request(messages, max_tokens, temperature, max_retries, initial_wait))
+        return samples
+
+    async def _arequest_n(self, messages, n, max_tokens, temperature, max_retries, initial_wait):
+        samples = []
+        if n > 1 and self.supports_n:
+            for attempt in range(max_retries):
+                try:
+                    response = await self.async_client.chat.completions.create(
+                        **self._request_kwargs(messages, max_tokens, temperature, n=n)
+                    )
+                    samples = [c.message.content.strip() for c in response.choices if c.message.content]
+                    break
+                except Exception as e:
+                    wait_time = self._retry_wait(e, attempt, max_retries, initial_wait)
+                    if wait_time is None:
+                        self._n_failed(e, n)
+                        break
+                    await asyncio.sleep(wait_time)
+        if len(samples) < n:
+            samples += await asyncio.gather(*[
+                self._arequest(messages, max_tokens, temperature, max_retries, initial_wait)
+                for _ in range(n - len(samples))
+            ])
+        return samples
+
+    def _request(self, messages, max_tokens, temperature, max_retries, initial_wait):
         for attempt in range(max_retries):
             try:
                 response = self.client.chat.completions.create(
-                    model=self.deployment,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    top_p=0.95,
-                    frequency_penalty=0,
-                    presence_penalty=0,
+                    **self._request_kwargs(messages, max_tokens, temperature)
                 )
                 return response.choices[0].message.content.strip()
             except Exception as e:
-                if "rate limit" in str(e).lower() and attempt < max_retries - 1:
-                    wait_time = initial_wait * (2**attempt)  # Exponential backoff
-                    print(f"Rate limit exceeded. Waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-                elif "gateway time-out" in str(e).lower() and attempt < max_retries - 1:
-                    wait_time = initial_wait * (2**attempt)  # Exponential backoff
-                    print(f"Gateway timeout exceeded. Waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-                else:
+                wait_time = self._retry_wait(e, attempt, max_retries, initial_wait)
+                if wait_time is None:
                     print(f"Error: {e}")
                     return ''
+                time.sleep(wait_time)
+
+    async def _arequest(self, messages, max_tokens, temperature, max_retries, initial_wait):
+        for attempt in range(max_retries):
+            try:
+                response = await self.async_client.chat.completions.create(
+                    **self._request_kwargs(messages, max_tokens, temperature)
+                )
+                return response.choices[0].message.content.strip()
+            except Exception as e:
+                wait_time = self._retry_wait(e, attempt, max_retries, initial_wait)
+                if wait_time is None:
+                    print(f"Error: {e}")
+                    return ''
+                await asyncio.sleep(wait_time)
+
+    def get_completion(
+        self,
+        messages,
+        max_tokens=None,
+        temperature=None,
+        max_retries=5,
+        initial_wait=1,
+        use_cache=True,
+    ):
+        """
+        `use_cache=False` forces a fresh sample: it skips both the completion cache
+        and in-flight coalescing.
+        """
+        max_tokens = max_tokens or self.max_tokens
+        temperature = temperature or self.temperature
+        messages = self._prepare_messages(messages)
+        if not use_cache or (self.cache is None and self.singleflight is None):
+            return self._request(messages, max_tokens, temperature, max_retries, initial_wait)
+
+        key = completion_key(self.deployment, messages, temperature, max_tokens)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        def fetch():
+            content = self._request(messages, max_tokens, temperature, max_retries, initial_wait)
+            if self.cache is not None and content:
+                self.cache.put(key, content)
+            return content
+
+        if self.singleflight is not None:
+            return self.singleflight.do(key, fetch)
+        return fetch()
+
+    async def aget_completion(
+        self,
+        messages,
+        max_tokens=None,
+        temperature=None,
+        max_retries=5,
+        initial_wait=1,
+        use_cache=True,
+    ):
+        """Asyncio counterpart of `get_completion`; backoff does not block the event loop."""
+        max_tokens = max_tokens or self.max_tokens
+        temperature = temperature or self.temperature
+        messages = self._prepare_messages(messages)
+        if not use_cache or (self.cache is None and self.singleflight is None):
+            return await self._arequest(messages, max_tokens, temperature, max_retries, initial_wait)
+
+        key = completion_key(self.deployment, messages, temperature, max_tokens)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def fetch():
+            content = await self._arequest(messages, max_tokens, temperature, max_retries, initial_wait)
+            if self.cache is not None and content:
+                self.cache.put(key, content)
+            return content
+
+        if self.singleflight is not None:
+            return await self.singleflight.ado(key, fetch)
+        return await fetch()
+
+    def get_completions(
+        self,
+        messages,
+        n=1,
+        max_tokens=None,
+        temperature=None,
+        max_retries=5,
+        initial_wait=1,
+        use_cache=True,
+    ):
+        """
+        Return `n` sampled completions for one prompt. Uses a single `n=` request where the
+        backend supports it (so the prompt is prefilled once) and sequential calls otherwise.
+        """
+        if n <= 1:
+            return [self.get_completion(messages, max_tokens, temperature, max_retries, initial_wait, use_cache)]
+        max_tokens = max_tokens or self.max_tokens
+        temperature = temperature or self.temperature
+        messages = self._prepare_messages(messages)
+        if not use_cache or (self.cache is None and self.singleflight is None):
+            return self._request_n(messages, n, max_tokens, temperature, max_retries, initial_wait)
+
+        key = completion_key(self.deployment, messages, temperature, max_tokens, n=n)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return json.loads(cached)
+
+        def fetch():
+            samples = self._request_n(messages, n, max_tokens, temperature, max_retries, initial_wait)
+            if self.cache is not None and all(samples):
+                self.cache.put(key, json.dumps(samples))
+            return samples
+
+        if self.singleflight is not None:
+            return self.singleflight.do(key, fetch)
+        return fetch()
+
+    async def aget_completions(
+        self,
+        messages,
+        n=1,
+        max_tokens=None,
+        temperature=None,
+        max_retries=5,
+        initial_wait=1,
+        use_cache=True,
+    ):
+        """Asyncio counterpart of `get_completions`."""
+        if n <= 1:
+            return [await self.aget_completion(messages, max_tokens, temperature, max_retries, initial_wait, use_cache)]
+        max_tokens = max_tokens or self.max_tokens
+        temperature = temperature or self.temperature
+        messages = self._prepare_messages(messages)
+        if not use_cache or (self.cache is None and self.singleflight is None):
+            return await self._arequest_n(messages, n, max_tokens, temperature, max_retries, initial_wait)
+
+        key = completion_key(self.deployment, messages, temperature, max_tokens, n=n)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return json.loads(cached)
+
+        async def fetch():
+            samples = await self._arequest_n(messages, n, max_tokens, temperature, max_retries, initial_wait)
+            if self.cache is not None and all(samples):
+                self.cache.put(key, json.dumps(samples))
+            return samples
+
+        if self.singleflight is not None:
+            return await self.singleflight.ado(key, fetch)
+        return await fetch()
 
 
 class Agent(ABC):
@@ -132,83 +421,418 @@ class GamePlayAgent(Agent):
     """GPT agent class that uses OpenAI's API to generate responses"""
 
     def __init__(
-        self, system_prompt=None, max_tokens=4096, temperature=0.7, max_depth=1, game="Colonel Blotto"
+        self, system_prompt=None, max_tokens=4096, temperature=0.7, max_depth=1, game="Colonel Blotto",
+        concurrent_expansion=True, max_concurrency=16, cache=None, samples_per_node=1,
+        transposition_scope="move", search="tot", mcts_simulations=32, mcts_time_budget=None, mcts_max_depth=4,
+        reuse_tree=True, judgment_cache_path=None, evaluator="listwise", ranking_strategy="bradley_terry",
+        blotto_engine=None, blotto_samples=5, blotto_opponent="model", ipd_engine=True,
+        codenames_engine=None, codenames_clues=5, mafia_beliefs=True,
+        compact_state=False, validate_moves=True,
     ):
         super().__init__()
         self.system_prompt = system_prompt if system_prompt else STANDARD_GAME_PROMPT
         self.max_tokens = max_tokens
         self.temperature = temperature
-        self.pairs = {}
-        self.game = game
-        self.k_per_node = 5
-        self.max_depth = max_depth  # depth of simulation
-        self.openai_client = UnifiedAIClient(client_type="AzureOpenAI", deployment="gpt-4o-mini")
+        self.pairs = JudgmentCache(path=judgment_cache_path)  # pairwise verdicts, scoped per game and evaluator
+        self.evaluator = evaluator  # "listwise": evaluate_best_branch_old, "pairwise": evaluate_best_branch
+        self.ranking_strategy = ranking_strategy  # tournament used by the pairwise evaluator
+        # played when an episode's game cannot be detected; unknown names use generic prompts
+        self.default_game = strategy_for(game.lower())
+        self.max_depth = max_depth  # depth of simulation for the generic strategy
+        self.openai_client = UnifiedAIClient(client_type="AzureOpenAI", deployment="gpt-4o-mini", cache=cache)
+        self.concurrent_expansion = concurrent_expansion  # expand sibling nodes concurrently
+        self.max_concurrency = max_concurrency  # cap on in-flight proposal calls per move
+        self.samples_per_node = samples_per_node  # proposal samples per node, requested with n= in one call
+        # one loop for the agent's lifetime so the async client's connection pool is reused across
+        # moves; it runs in a background thread so episodes played from several threads can share it
+        self._loop = asyncio.new_event_loop() if concurrent_expansion else None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        # "move": transposition table lives for one call, "game": kept for the episode (nodes are keyed
+        # on the parsed state, so positions met again on later turns hit), None: disabled
+        self.transposition_scope = transposition_scope
+        self.search = search  # "tot": exhaustive expansion + evaluator, "mcts": PUCT search over proposals
+        self.mcts_simulations = mcts_simulations
+        self.mcts_time_budget = mcts_time_budget  # seconds; either budget may be None
+        self.mcts_max_depth = mcts_max_depth
+        self.reuse_tree = reuse_tree  # keep the MCTS tree / ToT branches between turns and advance them past the moves played
+        # Colonel Blotto: "solver" plays the exact equilibrium mix, "best_response" plays the best
+        # response to the fitted opponent model, "mixed" adds solver samples to the LLM proposals
+        # before evaluation, None: LLM search only
+        self.blotto_engine = blotto_engine
+        self.blotto_samples = blotto_samples
+        # "model": simulated opponent moves come from the fitted opponent model, None: from the LLM
+        self.blotto_opponent = blotto_opponent
+        self._blotto_solvers = {}
+        self._blotto_lock = threading.Lock()  # concurrent episodes must not solve the same setup twice
+        # games whose registered engine is built for each episode: the 3-player IPD expectimax
+        # engine answers decision turns, the SecretMafia role posterior answers day votes
+        self.engines = {
+            "3-player iterated prisoner's dilemma": bool(ipd_engine),
+            "secret mafia": bool(mafia_beliefs),
+        }
+        # Codenames spymaster: "index" plays the safest clue from the WordNet clue index, "mixed"
+        # adds the top `codenames_clues` index clues to the LLM proposals, None: LLM search only
+        self.codenames_engine = codenames_engine
+        self.codenames_clues = codenames_clues
+        self._clue_index = None
+        self._clue_index_lock = threading.Lock()
+        # search and evaluation prompts see a compact view rendered from the parsed state instead of the raw transcript
+        self.compact_state = compact_state
+        self.token_reduction = TokenReduction(self.openai_client.deployment)
+        # proposals and crossover branches are checked against the env's rules before evaluation
+        self.validate_moves = validate_moves
+        # engine shortcuts per game; each returns an action or None to fall through to the LLM search
+        self._engine_moves = {
+            "colonel blotto": self._blotto_move,
+            "3-player iterated prisoner's dilemma": self._ipd_move,
+            "secret mafia": self._mafia_move,
+        }
+        self.episode = None  # episode played through __call__
+
+    def new_episode(self, env_id=None, observation=None):
+        """
+        Context for a new episode. The game comes from `env_id` (e.g. 'ColonelBlotto-v0'),
+        else from the opening `observation`, else the agent's default game.
+        """
+        strategy = detect_game(observation, env_id)
+        if strategy is None and observation:
+            strategy = detect_game(observation, full=True)
+        strategy = strategy or self.default_game
+        episode = EpisodeContext(
+            strategy,
+            transpositions=self.transposition_scope is not None,
+            engine=self.engines.get(strategy.name, True),
+            validate=self.validate_moves,
+            opening=observation,
+        )
+        if strategy is GENERIC:
+            episode.max_depth = self.max_depth
+        print(f"[Router] New episode: {strategy.name}")
+        return episode
+
+    def _run(self, coro):
+        """Run `coro` on the agent's event loop and wait for the result; safe from any thread."""
+        with self._loop_lock:
+            if self._loop_thread is None:
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name="agent-loop", daemon=True)
+                self._loop_thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _blotto_solver(self, observation):
+        setup = parse_blotto_setup(observation)
+        with self._blotto_lock:
+            if setup not in self._blotto_solvers:
+                self._blotto_solvers[setup] = BlottoSolver(*setup)
+            return self._blotto_solvers[setup]
+
+    def _blotto_model(self, episode, observation):
+        """The episode's opponent model, updated with the rounds in `observation`."""
+        if episode.engine is None:
+            episode.engine = BlottoOpponentModel(self._blotto_solver(observation), parser=episode.parser)
+        episode.engine.update(observation)
+        return episode.engine
+
+    def _blotto_move(self, episode, observation):
+        if self.blotto_engine == "solver":
+            solver = self._blotto_solver(observation)
+            best_action = solver.format(solver.sample())
+            print(f"[Blotto] Equilibrium sample: {best_action}")
+            return best_action
+        if self.blotto_engine == "best_response":
+            opponent = self._blotto_model(episode, observation)
+            best_action = opponent.solver.format(opponent.best_response())
+            print(f"[Blotto] Best response to {len(opponent.history)} observed rounds: {best_action}")
+            return best_action
+        return None
+
+    def _ipd_move(self, episode, observation):
+        engine = episode.engine
+        if engine is None:
+            return None
+        engine.update(observation)
+        if not engine.is_decision_phase():
+            return None
+        if not engine.decide():  # our seat was not parsed, so there is no opponent to decide for
+            return None
+        best_action = engine.action()
+        print(f"[IPD] Cooperation rates: {engine.cooperation_rates()}; decision: {best_action}")
+        return best_action
+
+    def _mafia_move(self, episode, observation):
+        beliefs = episode.engine
+        if beliefs is None:
+            return None
+        beliefs.update(observation)
+        target = beliefs.vote_target() if beliefs.is_voting() else None
+        if target is None:
+            return None
+        best_action = f"[{target}]"
+        print(f"[Mafia] {beliefs.summary()}; vote: {best_action}")
+        return best_action
+
+    def _state_view(self, episode, observation):
+        """Game state for prompts: the compact rendered view, or the raw observation."""
+        if not self.compact_state or episode.parser is None:
+            return observation
+        episode.parser.feed(observation)
+        extra = {}
+        if episode.game == "secret mafia" and episode.engine is not None:
+            extra["suspicion"] = episode.engine.summary()
+        view = render_state(episode.game, episode.parser.state, **extra)
+        ratio = self.token_reduction.add(episode.game, observation, view)
+        print(f"[State] Compact view: {ratio:.1f}x fewer tokens this turn; per game: {self.token_reduction.ratios()}")
+        return view
+
+    def _move_matchers(self, episode, observation):
+        """Predicates for the two plies played since our last turn (our move, the opponent's reply) in tree order, or None."""
+        if episode.last_action is None:
+            return None
+        opponent_moved = observed_opponent_move(episode.game, observation, episode.last_action)
+        if opponent_moved is None:
+            return None
+        played = episode.actions.key(episode.last_action, "agent")
+        own_move = lambda step: episode.actions.key(step, "agent") == played
+        return [opponent_moved, own_move] if episode.role == "opponent" else [own_move, opponent_moved]
+
+    def _reused_tree(self, episode, observation, game_state=None):
+        """Previous turn's MCTS tree advanced past our last move and the opponent's reply, if both were simulated."""
+        tree, episode.tree = episode.tree, None
+        if tree is None:
+            return None
+        matchers = self._move_matchers(episode, observation)
+        if matchers is None:
+            return None
+        if not tree.advance(matchers, game_state or observation) or tree.root.role != episode.role:
+            return None
+        print(f"[MCTS] Reusing subtree with {tree.root.visits} visits")
+        return tree
+
+    def _tot_reusable(self, episode) -> bool:
+        """Whether last turn's ToT branches hold nodes `_seed_reused_branches` can carry over."""
+        return self.reuse_tree and episode.transpositions is not None and (episode.role == "opponent" or episode.max_depth > 2)
+
+    def _seed_reused_branches(self, episode, observation, game_state):
+        """
+        Carry nodes of the previous turn's ToT branches into the transposition table under
+        this turn's keys, so the new search skips their proposal calls. Returns the number
+        of nodes seeded.
+
+        - When the opponent moves first in the tree (Blotto, IPD), last turn already proposed
+          our replies to the opponent move that was then played; they become this turn's
+          reply node under that same move.
+        - Trees deeper than 2 plies also keep every node below the grandchild reached by
+          our last move and the opponent's reply.
+        """
+        branches, episode.branches = episode.branches, None
+        table = episode.transpositions
+        if not branches or table is None:
+            return 0
+        matchers = self._move_matchers(episode, observation)
+        if matchers is None:
+            return 0
+        children = {}  # path below the new root -> next steps in first-seen order
+        if episode.role == "opponent":
+            replied = [b for b in branches if len(b) > 1 and matchers[0](b[0])]
+            if replied:  # spelling variants of the observed move share one node key
+                children[(replied[0][0],)] = list(dict.fromkeys(b[1] for b in replied))
+        for branch in branches:
+            if len(branch) <= 2 or not (matchers[0](branch[0]) and matchers[1](branch[1])):
+                continue
+            rest = branch[2:]
+            for i, step in enumerate(rest):
+                steps = children.setdefault(tuple(rest[:i]), [])
+                if step not in steps:
+                    steps.append(step)
+        other = "opponent" if episode.role == "agent" else "agent"
+        for path, steps in children.items():
+            role = episode.role if len(path) % 2 == 0 else other
+            key = table.node_key(episode.game, game_state, list(path), role, episode.k_per_node, self.samples_per_node, episode.actions)
+            table.seed(key, steps[:episode.k_per_node])
+        if children:
+            print(f"[ToT] Reusing {len(children)} expanded nodes from the previous turn")
+        return len(children)
+
+    def _safe_move(self, episode, observation, clues):
+        """A legal move for when every branch failed validation: an engine move if the game has one, else a default."""
+        if clues:
+            return clues[0].action()
+        if episode.game == "colonel blotto":
+            solver = self._blotto_solver(observation)
+            return solver.format(solver.sample())
+        defaults = SAFE_MOVES.get(episode.game, ["pass"])
+        legal = (episode.validator.canonical(move) for move in defaults)
+        return next((move for move in legal if move is not None), defaults[0])
+
+    def _ranked_clues(self, episode, observation):
+        if self._clue_index is None:
+            with self._clue_index_lock:  # built once even when several episodes reach it together
+                if self._clue_index is None:
+                    from codenames_index import CodenamesClueIndex  # needs scipy, the NLTK corpora and textarena
+                    self._clue_index = CodenamesClueIndex()
+        episode.parser.feed(observation)
+        return self._clue_index.rank_from_state(episode.parser.state, top=self.codenames_clues)
+
+    def reset_transpositions(self):
+        if self.episode is not None and self.episode.transpositions is not None:
+            self.episode.transpositions.clear()
 
     def __call__(self, observation: str) -> str:
         """
-        Given the current game state `observation`, simulate possible futures,
+        Play `observation` in the agent's current episode, starting a new one when the
+        observation opens a new game. Use `new_episode` and `act` to play several games at once.
+        """
+        if self.episode is None or self.episode.starts_new_episode(observation):
+            self.episode = self.new_episode(observation=observation)
+        return self.act(observation, self.episode)
+
+    def act(self, observation: str, episode) -> str:
+        """
+        Given the current game state `observation` of `episode`, simulate possible futures,
         evaluate the outcomes, and return the best next action.
         """
-            # Step 1: Simulate possible futures from this game state
-            
+        episode.turns += 1
+        best_action = self._act(observation, episode)
+        episode.last_action = best_action
+        return best_action
+
+    def _act(self, observation, episode):
+        game, role = episode.game, episode.role
+        table = episode.transpositions
+        if table is not None and self.transposition_scope == "move":
+            table.clear()
+
+        engine_move = self._engine_moves.get(game)
+        best_action = engine_move(episode, observation) if engine_move else None
+        if best_action is not None:
+            return best_action
+
+        clues = []
+        if game == "codenames" and self.codenames_engine in ("index", "mixed"):
+            clues = self._ranked_clues(episode, observation)
+            print(f"[Codenames] Index clues: {[(c.action(), round(c.margin, 2)) for c in clues]}")
+            if clues and self.codenames_engine == "index":
+                return clues[0].action()
+
+        if episode.parser is not None:
+            episode.parser.feed(observation)  # validators read the rules from the parsed state
+        game_state = self._state_view(episode, observation)
 
-        if "codenames" in observation.lower():
-            self.game = "codenames"
-            role = "agent"
-            self.max_depth = 2
-        elif "colonel blotto" in observation.lower():
-            self.game = "colonel blotto"
-            role = "opponent"
-            self.max_depth = 2
-            self.k_per_node = 10
-        elif "3-player iterated prisoner's dilemma" in observation.lower():
-            self.game = "3-player iterated prisoner's dilemma"
-            role = "opponent"
-            self.max_depth = 2
+        if self.search == "mcts":
+            search = self._reused_tree(episode, observation, game_state)
+            if search is None:
+                search = MCTS(
+                    self.openai_client, game_state, game,
+                    root_role=role,
+                    max_depth=self.mcts_max_depth,
+                    k_per_node=episode.k_per_node,
+                    table=table,
+                    validator=episode.validator,
+                    action_table=episode.actions,
+                )
+            search.run(num_simulations=self.mcts_simulations, time_budget=self.mcts_time_budget)
+            best_action = search.best_action()
+            print(f"[MCTS] {search.simulations} simulations, root visits: {search.root_visits()}")
+            print(f"Best action: {best_action}")
+            episode.tree = search if self.reuse_tree else None
+            return best_action
             
+        if self._tot_reusable(episode):
+            self._seed_reused_branches(episode, observation, game_state)
         paired_branches = []
+        opponent_fn = None
+        if game == "colonel blotto" and self.blotto_opponent == "model":
+            opponent_fn = self._blotto_model(episode, observation).opponent_actions
 
-        branches = simulate_game_tree(
-            model=self.openai_client,
-            game_state=observation,
-            prior_actions=[],
-            current_role=role,
-            depth=0,
-            max_depth=self.max_depth,
-            game=self.game,
-            k_per_node=self.k_per_node,
-            debug=False,          # <— turn on ToT logs
-            debug_max_chars=180, # optional truncation width``
-        )
+        if self.concurrent_expansion:
+            branches = self._run(asimulate_game_tree(
+                model=self.openai_client,
+                game_state=game_state,
+                prior_actions=[],
+                current_role=role,
+                depth=0,
+                max_depth=episode.max_depth,
+                game=game,
+                k_per_node=episode.k_per_node,
+                debug=False,
+                debug_max_chars=180,
+                samples_per_node=self.samples_per_node,
+                table=table,
+                opponent_fn=opponent_fn,
+                validator=episode.validator,
+                action_table=episode.actions,
+                max_concurrency=self.max_concurrency,
+            ))
+        else:
+            branches = simulate_game_tree(
+                model=self.openai_client,
+                game_state=game_state,
+                prior_actions=[],
+                current_role=role,
+                depth=0,
+                max_depth=episode.max_depth,
+                game=game,
+                k_per_node=episode.k_per_node,
+                debug=False,          # <— turn on ToT logs
+                debug_max_chars=180, # optional truncation width``
+                samples_per_node=self.samples_per_node,
+                table=table,
+                opponent_fn=opponent_fn,
+                validator=episode.validator,
+                action_table=episode.actions,
+            )
+        if table is not None:
+            print(f"[ToT] Transpositions: {table.stats()}")
+        episode.branches = [list(b) for b in branches] if self._tot_reusable(episode) else None
 
         # Step 2: Perform crossover on branches
         k = 50  # Number of new branches to create
         new_branches = []
-        branch_length = self.max_depth  # Each branch has 3 moves
+        branch_length = episode.max_depth  # Each branch has 3 moves
         
         print("[Before crossover]")
         for idx, branch in enumerate(branches, start=1):
             print(f"  Branch {idx}: {branch}")
+
+        # branches as tuples of move ids: spelling variants of the same move share an id
+        actions = episode.actions
+        encoded = actions.unique(branches)
             
         for _ in range(k):
             # Randomly select two branches to crossover
-            branch1 = random.choice(branches)
-            branch2 = random.choice(branches)
+            branch1 = random.choice(encoded)
+            branch2 = random.choice(encoded)
             
             # Create new branch by randomly selecting moves from either parent
-            new_branch = []
-            for i in range(branch_length):
-                # Randomly choose move from either branch1 or branch2
-                if random.random() < 0.5:
-                    new_branch.append(branch1[i])
-                else:
-                    new_branch.append(branch2[i])
-            
+            new_branch = tuple(branch1[i] if random.random() < 0.5 else branch2[i] for i in range(branch_length))
             new_branches.append(new_branch)
             
+        if game == "colonel blotto" and self.blotto_engine == "mixed":
+            # pair equilibrium samples with the simulated opponent moves
+            solver = self._blotto_solver(observation)
+            samples = {solver.format(solver.sample()) for _ in range(self.blotto_samples)}
+            opponent_moves = list(dict.fromkeys(b[0] for b in encoded))
+            new_branches += [(opp, actions.intern(f"<action>{a}</action>")) for opp in opponent_moves for a in samples]
+        if clues:
+            # pair index clues with the simulated opponent replies
+            opponent_moves = list(dict.fromkeys(b[1] for b in encoded if len(b) > 1))
+            new_branches += [(actions.intern(f"<action>{c.action()}</action>"), opp) for c in clues for opp in opponent_moves]
+
         # Combine original and new branches
-        all_branches = [list(x) for x in set(tuple(branch) for branch in branches + new_branches)]
+        unique = list(dict.fromkeys(encoded + new_branches))
+        print(f"[ToT] {len(branches) + len(new_branches)} branches, {len(unique)} distinct over {len(actions)} move ids")
+        all_branches = [actions.decode(b) for b in unique]
         
+        if episode.validator is not None:
+            # crossover can pair moves that are no longer legal together; drop those before evaluation
+            legal = episode.validator.filter_branches(all_branches)
+            if not legal:
+                best_action = self._safe_move(episode, observation, clues)
+                print(f"[Validate] No legal branch ({episode.validator.stats()}); playing {best_action}")
+                return best_action
+            all_branches = [actions.decode(b) for b in actions.unique(legal)]
+            print(f"[Validate] {len(all_branches)} legal branches; proposals and branches checked: {episode.validator.stats()}")
+
         all_branches = all_branches[:250]
         
         print("[After crossover]")
@@ -216,19 +840,33 @@ class GamePlayAgent(Agent):
             print(f"  Branch {idx}: {branch}")
 
         # Step 3: Evaluate branches and pick the best one
-        best_action = evaluate_best_branch_old(
-            self.openai_client, observation, all_branches,
-            debug=True,          # <— turn on evaluator logs
-            debug_max_chars=220,
-            role=role
-        )
+        if self.evaluator == "pairwise":
+            if role == "opponent":  # put our own move first, as evaluate_best_branch_old does
+                all_branches = [b[::-1] if len(b) == 2 else b for b in all_branches]
+            stats = {}
+            best_action, _ = evaluate_best_branch(
+                self.openai_client, game_state, all_branches,
+                debug=True,
+                pairs=self.pairs,
+                strategy=self.ranking_strategy,
+                stats=stats,
+                scope=game,
+            )
+            print(f"[Eval] {stats}; judgment cache: {self.pairs.stats()}")
+        else:
+            best_action = evaluate_best_branch_old(
+                self.openai_client, game_state, all_branches,
+                debug=True,          # <— turn on evaluator logs
+                debug_max_chars=220,
+                role=role
+            )
         print(f"Best action: {best_action}")
         return best_action
 
 class GPTAgent(Agent):
     """GPT agent class that uses OpenAI's API to generate responses"""
 
-    def __init__(self, system_prompt=None, max_tokens=4096, temperature=0.7):
+    def __init__(self, system_prompt=None, max_tokens=4096, temperature=0.7, cache=None):
         """
         Initialize the GPT agent.
 
@@ -236,9 +874,10 @@ class GPTAgent(Agent):
             system_prompt (str, optional): Custom system prompt. Defaults to STANDARD_GAME_PROMPT.
             max_tokens (int, optional): Maximum number of tokens for response. Defaults to 800.
             temperature (float, optional): Temperature for response generation. Defaults to 0.7.
+            cache (CompletionCache, optional): Completion cache shared with other clients. Defaults to None.
         """
         super().__init__()
-        self.client = UnifiedAIClient()
+        self.client = UnifiedAIClient(cache=cache)
         self.system_prompt = system_prompt if system_prompt else STANDARD_GAME_PROMPT
         self.max_tokens = max_tokens
         self.temperature = temperature
@@ -0,0 +1,66 @@
+"""
+Games/sec of the batch Colonel Blotto engine against the textarena env, with the same
+policies on both sides (equilibrium solver vs uniform random). The env games are also
+replayed through the batch engine to check that both give the same outcomes.
+"""
+import time
+
+import numpy as np
+
+from blotto_batch import BlottoBatch, solver_policy, uniform_policy
+from blotto_solver import BlottoSolver
+
+BATCH_GAMES = 100_000
+ENV_GAMES = 200
+SEED = 0
+
+solver = BlottoSolver()
+rng = np.random.default_rng(SEED)
+policy0, policy1 = solver_policy(solver, rng), uniform_policy(rng)
+
+# Batch engine
+batch = BlottoBatch(BATCH_GAMES)
+start = time.perf_counter()
+batch.play(policy0, policy1)
+elapsed = time.perf_counter() - start
+batch_rate = BATCH_GAMES / elapsed
+print(f"[Blotto] Batch: {BATCH_GAMES} games in {elapsed:.2f}s = {batch_rate:,.0f} games/sec; {batch.summary()}")
+
+# textarena env, one game at a time
+try:
+    import textarena as ta
+except ImportError:
+    ta = None
+    print("[Blotto] textarena is not installed; skipping the env comparison")
+
+if ta is not None:
+    one = BlottoBatch(1)  # only used to draw single allocations from the same policies
+    played = []
+    start = time.perf_counter()
+    for _ in range(ENV_GAMES):
+        env = ta.make(env_id="ColonelBlotto-v0")
+        env.reset(num_players=2)
+        moves, done = [], False
+        while not done:
+            pid, _ = env.get_observation()
+            alloc = (policy0 if pid == 0 else policy1)(one, pid)[0]
+            moves.append(alloc)
+            done, _ = env.step(action=solver.format(alloc))
+        rewards, _ = env.close()
+        played.append((np.array(moves).reshape(-1, 2, solver.num_fields), rewards))
+    elapsed = time.perf_counter() - start
+    env_rate = ENV_GAMES / elapsed
+    print(f"[Blotto] textarena: {ENV_GAMES} games in {elapsed:.2f}s = {env_rate:,.0f} games/sec")
+    print(f"[Blotto] Speedup: {batch_rate / env_rate:,.0f}x")
+
+    # Parity: replay every env game's allocations through the batch engine
+    replay = BlottoBatch(ENV_GAMES)
+    max_rounds = max(len(m) for m, _ in played)
+    script = np.zeros((max_rounds, 2, ENV_GAMES, solver.num_fields), dtype=np.int32)
+    for g, (moves, _) in enumerate(played):
+        script[:len(moves), :, g] = moves
+    for r in range(max_rounds):
+        replay.step(script[r, 0], script[r, 1])
+    rewards = replay.results()["rewards"]
+    mismatches = sum(int(rewards[g, 0]) != int(np.sign(env_rewards[0])) for g, (_, env_rewards) in enumerate(played))
+    print(f"[Blotto] Parity: {ENV_GAMES - mismatches}/{ENV_GAMES} games with the same outcome")
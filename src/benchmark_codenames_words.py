@@ -0,0 +1,55 @@
+"""
+Cold vs warm construction cost of the Codenames board word list: cold runs the NLTK
+pos_tag pass and writes the versioned artifact, disk-warm reads the artifact in a fresh
+process state, memory-warm hits the module cache. The same three cases are timed for
+`CodenamesEnv` construction from envs/Codenames/env.py. Needs textarena (the loader
+lives in the env module). Pass --hardcore for the large 'en' list.
+"""
+import sys
+import tempfile
+import time
+
+HARDCORE = "--hardcore" in sys.argv
+REPEATS = 100
+
+
+def timed(fn, repeats: int = 1) -> float:
+    """Mean seconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def report(label: str, cold: float, disk: float, memory: float) -> None:
+    print(f"[Codenames] {label}: cold {cold * 1e3:,.1f} ms, disk-warm {disk * 1e3:,.2f} ms "
+          f"({cold / disk:,.0f}x), memory-warm {memory * 1e6:,.2f} us ({cold / memory:,.0f}x)")
+
+
+try:
+    import textarena  # noqa: F401  (the env module needs it)
+except ImportError:
+    print("[Codenames] textarena is not installed; nothing to benchmark")
+    raise SystemExit(0)
+
+from codenames_index import noun_vocabulary
+from local_envs import load_env_module
+
+env_module = load_env_module("Codenames")  # its loader is shared with the clue index
+
+with tempfile.TemporaryDirectory() as cache_dir:
+    cold = timed(lambda: noun_vocabulary(HARDCORE, cache_dir))
+    env_module._WORD_LISTS.clear()
+    disk = timed(lambda: noun_vocabulary(HARDCORE, cache_dir))
+    memory = timed(lambda: noun_vocabulary(HARDCORE, cache_dir), REPEATS)
+    print(f"[Codenames] {len(noun_vocabulary(HARDCORE, cache_dir))} nouns ({'en' if HARDCORE else 'en-basic'})")
+    report("noun_vocabulary", cold, disk, memory)
+
+with tempfile.TemporaryDirectory() as cache_dir:
+    env_module.CACHE_DIR = cache_dir  # the env uses the default cache dir
+    env_module._WORD_LISTS.clear()
+    cold = timed(lambda: env_module.CodenamesEnv(hardcore=HARDCORE))
+    env_module._WORD_LISTS.clear()
+    disk = timed(lambda: env_module.CodenamesEnv(hardcore=HARDCORE))
+    memory = timed(lambda: env_module.CodenamesEnv(hardcore=HARDCORE), REPEATS)
+    report("CodenamesEnv()", cold, disk, memory)
@@ -0,0 +1,94 @@
+"""
+Cost of `snapshot()`, `restore()` and `fork()` on the envs in envs/ against
+`copy.deepcopy`, taken mid-game so the observation log has its usual size. Each fork
+then plays the same continuation as its parent, and both must end with the same
+rewards and turn count. Needs textarena (the env modules import it).
+"""
+import copy
+import random
+import time
+
+from local_envs import load_env_module
+
+REPEATS = 10_000
+DEEPCOPY_REPEATS = 500
+
+
+def load_env(name: str, cls: str, **kwargs):
+    return getattr(load_env_module(name), cls)(**kwargs)
+
+
+def timed(fn, repeats: int) -> float:
+    """Mean seconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def play(env, moves) -> tuple:
+    for move in moves:
+        done, _ = env.step(move)
+        if done:
+            break
+    return env.state.rewards, env.state.turn
+
+
+rng = random.Random(0)
+
+
+def blotto_move() -> str:
+    a = rng.randint(0, 20)
+    b = rng.randint(0, 20 - a)
+    return f"[A{a} B{b} C{20 - a - b}]"
+
+
+def ipd_move() -> str:
+    return " ".join(f"[{q} {rng.choice(['cooperate', 'defect'])}]" for q in range(3))
+
+
+def mafia_move() -> str:
+    return f"[{rng.randint(0, 7)}]" if rng.random() < 0.7 else "I trust nobody here."
+
+
+def codenames_moves(env) -> list:
+    words = list(env.board)
+    return [f"[{rng.choice(words)}]" if rng.random() < 0.7 else f"[hint{rng.randint(0, 9)} 2]" for _ in range(60)]
+
+
+try:
+    import textarena
+except ImportError:
+    print("[Env] textarena is not installed; nothing to benchmark")
+    raise SystemExit(0)
+print(f"[Env] textarena {getattr(textarena, '__version__', 'unknown version')}, envs from this tree")
+
+cases = [
+    ("ColonelBlotto", "ColonelBlottoEnv", {}, 2, lambda env: [blotto_move() for _ in range(30)], 8),
+    ("ThreePlayerIPD", "ThreePlayerIPDEnv", {}, 3, lambda env: [ipd_move() for _ in range(60)], 30),
+    ("SecretMafia", "SecretMafiaEnv", {}, 8, lambda env: [mafia_move() for _ in range(200)], 20),
+    ("Codenames", "CodenamesEnv", {}, 4, codenames_moves, 6),
+]
+for name, cls, kwargs, num_players, script, prefix in cases:
+    try:
+        env = load_env(name, cls, **kwargs)
+    except LookupError as e:  # Codenames without the NLTK corpora
+        print(f"[Env] {name}: skipped ({type(e).__name__})")
+        continue
+    env.reset(num_players=num_players, seed=0)
+    moves = script(env)
+    play(env, moves[:prefix])
+    snap = env.snapshot()
+    t_snapshot = timed(env.snapshot, REPEATS)
+    t_fork = timed(lambda: env.fork(snap), REPEATS)
+    t_deepcopy = timed(lambda: copy.deepcopy(env), DEEPCOPY_REPEATS)
+
+    fork = env.fork(snap)
+    random.seed(1)
+    expected = play(env, moves[prefix:])
+    random.seed(1)
+    same = play(fork, moves[prefix:]) == expected
+    t_restore = timed(lambda: env.restore(snap), REPEATS)
+    print(f"[Env] {name}: snapshot {t_snapshot * 1e6:.1f} us, restore {t_restore * 1e6:.1f} us, "
+          f"fork {t_fork * 1e6:.1f} us, deepcopy {t_deepcopy * 1e6:.1f} us ({t_deepcopy / t_fork:.0f}x); "
+          f"fork continuation {'matches' if same else 'DIFFERS'}")
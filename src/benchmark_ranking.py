@@ -0,0 +1,52 @@
+"""
+Comparisons and accuracy of the ranking strategies with a simulated noisy judge: each
+candidate has a hidden quality and the judge prefers the better of two with logistic
+noise. Verdicts go through a pair cache, as `evaluate_best_branch` does with its
+JudgmentCache, so a strategy that asks for a pair twice gets the same verdict back,
+flagged as replayed; those repeats are counted. A pick is a hit when it is among the
+TOP best candidates.
+"""
+import math
+import random
+import time
+
+from ranking import STRATEGIES
+
+N = 250
+TRIALS = 50
+TOP = 3
+NOISE = 0.5  # logistic temperature of the judge
+SEED = 0
+
+
+def run(strategy: str, rng: random.Random) -> tuple:
+    quality = [rng.gauss(0.0, 1.0) for _ in range(N)]
+    best = set(sorted(range(N), key=lambda k: -quality[k])[:TOP])
+    verdicts, asked = {}, [0]
+
+    def compare_many(pairs):
+        results, replayed = [], []
+        for i, j in pairs:
+            asked[0] += 1
+            key = (min(i, j), max(i, j))
+            replayed.append(key in verdicts)
+            if key not in verdicts:
+                p = 1.0 / (1.0 + math.exp(-(quality[key[0]] - quality[key[1]]) / NOISE))
+                verdicts[key] = 1 if rng.random() < p else -1
+            results.append(verdicts[key] if key == (i, j) else -verdicts[key])
+        return results, replayed
+
+    winner, _, comparisons = STRATEGIES[strategy](N, compare_many)
+    return winner in best, comparisons, asked[0] - len(verdicts)
+
+
+random.seed(SEED)
+for strategy in STRATEGIES:
+    rng = random.Random(SEED)
+    start = time.perf_counter()
+    results = [run(strategy, rng) for _ in range(TRIALS)]
+    hits = sum(r[0] for r in results)
+    comparisons = sum(r[1] for r in results) / TRIALS
+    repeats = sum(r[2] for r in results) / TRIALS
+    print(f"[Ranking] {strategy}: top-{TOP} pick in {hits}/{TRIALS} trials, {comparisons:,.0f} comparisons "
+          f"({repeats:,.1f} repeated pairs) per ranking of {N}; {(time.perf_counter() - start) / TRIALS * 1e3:.0f} ms")
@@ -0,0 +1,158 @@
+import string
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from blotto_solver import BlottoSolver, enumerate_allocations
+
+# Headless batch Colonel Blotto: B independent games kept as NumPy arrays and advanced one
+# round at a time for all of them. Round and game-over rules are those of
+# `ColonelBlottoEnv._resolve_battle` and `_check_gameover`: a field goes to the larger
+# allocation (equal units: nobody), the round to the player with more fields (equal
+# counts: a tie, no point), and the game ends when a player reaches a majority of
+# `num_rounds` or after `num_rounds` rounds (equal scores: a draw).
+
+DRAW = 2
+ONGOING = -1
+
+# policy(batch, player) -> (num_games, num_fields) allocations for every game; rows of
+# finished games are ignored
+Policy = Callable[["BlottoBatch", int], np.ndarray]
+
+
+class BlottoBatch:
+    """
+    Args:
+        num_games (int): Games played side by side.
+        num_fields (int): As in `ColonelBlottoEnv` (clamped to 2..26).
+        num_total_units (int): As in `ColonelBlottoEnv` (at least num_fields).
+        num_rounds (int): As in `ColonelBlottoEnv`.
+    """
+
+    def __init__(self, num_games: int, num_fields: int = 3, num_total_units: int = 20, num_rounds: int = 10):
+        self.num_games = num_games
+        self.num_fields = min(max(num_fields, 2), 26)
+        self.field_names = list(string.ascii_uppercase[:self.num_fields])
+        self.num_total_units = max(num_total_units, self.num_fields)
+        self.num_rounds = num_rounds
+        self.reset()
+
+    def reset(self) -> None:
+        self.round = np.ones(self.num_games, dtype=np.int32)               # round being played, 1-based
+        self.scores = np.zeros((self.num_games, 2), dtype=np.int32)
+        self.winner = np.full(self.num_games, ONGOING, dtype=np.int8)      # 0 / 1 / DRAW once finished
+        self.last = np.zeros((2, self.num_games, self.num_fields), dtype=np.int32)  # previous round's allocations
+        self.rounds_played = 0
+
+    @property
+    def active(self) -> np.ndarray:
+        return self.winner == ONGOING
+
+    def done(self) -> bool:
+        return not self.active.any()
+
+    def _check(self, allocations: np.ndarray, player: int) -> np.ndarray:
+        allocations = np.asarray(allocations, dtype=np.int32)
+        if allocations.shape != (self.num_games, self.num_fields):
+            raise ValueError(f"Player {player}: expected allocations of shape {(self.num_games, self.num_fields)}, got {allocations.shape}")
+        bad = self.active & ((allocations < 0).any(axis=1) | (allocations.sum(axis=1) > self.num_total_units))
+        if bad.any():
+            raise ValueError(f"Player {player}: invalid allocation in game {int(np.flatnonzero(bad)[0])}")
+        return allocations
+
+    def step(self, alloc0: np.ndarray, alloc1: np.ndarray) -> np.ndarray:
+        """Resolve one round in every unfinished game; returns the round winner per game (-1 for ties and finished games)."""
+        alloc0, alloc1 = self._check(alloc0, 0), self._check(alloc1, 1)
+        active = self.active
+        fields0 = (alloc0 > alloc1).sum(axis=1)
+        fields1 = (alloc1 > alloc0).sum(axis=1)
+        round_winner = np.where(fields0 > fields1, 0, np.where(fields1 > fields0, 1, -1))
+        round_winner[~active] = -1
+        self.scores[:, 0] += round_winner == 0
+        self.scores[:, 1] += round_winner == 1
+        self.round += active
+        self.last[0, active], self.last[1, active] = alloc0[active], alloc1[active]
+        self.rounds_played += 1
+
+        # _check_gameover: all rounds played, else early majority
+        s0, s1 = self.scores[:, 0], self.scores[:, 1]
+        over = active & (self.round > self.num_rounds)
+        self.winner[over] = np.where(s0 > s1, 0, np.where(s1 > s0, 1, DRAW))[over]
+        needed = self.num_rounds // 2 + 1
+        early = active & ~over
+        self.winner[early & (s0 >= needed)] = 0
+        self.winner[early & (s0 < needed) & (s1 >= needed)] = 1
+        return round_winner
+
+    def play(self, policy0: Policy, policy1: Policy, max_rounds: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Run every game to the end (or `max_rounds` more rounds) and return `results()`."""
+        for _ in range(max_rounds or self.num_rounds):
+            if self.done():
+                break
+            self.step(policy0(self, 0), policy1(self, 1))
+        return self.results()
+
+    def results(self) -> Dict[str, np.ndarray]:
+        """Per-game outcome, final scores and rounds played; rewards follow the env (+1 / -1, 0 for a draw)."""
+        rewards = np.zeros((self.num_games, 2), dtype=np.int8)
+        rewards[self.winner == 0] = (1, -1)
+        rewards[self.winner == 1] = (-1, 1)
+        return {"winner": self.winner.copy(), "scores": self.scores.copy(), "rounds": self.round - 1, "rewards": rewards}
+
+    def summary(self) -> Dict[str, float]:
+        finished = ~self.active
+        n = max(int(finished.sum()), 1)
+        return {
+            "games": int(finished.sum()),
+            "p0_win_rate": float((self.winner == 0).sum() / n),
+            "p1_win_rate": float((self.winner == 1).sum() / n),
+            "draw_rate": float((self.winner == DRAW).sum() / n),
+            "avg_rounds": float((self.round - 1)[finished].mean()) if finished.any() else 0.0,
+        }
+
+
+# Policies
+
+def fixed_policy(allocation: Sequence[int]) -> Policy:
+    """Scripted: the same allocation every round."""
+    row = np.asarray(allocation, dtype=np.int32)
+    return lambda batch, player: np.broadcast_to(row, (batch.num_games, batch.num_fields))
+
+
+def uniform_policy(rng: Optional[np.random.Generator] = None) -> Policy:
+    """Uniform over all full allocations."""
+    rng = rng or np.random.default_rng()
+    cache = {}
+
+    def policy(batch: BlottoBatch, player: int) -> np.ndarray:
+        setup = (batch.num_fields, batch.num_total_units)
+        if setup not in cache:
+            cache[setup] = enumerate_allocations(*setup).astype(np.int32)
+        allocations = cache[setup]
+        return allocations[rng.integers(len(allocations), size=batch.num_games)]
+    return policy
+
+
+def solver_policy(solver: BlottoSolver, rng: Optional[np.random.Generator] = None) -> Policy:
+    """Independent draws from the solver's equilibrium mixture."""
+    rng = rng or np.random.default_rng()
+    support = np.flatnonzero(solver.strategy > 1e-9)
+    allocations = solver.allocations[support].astype(np.int32)
+    cum = np.cumsum(solver.strategy[support])
+    cum /= cum[-1]
+
+    def policy(batch: BlottoBatch, player: int) -> np.ndarray:
+        idx = np.minimum(np.searchsorted(cum, rng.random(batch.num_games), side="right"), len(cum) - 1)
+        return allocations[idx]
+    return policy
+
+
+def copy_last_policy(first: Sequence[int]) -> Policy:
+    """Scripted: plays `first`, then repeats the opponent's previous allocation."""
+    row = np.asarray(first, dtype=np.int32)
+
+    def policy(batch: BlottoBatch, player: int) -> np.ndarray:
+        if batch.rounds_played == 0:
+            return np.broadcast_to(row, (batch.num_games, batch.num_fields))
+        return batch.last[1 - player]
+    return policy
@@ -0,0 +1,87 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from blotto_solver import BlottoSolver, payoff_matrix
+from observation_parser import BlottoParser
+
+
+class BlottoOpponentModel:
+    """
+    Opponent model for Colonel Blotto fitted on the allocations the opponent actually
+    played. Observations are parsed incrementally by a `BlottoParser`, past
+    allocations are kept in a NumPy array, and each round is weighted by `decay ** age`
+    (1.0 = plain frequencies). The fitted mix is shrunk towards the equilibrium strategy
+    by `prior` pseudo-rounds, so the first rounds fall back to equilibrium play.
+
+    Args:
+        solver (BlottoSolver): Supplies the allocation space and equilibrium mix.
+        decay (float): Recency weight per round of age.
+        prior (float): Weight of the equilibrium mix, in rounds.
+        parser (BlottoParser, optional): Shared observation parser; a private one by default.
+    """
+
+    def __init__(self, solver: BlottoSolver, decay: float = 0.8, prior: float = 1.0, parser: Optional[BlottoParser] = None):
+        self.solver = solver
+        self.decay = decay
+        self.prior = prior
+        self.candidates = solver.allocations.astype(np.int16)
+        # value of every candidate against the equilibrium mix, for the prior term
+        self._prior_value = payoff_matrix(self.candidates).astype(np.float64) @ solver.strategy
+        self.reset(parser)
+
+    def reset(self, parser: Optional[BlottoParser] = None) -> None:
+        self.parser = parser or BlottoParser()
+        self._state = self.parser.state
+        self.history = np.zeros((0, self.solver.num_fields), dtype=np.int16)
+
+    def update(self, observation: str) -> int:
+        """Parse rounds not seen yet; returns how many were added."""
+        self.parser.feed(observation)
+        return self.sync()
+
+    def sync(self) -> int:
+        """Bring `history` in line with the parser state (e.g. when the parser is fed elsewhere)."""
+        state = self.parser.state
+        if state is not self._state:  # the parser started a new game
+            self._state = state
+            self.history = self.history[:0]
+        side = 1 if state.me == 0 else 0
+        rows = [h[side] for h in state.history[len(self.history):]]
+        if rows:
+            self.history = np.vstack([self.history, np.array(rows, dtype=np.int16)])
+        return len(rows)
+
+    def _weights(self) -> np.ndarray:
+        ages = np.arange(len(self.history) - 1, -1, -1)
+        return self.decay ** ages
+
+    def expected_values(self) -> np.ndarray:
+        """Expected round payoff (+1 win, -1 loss) of every candidate allocation against the fitted mix."""
+        w = self._weights()
+        if not len(w):
+            return self._prior_value.copy()
+        outcome = np.sign(np.sign(self.candidates[:, None, :] - self.history[None, :, :]).sum(axis=2))
+        return (outcome @ w + self.prior * self._prior_value) / (w.sum() + self.prior)
+
+    def best_response(self) -> Tuple[int, ...]:
+        """Highest-value full allocation; ties go to the allocation the equilibrium plays most."""
+        values = self.expected_values()
+        best = np.flatnonzero(values >= values.max() - 1e-9)
+        pick = best[np.argmax(self.solver.strategy[best])]
+        return tuple(int(u) for u in self.candidates[pick])
+
+    def likely_moves(self, k: int = 10) -> List[Tuple[int, ...]]:
+        """The `k` most probable opponent allocations under the fitted mix."""
+        mass = {}
+        total = self._weights().sum() + self.prior
+        for row, w in zip(self.history, self._weights()):
+            key = tuple(int(u) for u in row)
+            mass[key] = mass.get(key, 0.0) + w / total
+        for alloc, p in self.solver.top(k):
+            mass[alloc] = mass.get(alloc, 0.0) + self.prior * p / total
+        return sorted(mass, key=mass.get, reverse=True)[:k]
+
+    def opponent_actions(self, game_state: str, prior_actions: List[str]) -> List[str]:
+        """Drop-in replacement for the LLM opponent proposals in `simulate_game_tree` (call `update` first)."""
+        return [self.solver.format(a) for a in self.likely_moves()]
@@ -0,0 +1,139 @@
+import bisect
+import os
+import random
+import re
+import string
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from scipy.optimize import linprog
+except ImportError:  # optional: fictitious play is used instead
+    linprog = None
+
+CACHE_VERSION = 1
+CACHE_DIR = os.getenv("MINDGAMES_CACHE_DIR", os.path.expanduser("~/.cache/mindgames"))
+
+
+def enumerate_allocations(num_fields: int, num_total_units: int) -> np.ndarray:
+    """All ways to place exactly `num_total_units` units on `num_fields` fields, shape (m, num_fields)."""
+    if num_fields == 1:
+        return np.array([[num_total_units]], dtype=np.int16)
+    rows = []
+    for first in range(num_total_units, -1, -1):
+        rest = enumerate_allocations(num_fields - 1, num_total_units - first)
+        rows.append(np.hstack([np.full((len(rest), 1), first, dtype=np.int16), rest]))
+    return np.vstack(rows)
+
+
+def payoff_matrix(allocations: np.ndarray, chunk: int = 512) -> np.ndarray:
+    """
+    Round outcome for the row allocation against the column allocation: +1 win, -1 loss,
+    0 tie. Same rule as `ColonelBlottoEnv._resolve_battle`: more units take a field,
+    equal units leave it tied, and the side holding more fields wins the round.
+    """
+    m = len(allocations)
+    out = np.empty((m, m), dtype=np.int8)
+    for start in range(0, m, chunk):
+        rows = allocations[start:start + chunk, None, :]
+        fields = np.sign(rows - allocations[None, :, :]).sum(axis=2)
+        out[start:start + chunk] = np.sign(fields)
+    return out
+
+
+def _solve_lp(payoff: np.ndarray) -> np.ndarray:
+    # max v  s.t.  payoff^T x >= v,  sum(x) = 1,  x >= 0   (variables: x..., v)
+    m = payoff.shape[0]
+    c = np.zeros(m + 1)
+    c[-1] = -1.0
+    a_ub = np.hstack([-payoff.T.astype(float), np.ones((m, 1))])
+    a_eq = np.hstack([np.ones((1, m)), np.zeros((1, 1))])
+    res = linprog(c, A_ub=a_ub, b_ub=np.zeros(m), A_eq=a_eq, b_eq=[1.0],
+                  bounds=[(0, None)] * m + [(None, None)], method="highs")
+    if not res.success:
+        raise RuntimeError(f"Blotto LP failed: {res.message}")
+    x = np.clip(res.x[:m], 0, None)
+    return x / x.sum()
+
+
+def _solve_fictitious_play(payoff: np.ndarray, iterations: int = 20_000) -> np.ndarray:
+    # symmetric zero-sum game: play a best response to the running average of past play
+    m = payoff.shape[0]
+    p = payoff.astype(np.float64)
+    counts = np.zeros(m)
+    counts[0] = 1.0
+    value = p[:, 0].copy()  # payoff of every row against the accumulated mixture
+    for _ in range(iterations):
+        br = int(np.argmax(value))
+        counts[br] += 1.0
+        value += p[:, br]
+    return counts / counts.sum()
+
+
+def exploitability(payoff: np.ndarray, strategy: np.ndarray) -> float:
+    """Expected round payoff of the best pure response against `strategy` (0 at equilibrium)."""
+    return float((payoff.astype(np.float64) @ strategy).max())
+
+
+class BlottoSolver:
+    """
+    Mixed-equilibrium strategy for one Colonel Blotto round, computed from the exact
+    payoff matrix over all full allocations and cached on disk per (fields, units).
+
+    Args:
+        num_fields (int): Number of fields (as in `ColonelBlottoEnv`).
+        num_total_units (int): Units per round.
+        method (str): "lp" (needs scipy), "fictitious_play", or "auto" (LP when available).
+        cache_dir (str, optional): Where solved strategies are stored. None disables the disk cache.
+    """
+
+    def __init__(self, num_fields: int = 3, num_total_units: int = 20, method: str = "auto", cache_dir: Optional[str] = CACHE_DIR):
+        self.num_fields = num_fields
+        self.num_total_units = num_total_units
+        self.field_names = list(string.ascii_uppercase[:num_fields])
+        if method == "auto":
+            method = "lp" if linprog is not None else "fictitious_play"
+        self.method = method
+        path = None
+        if cache_dir:
+            path = os.path.join(cache_dir, f"blotto_v{CACHE_VERSION}_{num_fields}f_{num_total_units}u_{method}.npz")
+        if path and os.path.exists(path):
+            data = np.load(path)
+            self.allocations, self.strategy = data["allocations"], data["strategy"]
+        else:
+            self.allocations = enumerate_allocations(num_fields, num_total_units)
+            payoff = payoff_matrix(self.allocations)
+            self.strategy = _solve_lp(payoff) if method == "lp" else _solve_fictitious_play(payoff)
+            if path:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp = path + ".tmp.npz"
+                np.savez_compressed(tmp, allocations=self.allocations, strategy=self.strategy)
+                os.replace(tmp, path)
+        support = np.flatnonzero(self.strategy > 1e-9)
+        self._support = [tuple(int(u) for u in self.allocations[i]) for i in support]
+        self._cum_weights = np.cumsum(self.strategy[support]).tolist()
+
+    def sample(self, rng: Optional[random.Random] = None) -> Tuple[int, ...]:
+        """Draw one allocation from the equilibrium mixture."""
+        r = (rng or random).random() * self._cum_weights[-1]
+        return self._support[min(bisect.bisect_right(self._cum_weights, r), len(self._support) - 1)]
+
+    def top(self, k: int = 5):
+        """The `k` most likely allocations with their probabilities."""
+        order = np.argsort(-self.strategy)[:k]
+        return [(tuple(int(u) for u in self.allocations[i]), float(self.strategy[i])) for i in order]
+
+    def format(self, allocation: Tuple[int, ...]) -> str:
+        return "[" + " ".join(f"{name}{units}" for name, units in zip(self.field_names, allocation)) + "]"
+
+
+def parse_blotto_setup(observation: str) -> Tuple[int, int]:
+    """(num_fields, num_total_units) announced in a Colonel Blotto observation; env defaults otherwise."""
+    fields = re.findall(r"Available fields:\s*([A-Z](?:\s*,\s*[A-Z])*)", observation)
+    units = re.findall(r"Units to allocate:\s*(\d+)", observation)
+    if not units:
+        units = re.findall(r"allocate up to (\d+) units", observation)
+    num_fields = len(fields[-1].split(",")) if fields else 3
+    num_total_units = int(units[-1]) if units else 20
+    return num_fields, num_total_units
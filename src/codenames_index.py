@@ -0,0 +1,188 @@
+import os
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from local_envs import load_env_module
+from observation_parser import CodenamesParser, CodenamesState
+
+# Offline clue index for the Codenames spymaster. Every word of the env's noun vocabulary
+# gets a sparse vector over WordNet synsets (its own senses plus nearby hypernyms, hyponyms,
+# meronyms and holonyms, weighted by distance); relatedness is the cosine of these vectors.
+# Only each word's strongest neighbours are stored, as a CSR matrix in a versioned .npz.
+
+INDEX_VERSION = 1
+CACHE_DIR = os.getenv("MINDGAMES_CACHE_DIR", os.path.expanduser("~/.cache/mindgames"))
+
+
+def noun_vocabulary(hardcore: bool = False, cache_dir: Optional[str] = CACHE_DIR) -> List[str]:
+    """
+    The noun list `CodenamesEnv` draws boards from, via the env's own loader in
+    envs/Codenames/env.py (in memory and as a versioned text file in `cache_dir`).
+    Loading the env module needs textarena.
+    """
+    return load_env_module("Codenames").load_noun_list(hardcore, cache_dir)
+
+
+def _concepts(word: str, wn, max_hops: int = 2, min_depth: int = 4) -> Dict[str, float]:
+    """Synsets around the noun senses of `word`, weighted 1 / 2**hops; very generic synsets are skipped."""
+    weights: Dict[str, float] = {}
+    frontier = wn.synsets(word, pos=wn.NOUN)
+    for hops in range(max_hops + 1):
+        nxt = []
+        for s in frontier:
+            if s.min_depth() < min_depth and hops > 0:
+                continue
+            name = s.name()
+            if name in weights:
+                continue
+            weights[name] = 1.0 / 2 ** hops
+            nxt.extend(s.hypernyms() + s.hyponyms() + s.part_meronyms() + s.member_holonyms() + s.part_holonyms())
+        frontier = nxt
+    return weights
+
+
+def build_relatedness(vocabulary: Sequence[str], neighbours: int = 64, threshold: float = 0.05) -> sp.csr_matrix:
+    """Sparse word x word cosine relatedness, keeping the top `neighbours` entries >= `threshold` per row."""
+    import nltk
+    from nltk.corpus import wordnet as wn
+
+    nltk.download("wordnet", quiet=True)
+    concept_ids: Dict[str, int] = {}
+    rows, cols, vals = [], [], []
+    for i, word in enumerate(vocabulary):
+        for name, w in _concepts(word, wn).items():
+            rows.append(i)
+            cols.append(concept_ids.setdefault(name, len(concept_ids)))
+            vals.append(w)
+    features = sp.csr_matrix((vals, (rows, cols)), shape=(len(vocabulary), max(len(concept_ids), 1)), dtype=np.float32)
+    norms = np.sqrt(features.multiply(features).sum(axis=1)).A1
+    norms[norms == 0] = 1.0
+    features = sp.diags(1.0 / norms).dot(features).tocsr()
+    related = features.dot(features.T).tocsr()
+    related.setdiag(0.0)
+    related.data[related.data < threshold] = 0.0
+    related.eliminate_zeros()
+    # keep the strongest neighbours of each word
+    indptr, indices, data = [0], [], []
+    for i in range(related.shape[0]):
+        start, end = related.indptr[i], related.indptr[i + 1]
+        order = np.argsort(-related.data[start:end])[:neighbours]
+        indices.extend(related.indices[start:end][order])
+        data.extend(related.data[start:end][order])
+        indptr.append(len(indices))
+    return sp.csr_matrix((np.array(data, dtype=np.float16), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)), shape=related.shape)
+
+
+class ClueCandidate(NamedTuple):
+    clue: str
+    count: int
+    margin: float           # weakest target relatedness minus the strongest unsafe relatedness
+    targets: Tuple[str, ...]
+
+    def action(self) -> str:
+        return f"[{self.clue} {self.count}]"
+
+
+class CodenamesClueIndex:
+    """
+    Ranks spymaster clues for a board from the precomputed relatedness matrix. A clue for
+    `n` words is safe by `margin` when its n-th most related team word beats every
+    opponent / neutral word by that much, and the assassin by `margin + assassin_margin`.
+
+    Args:
+        vocabulary (list, optional): Clue and board words. Defaults to the env's noun list.
+        hardcore (bool): Use the env's hardcore word list when `vocabulary` is None.
+        cache_dir (str, optional): Where the matrix is stored. None rebuilds it every time.
+    """
+
+    def __init__(self, vocabulary: Optional[Sequence[str]] = None, hardcore: bool = False, cache_dir: Optional[str] = CACHE_DIR):
+        path = None
+        if cache_dir and vocabulary is None:
+            path = os.path.join(cache_dir, f"codenames_index_v{INDEX_VERSION}_{'en' if hardcore else 'en-basic'}.npz")
+        if path and os.path.exists(path):
+            data = np.load(path, allow_pickle=False)
+            self.vocabulary = [str(w) for w in data["vocabulary"]]
+            self.related = sp.csr_matrix((data["data"], data["indices"], data["indptr"]), shape=tuple(data["shape"]))
+        else:
+            self.vocabulary = [w.lower() for w in (vocabulary if vocabulary is not None else noun_vocabulary(hardcore, cache_dir))]
+            self.related = build_relatedness(self.vocabulary)
+            if path:
+                try:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    tmp = path + ".tmp.npz"
+                    np.savez_compressed(
+                        tmp, vocabulary=np.array(self.vocabulary), data=self.related.data, indices=self.related.indices,
+                        indptr=self.related.indptr, shape=np.array(self.related.shape),
+                    )
+                    os.replace(tmp, path)
+                except OSError:
+                    pass  # read-only cache dir: same as the word list, keep the in-memory copy only
+        self.index = {w: i for i, w in enumerate(self.vocabulary)}
+        self._by_board_word = self.related.tocsc()  # boards select columns
+
+    def rank_clues(
+        self,
+        team: Sequence[str],
+        opponent: Sequence[str],
+        neutral: Sequence[str],
+        assassin: Sequence[str],
+        top: int = 10,
+        min_margin: float = 0.05,
+        assassin_margin: float = 0.1,
+        revealed: Sequence[str] = (),
+    ) -> List[ClueCandidate]:
+        """Best (clue, count) per clue, larger safe counts first, then by margin. `revealed` words only restrict legality."""
+        team = [w.lower() for w in team]
+        board = team + [w.lower() for w in list(opponent) + list(neutral) + list(assassin)]
+        all_words = board + [w.lower() for w in revealed]
+        if not team:
+            return []
+        cols = np.array([self.index.get(w, -1) for w in board])
+        known = cols >= 0
+        rel = np.zeros((len(self.vocabulary), len(board)), dtype=np.float32)
+        rel[:, known] = self._by_board_word[:, cols[known]].toarray()
+
+        n_team, n_opp, n_neu = len(team), len(opponent), len(neutral)
+        team_rel = rel[:, :n_team]
+        danger = np.full(len(self.vocabulary), -1.0, dtype=np.float32)
+        if len(board) > n_team:
+            danger = rel[:, n_team:].copy()
+            danger[:, n_opp + n_neu:] += assassin_margin
+            danger = danger.max(axis=1)
+        order = np.argsort(-team_rel, axis=1)
+        ranked = np.take_along_axis(team_rel, order, axis=1)
+        margins = ranked - danger[:, None]  # margins[c, n-1]: safety of clue c for n words
+
+        clues, counts = np.nonzero((margins >= min_margin) & (ranked > 0))
+        out, seen = [], set()
+        for k in np.lexsort((-margins[clues, counts], -counts)):
+            clue = self.vocabulary[clues[k]]
+            # env rule: the clue may not contain, or be contained in, any board word
+            if clue in seen or any(clue in b or b in clue for b in all_words):
+                continue
+            seen.add(clue)
+            out.append(ClueCandidate(
+                clue, int(counts[k]) + 1, float(margins[clues[k], counts[k]]),
+                tuple(team[j] for j in order[clues[k], :counts[k] + 1]),
+            ))
+            if len(out) >= top:
+                break
+        return out
+
+    def rank_from_state(self, state: CodenamesState, top: int = 10, **kwargs) -> List[ClueCandidate]:
+        """Rank clues for our team on the board tracked by a `CodenamesParser`."""
+        if not state.spymaster or not state.board:
+            return []
+        theirs = "B" if state.team == "R" else "R"
+        return self.rank_clues(
+            state.words(state.team), state.words(theirs), state.words("N"), state.words("A"),
+            top=top, revealed=sorted(state.revealed), **kwargs,
+        )
+
+    def rank_from_observation(self, observation: str, top: int = 10, **kwargs) -> List[ClueCandidate]:
+        """Parse the spymaster board view in `observation` and rank clues for our team."""
+        parser = CodenamesParser()
+        parser.feed(observation)
+        return self.rank_from_state(parser.state, top=top, **kwargs)
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+def completion_key(deployment: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int, n: int = 1) -> str:
+    """Content address of a chat completion request."""
+    request = {"deployment": deployment, "messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+    if n != 1:
+        request["n"] = n  # single-sample keys stay unchanged
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """
+    Two-tier completion cache: an in-memory LRU in front of an optional SQLite file.
+
+    Args:
+        path (str, optional): SQLite file for the disk tier. None keeps the cache in memory only.
+        max_memory_entries (int): Size of the in-memory LRU tier.
+        max_disk_entries (int, optional): Oldest rows beyond this are dropped from disk. None = unbounded.
+        ttl_seconds (float, optional): Entries older than this are treated as misses. None = never expire.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_memory_entries: int = 4096,
+        max_disk_entries: Optional[int] = 200_000,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (created_at, value)
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._puts_since_evict = 0
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS completions_created_at ON completions (created_at)")
+            self._db.commit()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, value: str) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[1]
+                del self._memory[key]
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created_at FROM completions WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value, created_at = row
+                    if not self._expired(created_at):
+                        self._remember(key, created_at, value)
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    self._db.commit()
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, created_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO completions (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, created_at),
+                )
+                self._puts_since_evict += 1
+                if self._puts_since_evict >= 256:  # amortise the eviction scan
+                    self._evict_disk()
+                    self._puts_since_evict = 0
+                self._db.commit()
+
+    def _evict_disk(self) -> None:
+        if self.ttl_seconds is not None:
+            self._db.execute("DELETE FROM completions WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        if self.max_disk_entries is not None:
+            self._db.execute(
+                "DELETE FROM completions WHERE key IN ("
+                "SELECT key FROM completions ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            )
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
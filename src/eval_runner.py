@@ -0,0 +1,197 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from tqdm import tqdm
+
+import textarena as ta
+
+from agent import GamePlayAgent
+
+# Parallel, resumable offline evaluation. Episodes run on a thread pool: the agents spend
+# their time waiting on the LLM backend, and `GamePlayAgent` plays concurrent episodes
+# through one event loop, completion cache and connection pool. Every finished episode is
+# appended to a JSONL checkpoint by the coordinating thread, and a rerun skips the
+# (env_id, episode, seed) entries already in it.
+
+EpisodeKey = Tuple[str, int, int]
+
+# textarena seeds the global `random` in `State.__init__` and the envs draw boards and
+# roles from it in `reset`; holding this lock over both keeps a seed's setup reproducible
+# while other episodes are running
+_RESET_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class EpisodeSpec:
+    env_id: str
+    num_players: int
+    episode: int
+    seed: int
+
+    @property
+    def key(self) -> EpisodeKey:
+        return self.env_id, self.episode, self.seed
+
+
+def episode_specs(env_ids: Sequence[Tuple[str, int]], num_episodes: int, seed: int = 0) -> List[EpisodeSpec]:
+    """`num_episodes` per (env-id, num_players); episode i of every env is played with seed `seed + i`."""
+    return [EpisodeSpec(env_id, num_players, i, seed + i) for env_id, num_players in env_ids for i in range(num_episodes)]
+
+
+def play_episode(spec: EpisodeSpec, model, opponent) -> dict:
+    """Play one episode and return its checkpoint record, with stats for the *model* player."""
+    with _RESET_LOCK:
+        env = ta.make(spec.env_id)
+        env.reset(num_players=spec.num_players, seed=spec.seed)
+
+    model_pid = random.Random(spec.seed).randrange(spec.num_players)  # seat follows the seed
+    episode = model.new_episode(spec.env_id) if isinstance(model, GamePlayAgent) else None
+    start = time.perf_counter()
+    done = False
+
+    while not done:
+        pid, obs = env.get_observation()
+        if pid != model_pid:
+            action = opponent(obs)
+        else:
+            action = model.act(obs, episode) if episode is not None else model(obs)
+        done, _ = env.step(action=action)
+
+    rewards, game_info = env.close()
+
+    return {
+        **asdict(spec),
+        "model_pid": model_pid,
+        "model_reward": float(rewards[model_pid]),
+        "opponent_reward": float(np.mean([rewards[i] for i in range(spec.num_players) if i != model_pid])),
+        "invalid_move": bool(game_info[model_pid]["invalid_move"]),
+        "turn_count": int(game_info[model_pid]["turn_count"]),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+class Checkpoint:
+    """
+    Append-only JSONL file of finished episodes. A line cut short by a crash is ignored
+    on load, so its episode is simply played again.
+
+    Args:
+        path (str): Checkpoint file; created with its directory on the first append.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records: List[dict] = []
+        text = ""
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            for line in text.splitlines():
+                try:
+                    self.records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        self._terminate_line = bool(text) and not text.endswith("\n")  # next record must not extend a cut-off line
+        self.done: Set[EpisodeKey] = {(r["env_id"], r["episode"], r["seed"]) for r in self.records}
+
+    def append(self, record: dict) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(("\n" if self._terminate_line else "") + json.dumps(record) + "\n")
+        self._terminate_line = False
+        self.records.append(record)
+        self.done.add((record["env_id"], record["episode"], record["seed"]))
+
+
+def run_evaluation(
+    specs: Iterable[EpisodeSpec],
+    model,
+    opponent,
+    checkpoint_path: str,
+    workers: int = 4,
+) -> List[dict]:
+    """
+    Play every spec not yet in the checkpoint, `workers` episodes at a time, and return
+    the records of the finished ones (resumed and new). A failed episode is reported
+    and left out of the checkpoint, so the next run retries it.
+
+    Args:
+        specs (Iterable[EpisodeSpec]): Episodes to evaluate, e.g. from `episode_specs`.
+        model, opponent: Agents shared by all episodes; a `GamePlayAgent` model gets one episode context per game.
+        checkpoint_path (str): JSONL checkpoint to resume from and append to.
+        workers (int): Episodes played concurrently.
+    """
+    specs = list(specs)
+    wanted = {s.key for s in specs}
+    checkpoint = Checkpoint(checkpoint_path)
+    pending = [s for s in specs if s.key not in checkpoint.done]
+    print(f"[Eval] {len(specs) - len(pending)} episodes resumed from {checkpoint_path}, {len(pending)} to play with {workers} workers")
+
+    if pending:
+        _play_pending(pending, model, opponent, checkpoint, workers)
+    return [r for r in checkpoint.records if (r["env_id"], r["episode"], r["seed"]) in wanted]
+
+
+def _play_pending(pending: List[EpisodeSpec], model, opponent, checkpoint: Checkpoint, workers: int) -> None:
+    start, finished, failed = time.perf_counter(), 0, 0
+    bar = tqdm(total=len(pending), desc="Episodes")
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="eval") as pool:
+        futures = {pool.submit(play_episode, spec, model, opponent): spec for spec in pending}
+        for future in as_completed(futures):
+            spec = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[Eval] {spec.env_id} episode {spec.episode} (seed {spec.seed}) failed: {e}")
+            else:
+                checkpoint.append(record)
+                finished += 1
+            bar.update(1)
+            bar.set_postfix({"Failed": failed})
+    bar.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"[Eval] {finished} episodes in {elapsed:.1f}s = {finished / elapsed * 60:.1f} episodes/min ({failed} failed)")
+
+
+def summarize(records: Iterable[dict], env_ids: Sequence[str], num_episodes: int) -> Dict[str, list]:
+    """
+    Per-env win/loss/draw/invalid/turn rates and mean rewards of the model: the columns and
+    denominators of the original `eval_results/eval_summary.csv`, i.e. every rate is over
+    the `num_episodes` planned per env. Episodes that failed count as neither win, loss
+    nor draw; report them with `episode_counts`.
+    """
+    by_env: Dict[str, List[dict]] = defaultdict(list)
+    for r in records:
+        by_env[r["env_id"]].append(r)
+
+    results = defaultdict(list)
+    for env_id in env_ids:
+        rows = by_env.get(env_id, [])
+        results["env_id"].append(env_id)
+        results["win_rate"].append(sum(r["model_reward"] > r["opponent_reward"] for r in rows) / num_episodes)
+        results["loss_rate"].append(sum(r["model_reward"] < r["opponent_reward"] for r in rows) / num_episodes)
+        results["draw_rate"].append(sum(r["model_reward"] == r["opponent_reward"] for r in rows) / num_episodes)
+        results["invalid_rate"].append(sum(r["invalid_move"] for r in rows) / num_episodes)
+        results["avg_turns"].append(sum(r["turn_count"] for r in rows) / num_episodes)
+        results["avg_model_reward"].append(sum(r["model_reward"] for r in rows) / num_episodes)
+        results["avg_opponent_reward"].append(sum(r["opponent_reward"] for r in rows) / num_episodes)
+    return results
+
+
+def episode_counts(records: Iterable[dict], env_ids: Sequence[str]) -> Dict[str, int]:
+    """Finished episodes per env, in `env_ids` order."""
+    counts = {env_id: 0 for env_id in env_ids}
+    for r in records:
+        if r["env_id"] in counts:
+            counts[r["env_id"]] += 1
+    return counts
@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from action_table import ActionTable
+from ipd_engine import IPDEngine
+from mafia_beliefs import MafiaBeliefs
+from move_validation import BlottoValidator, CodenamesValidator, IPDValidator, MoveValidator
+from observation_parser import BlottoParser, CodenamesParser, IPDParser, MafiaParser, ObservationParser
+from prompts import (
+    CODENAMES, CODENAMES_OPPONENT, COLONEL_BOLOTTO, COLONEL_BOLOTTO_OPPONENT,
+    NEXT_STEP_PROMPT_TEMPLATE, OPPONENT_MOVE_PROMPT_TEMPLATE, TPID, TPID_OPPONENT,
+)
+from transposition import TranspositionTable
+
+# Registry of per-game strategies. The game is detected once per episode, from the env id
+# or the opening observation, and everything that changes during the episode (parser,
+# engine, search tree, transpositions) lives in an `EpisodeContext`, so one agent can play
+# many games of different types at the same time.
+
+_HEAD = 512  # the env prompt opens the first observation of an episode; later ones are not scanned
+
+
+@dataclass(frozen=True)
+class GameStrategy:
+    name: str                                   # key used by prompts, parsers and caches, e.g. "colonel blotto"
+    markers: Tuple[str, ...]                    # lower-case substrings of the env prompt only (not of later turns)
+    env_ids: Tuple[str, ...]                    # textarena env ids without the version suffix
+    role: str                                   # who moves first in the simulated tree: "agent" or "opponent"
+    prompts: Tuple[str, str]                    # proposal prompts for (agent, opponent) nodes
+    max_depth: int = 2
+    k_per_node: int = 5
+    parser: Optional[Callable[[], ObservationParser]] = None
+    engine: Optional[Callable[[ObservationParser], Any]] = None  # per-episode engine built on the parser
+    validator: Optional[Callable[[ObservationParser], MoveValidator]] = None  # per-episode legal-move filter
+
+
+GAMES: Dict[str, GameStrategy] = {}
+
+
+def register_game(strategy: GameStrategy) -> GameStrategy:
+    GAMES[strategy.name] = strategy
+    return strategy
+
+
+GENERIC = GameStrategy(
+    name="generic", markers=(), env_ids=(), role="agent", max_depth=1,
+    prompts=(NEXT_STEP_PROMPT_TEMPLATE, OPPONENT_MOVE_PROMPT_TEMPLATE),
+)
+
+register_game(GameStrategy(
+    name="codenames", markers=("you are playing codenames",), env_ids=("Codenames",), role="agent",
+    prompts=(CODENAMES, CODENAMES_OPPONENT), parser=CodenamesParser, validator=CodenamesValidator,
+))
+register_game(GameStrategy(
+    name="colonel blotto", markers=("game of colonelblotto", "game of colonel blotto"), env_ids=("ColonelBlotto",), role="opponent",
+    prompts=(COLONEL_BOLOTTO, COLONEL_BOLOTTO_OPPONENT), k_per_node=10, parser=BlottoParser,
+    validator=BlottoValidator,
+))
+register_game(GameStrategy(
+    name="3-player iterated prisoner's dilemma", markers=("3-player iterated prisoner's dilemma. the match lasts",),
+    env_ids=("ThreePlayerIPD",), role="opponent", prompts=(TPID, TPID_OPPONENT),
+    parser=IPDParser, engine=lambda parser: IPDEngine(parser=parser), validator=IPDValidator,
+))
+register_game(GameStrategy(
+    name="secret mafia", markers=("welcome to secret mafia",), env_ids=("SecretMafia",), role="agent",
+    prompts=(NEXT_STEP_PROMPT_TEMPLATE, OPPONENT_MOVE_PROMPT_TEMPLATE),
+    parser=MafiaParser, engine=lambda parser: MafiaBeliefs(parser=parser),
+))
+
+
+def strategy_for(game: str) -> GameStrategy:
+    return GAMES.get(game, GENERIC)
+
+
+def detect_game(observation: Optional[str] = None, env_id: Optional[str] = None, full: bool = False) -> Optional[GameStrategy]:
+    """
+    Strategy for an episode, from its env id (e.g. 'ColonelBlotto-v0') or its opening
+    observation. Only the head of the observation is scanned unless `full` is set.
+    """
+    if env_id:
+        base = env_id.split("-")[0]
+        for strategy in GAMES.values():
+            if base in strategy.env_ids:
+                return strategy
+    if observation:
+        text = (observation if full else observation[:_HEAD]).lower()
+        for strategy in GAMES.values():
+            if any(m in text for m in strategy.markers):
+                return strategy
+    return None
+
+
+class EpisodeContext:
+    """
+    Mutable state of one episode: its own parser, engine, validator and action table, the
+    MCTS tree or ToT branches kept between turns, the transposition table and the last
+    action played.
+
+    Args:
+        strategy (GameStrategy): The game being played.
+        transpositions (bool): Give the episode a transposition table.
+        engine (bool): Build the strategy's engine, if it has one.
+        validate (bool): Build the strategy's legal-move validator, if it has one.
+        opening (str, optional): Head of the observation the episode was detected from.
+    """
+
+    def __init__(self, strategy: GameStrategy, transpositions: bool = True, engine: bool = True, validate: bool = True, opening: Optional[str] = None):
+        self.strategy = strategy
+        self.game = strategy.name
+        self.role = strategy.role
+        self.max_depth = strategy.max_depth
+        self.k_per_node = strategy.k_per_node
+        self.parser = strategy.parser() if strategy.parser else None
+        self.engine = strategy.engine(self.parser) if engine and strategy.engine and self.parser else None
+        self.validator = strategy.validator(self.parser) if validate and strategy.validator and self.parser else None
+        self.actions = ActionTable(strategy.name, self.parser)  # move ids for branch dedup and crossover
+        self.transpositions = TranspositionTable() if transpositions else None
+        self.opening = opening[:_HEAD] if opening else None
+        self.tree = None          # MCTS search of the last turn
+        self.branches = None      # ToT leaves of the last turn
+        self.last_action: Optional[str] = None
+        self.turns = 0
+
+    def starts_new_episode(self, observation: str) -> bool:
+        """True when `observation` opens a different episode (a new env prompt, not this one's)."""
+        strategy = detect_game(observation)
+        if strategy is None:
+            return False
+        return strategy is not self.strategy or (self.opening is not None and not observation.startswith(self.opening))
+
+    def __repr__(self) -> str:
+        return f"EpisodeContext(game={self.game!r}, turns={self.turns})"
@@ -0,0 +1,170 @@
+from itertools import combinations_with_replacement
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Headless batch 3-player iterated prisoner's dilemma. Decisions of one round are a
+# boolean tensor C of shape (games, 3, 3) with C[g, i, j] = player i cooperates with j
+# (the diagonal is ignored); pair payoffs come from one R/T/S/P table lookup and final
+# rewards use the ranking of `ThreePlayerIPDEnv._end_game`. Chat turns are not simulated.
+
+NUM_PLAYERS = 3
+_OFF_DIAGONAL = ~np.eye(NUM_PLAYERS, dtype=bool)
+
+# policy(batch, player) -> (num_games, 3) bool, cooperate with each player; the own column is ignored
+Policy = Callable[["IPDBatch", int], np.ndarray]
+
+
+def end_game_rewards(scores: np.ndarray) -> np.ndarray:
+    """
+    Rewards of `ThreePlayerIPDEnv._end_game` for scores of shape (games, players): players
+    are grouped by equal score, groups ranked worst to best get rewards evenly spaced in
+    [-1, 1], and a single group (everyone tied) gets 0.
+    """
+    ordered = np.sort(scores, axis=1)
+    distinct = np.ones_like(ordered, dtype=bool)
+    distinct[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    num_groups = distinct.sum(axis=1)
+    # group index of each player = number of distinct scores below theirs
+    below = (distinct[:, None, :] & (ordered[:, None, :] < scores[:, :, None])).sum(axis=2)
+    rewards = -1.0 + 2.0 * below / np.maximum(num_groups - 1, 1)[:, None]
+    rewards[num_groups == 1] = 0.0
+    return rewards
+
+
+class IPDBatch:
+    """
+    Args:
+        num_games (int): Games played side by side.
+        num_rounds (int): As in `ThreePlayerIPDEnv`.
+        cooperate_reward, defect_reward, sucker_reward, mutual_defect_reward (int): R, T, S, P as in the env.
+    """
+
+    def __init__(
+        self,
+        num_games: int,
+        num_rounds: int = 5,
+        cooperate_reward: int = 3,
+        defect_reward: int = 5,
+        sucker_reward: int = 0,
+        mutual_defect_reward: int = 1,
+    ):
+        self.num_games = num_games
+        self.num_rounds = num_rounds
+        R, T, S, P = cooperate_reward, defect_reward, sucker_reward, mutual_defect_reward
+        # payoff[mine, theirs] with True = cooperate
+        self.payoff = np.array([[P, T], [S, R]], dtype=np.int32)
+        self.reset()
+
+    def reset(self) -> None:
+        self.round = 1
+        self.scores = np.zeros((self.num_games, NUM_PLAYERS), dtype=np.int32)
+        self.history: List[np.ndarray] = []   # one (games, 3, 3) decision tensor per finished round
+
+    def done(self) -> bool:
+        return self.round > self.num_rounds
+
+    def step(self, cooperate: np.ndarray) -> np.ndarray:
+        """Resolve one round for every game; returns each player's gain, shape (games, 3)."""
+        cooperate = np.asarray(cooperate, dtype=bool)
+        if cooperate.shape != (self.num_games, NUM_PLAYERS, NUM_PLAYERS):
+            raise ValueError(f"expected decisions of shape {(self.num_games, NUM_PLAYERS, NUM_PLAYERS)}, got {cooperate.shape}")
+        pair = self.payoff[cooperate.astype(np.intp), cooperate.transpose(0, 2, 1).astype(np.intp)]
+        gain = (pair * _OFF_DIAGONAL).sum(axis=2)
+        self.scores += gain
+        self.history.append(cooperate)
+        self.round += 1
+        return gain
+
+    def decisions(self, policies: List[Policy]) -> np.ndarray:
+        return np.stack([policies[p](self, p) for p in range(NUM_PLAYERS)], axis=1)
+
+    def play(self, policies: List[Policy]) -> Dict[str, np.ndarray]:
+        """Play all remaining rounds with one policy per seat and return `results()`."""
+        while not self.done():
+            self.step(self.decisions(policies))
+        return self.results()
+
+    def results(self) -> Dict[str, np.ndarray]:
+        return {"scores": self.scores.copy(), "rewards": end_game_rewards(self.scores)}
+
+
+# Policies, vectorized counterparts of `ipd_engine.POLICIES`. Each opponent is treated
+# separately from what it did to us.
+
+def _broadcast(batch: IPDBatch, value: bool) -> np.ndarray:
+    return np.full((batch.num_games, NUM_PLAYERS), value, dtype=bool)
+
+
+def always_cooperate(batch: IPDBatch, player: int) -> np.ndarray:
+    return _broadcast(batch, True)
+
+
+def always_defect(batch: IPDBatch, player: int) -> np.ndarray:
+    return _broadcast(batch, False)
+
+
+def tit_for_tat(batch: IPDBatch, player: int) -> np.ndarray:
+    if not batch.history:
+        return _broadcast(batch, True)
+    return batch.history[-1][:, :, player].copy()
+
+
+def tit_for_two_tats(batch: IPDBatch, player: int) -> np.ndarray:
+    if len(batch.history) < 2:
+        return _broadcast(batch, True)
+    return batch.history[-1][:, :, player] | batch.history[-2][:, :, player]
+
+
+def grim(batch: IPDBatch, player: int) -> np.ndarray:
+    out = _broadcast(batch, True)
+    for h in batch.history:
+        out &= h[:, :, player]
+    return out
+
+
+def win_stay_lose_shift(batch: IPDBatch, player: int) -> np.ndarray:
+    if not batch.history:
+        return _broadcast(batch, True)
+    last = batch.history[-1]
+    return last[:, player, :] == last[:, :, player]
+
+
+def random_policy(p_cooperate: float = 0.5, rng: Optional[np.random.Generator] = None) -> Policy:
+    rng = rng or np.random.default_rng()
+    return lambda batch, player: rng.random((batch.num_games, NUM_PLAYERS)) < p_cooperate
+
+
+def noisy(policy: Policy, noise: float = 0.05, rng: Optional[np.random.Generator] = None) -> Policy:
+    """`policy` whose every decision flips with probability `noise`."""
+    rng = rng or np.random.default_rng()
+    return lambda batch, player: policy(batch, player) ^ (rng.random((batch.num_games, NUM_PLAYERS)) < noise)
+
+
+POLICIES: Dict[str, Policy] = {
+    "always_cooperate": always_cooperate,
+    "always_defect": always_defect,
+    "tit_for_tat": tit_for_tat,
+    "tit_for_two_tats": tit_for_two_tats,
+    "grim": grim,
+    "win_stay_lose_shift": win_stay_lose_shift,
+    "random": random_policy(),
+}
+
+
+def round_robin(policies: Optional[Dict[str, Policy]] = None, games: int = 1000, **env_kwargs) -> Dict[str, Dict[str, float]]:
+    """
+    Every multiset of three policies plays `games` games; returns per policy the mean
+    reward, mean score and number of seats played.
+    """
+    policies = policies or POLICIES
+    totals = {name: np.zeros(3) for name in policies}  # reward sum, score sum, seats
+    for names in combinations_with_replacement(policies, NUM_PLAYERS):
+        batch = IPDBatch(games, **env_kwargs)
+        res = batch.play([policies[n] for n in names])
+        for seat, name in enumerate(names):
+            totals[name] += (res["rewards"][:, seat].sum(), res["scores"][:, seat].sum(), games)
+    return {
+        name: {"mean_reward": t[0] / t[2], "mean_score": t[1] / t[2], "seats": int(t[2])}
+        for name, t in totals.items()
+    }
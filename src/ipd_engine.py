@@ -0,0 +1,157 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from observation_parser import IPDParser
+
+# Decision engine for the 3-player iterated prisoner's dilemma. Each opponent is modelled
+# separately: payoffs are pairwise, so the decision towards one opponent does not change
+# the payoff against the other. History of a pair = tuple of (my move, their move), with
+# moves as booleans (True = cooperate).
+
+History = Tuple[Tuple[bool, bool], ...]
+
+# P(opponent cooperates with me next round | pair history), one per policy hypothesis.
+def _always_cooperate(h: History) -> float: return 1.0
+def _always_defect(h: History) -> float: return 0.0
+def _tit_for_tat(h: History) -> float: return 1.0 if not h or h[-1][0] else 0.0
+def _tit_for_two_tats(h: History) -> float: return 0.0 if len(h) >= 2 and not h[-1][0] and not h[-2][0] else 1.0
+def _grim(h: History) -> float: return 1.0 if all(mine for mine, _ in h) else 0.0
+def _win_stay_lose_shift(h: History) -> float: return 1.0 if not h or h[-1][0] == h[-1][1] else 0.0
+def _random(h: History) -> float: return (sum(theirs for _, theirs in h) + 1.0) / (len(h) + 2.0)  # fitted rate, Laplace prior
+
+
+POLICIES: Dict[str, Callable[[History], float]] = {
+    "always_cooperate": _always_cooperate,
+    "always_defect": _always_defect,
+    "tit_for_tat": _tit_for_tat,
+    "tit_for_two_tats": _tit_for_two_tats,
+    "grim": _grim,
+    "win_stay_lose_shift": _win_stay_lose_shift,
+    "random": _random,
+}
+
+
+class IPDEngine:
+    """
+    Follows the round results written by `ThreePlayerIPDEnv._resolve_round` through an
+    `IPDParser`, fits a posterior over `POLICIES` (each with `noise` tremble) to every
+    opponent's history and picks each decision by expectimax over the remaining rounds.
+    The posterior is updated inside the lookahead too, so probing an unknown opponent is
+    valued correctly.
+
+    Args:
+        policies (dict, optional): name -> P(cooperate | pair history). Defaults to POLICIES.
+        prior (dict, optional): name -> prior weight of each policy. Defaults to uniform.
+        noise (float): Probability that an opponent deviates from its policy.
+        rivalry (float): Weight of the opponent's pair payoff subtracted from ours; the
+            env ranks by final score, so > 0 values trade own points for relative ones.
+        max_horizon (int): Rounds looked ahead (the remaining rounds, capped).
+        parser (IPDParser, optional): Shared observation parser; a private one by default.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, Callable[[History], float]]] = None,
+        prior: Optional[Dict[str, float]] = None,
+        noise: float = 0.05,
+        rivalry: float = 0.0,
+        max_horizon: int = 8,
+        parser: Optional[IPDParser] = None,
+    ):
+        self.policies = dict(policies or POLICIES)
+        self.prior = prior or {}
+        self.noise = noise
+        self.rivalry = rivalry
+        self.max_horizon = max_horizon
+        self.reset(parser)
+
+    def reset(self, parser: Optional[IPDParser] = None) -> None:
+        self.parser = parser or IPDParser()
+        self._payoffs = None
+        self._memo: Dict[Tuple[History, int], Tuple[float, bool]] = {}  # (pair history, rounds left) -> _value
+
+    @property
+    def state(self):
+        return self.parser.state
+
+    def update(self, observation: str) -> int:
+        """Parse results not seen yet; returns how many rounds were added."""
+        added = sum(ev.kind == "round" for ev in self.parser.feed(observation))
+        if self.state.payoffs != self._payoffs:
+            self._payoffs = dict(self.state.payoffs)
+            self._memo.clear()
+        return added
+
+    def cooperation_rates(self) -> Dict[int, float]:
+        """Fraction of rounds each opponent cooperated with us."""
+        rates = {}
+        for opp in self.opponents():
+            h = self.state.history_with(opp)
+            if h:
+                rates[opp] = sum(t for _, t in h) / len(h)
+        return rates
+
+    def is_decision_phase(self) -> bool:
+        """True when the latest phase announcement asks for decisions rather than chat."""
+        return self.state.phase == "decision"
+
+    def opponents(self) -> List[int]:
+        me = self.state.me
+        return [p for p in range(3) if p != me] if me is not None else []
+
+    def _p_cooperate(self, policy: Callable[[History], float], h: History) -> float:
+        return self.noise + (1.0 - 2.0 * self.noise) * policy(h)
+
+    def posterior(self, h: History) -> Dict[str, float]:
+        """Posterior over policies given the pair history."""
+        weights = {}
+        for name, policy in self.policies.items():
+            w = self.prior.get(name, 1.0)
+            for t, (_, theirs) in enumerate(h):
+                p = self._p_cooperate(policy, h[:t])
+                w *= p if theirs else 1.0 - p
+            weights[name] = w
+        total = sum(weights.values()) or 1.0
+        return {name: w / total for name, w in weights.items()}
+
+    def _next_cooperation(self, h: History) -> float:
+        post = self.posterior(h)
+        return sum(post[name] * self._p_cooperate(policy, h) for name, policy in self.policies.items())
+
+    def _gain(self, mine: bool, theirs: bool) -> float:
+        R, T, S, P = (self.state.payoffs[k] for k in "RTSP")
+        ours, other = {(True, True): (R, R), (False, False): (P, P), (True, False): (S, T), (False, True): (T, S)}[(mine, theirs)]
+        return ours - self.rivalry * other
+
+    def _value(self, h: History, rounds_left: int) -> Tuple[float, bool]:
+        """(expected value, cooperate?) of the best plan for the remaining rounds of one pair."""
+        if rounds_left <= 0:
+            return 0.0, True
+        cached = self._memo.get((h, rounds_left))
+        if cached is not None:
+            return cached
+        p = self._next_cooperation(h)
+        best = None
+        for mine in (True, False):
+            v = 0.0
+            for theirs, prob in ((True, p), (False, 1.0 - p)):
+                v += prob * (self._gain(mine, theirs) + self._value(h + ((mine, theirs),), rounds_left - 1)[0])
+            if best is None or v > best[0] + 1e-12:
+                best = (v, mine)
+        self._memo[(h, rounds_left)] = best
+        return best
+
+    def rounds_left(self) -> int:
+        """Rounds still to be decided, including the current one."""
+        return max(self.state.num_rounds - self.state.round + 1, 1)
+
+    def decide(self, observation: Optional[str] = None) -> Dict[int, bool]:
+        """Decision per opponent (True = cooperate) for the current round."""
+        if observation is not None:
+            self.update(observation)
+        horizon = min(self.rounds_left(), self.max_horizon)
+        return {opp: self._value(tuple(self.state.history_with(opp)), horizon)[1] for opp in self.opponents()}
+
+    def action(self, observation: Optional[str] = None) -> str:
+        """Decision tokens in the env's format, e.g. '[1 cooperate] [2 defect]'."""
+        return " ".join(f"[{opp} {'cooperate' if c else 'defect'}]" for opp, c in self.decide(observation).items())
+
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class JudgmentCache:
+    """
+    Pairwise verdicts keyed on compact hashes of (base_state, branch, branch). Lookups are
+    order-insensitive: a verdict stored for (a, b) is returned flipped for (b, a). Entries
+    are scoped (e.g. per game and evaluator model), bounded by an LRU, and optionally
+    persisted to SQLite so later runs reuse them.
+
+    Args:
+        path (str, optional): SQLite file for persistence. None keeps verdicts in memory only.
+        max_entries (int): Size of the in-memory LRU.
+        max_disk_entries (int, optional): Oldest rows beyond this are dropped from disk. None = unbounded.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 20_000, max_disk_entries: Optional[int] = 500_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._puts_since_evict = 0
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS judgments (scope TEXT NOT NULL, key TEXT NOT NULL, votes TEXT NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (scope, key))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS judgments_created_at ON judgments (created_at)")
+            self._db.commit()
+
+    @staticmethod
+    def _key(base_state: str, branch_a: Sequence[str], branch_b: Sequence[str]) -> Tuple[str, bool]:
+        """Canonical key for the unordered pair, and whether (a, b) is stored reversed."""
+        state = _digest(base_state)
+        da, db = _digest("\n".join(branch_a)), _digest("\n".join(branch_b))
+        if da <= db:
+            return f"{state}:{da}:{db}", False
+        return f"{state}:{db}:{da}", True
+
+    def _remember(self, mkey: Tuple[str, str], votes: List[float]) -> None:
+        self._memory[mkey] = votes
+        self._memory.move_to_end(mkey)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, scope: str, base_state: str, branch_a: Sequence[str], branch_b: Sequence[str]) -> Optional[List[float]]:
+        """Votes [a, b] for the pair, or None if it was never judged."""
+        key, flipped = self._key(base_state, branch_a, branch_b)
+        mkey = (scope, key)
+        with self._lock:
+            votes = self._memory.get(mkey)
+            if votes is not None:
+                self._memory.move_to_end(mkey)
+            elif self._db is not None:
+                row = self._db.execute("SELECT votes FROM judgments WHERE scope = ? AND key = ?", (scope, key)).fetchone()
+                if row is not None:
+                    votes = json.loads(row[0])
+                    self._remember(mkey, votes)
+            if votes is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return [votes[1], votes[0]] if flipped else list(votes)
+
+    def put(self, scope: str, base_state: str, branch_a: Sequence[str], branch_b: Sequence[str], votes: List[float]) -> None:
+        key, flipped = self._key(base_state, branch_a, branch_b)
+        stored = [votes[1], votes[0]] if flipped else list(votes)
+        with self._lock:
+            self._remember((scope, key), stored)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO judgments (scope, key, votes, created_at) VALUES (?, ?, ?, ?)",
+                    (scope, key, json.dumps(stored), time.time()),
+                )
+                self._puts_since_evict += 1
+                if self.max_disk_entries is not None and self._puts_since_evict >= 256:
+                    self._db.execute(
+                        "DELETE FROM judgments WHERE rowid IN ("
+                        "SELECT rowid FROM judgments ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_disk_entries,),
+                    )
+                    self._puts_since_evict = 0
+                self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._memory), "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,26 @@
+import importlib.util
+import os
+import sys
+import threading
+from types import ModuleType
+
+# The env modules in envs/ are reference copies of the envs installed into textarena.
+# `load_env_module` loads this tree's copy by path under a private package name, so code
+# in src/ (benchmarks, the Codenames clue index) can use it without shadowing the
+# installed `textarena.envs.*` modules. The env modules themselves import textarena.
+
+ENVS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "envs")
+PACKAGE = "_mindgames_envs"
+_LOCK = threading.Lock()
+
+
+def load_env_module(env: str) -> ModuleType:
+    """`envs/<env>/env.py` as `_mindgames_envs.<env>.env`, loaded once per process."""
+    name = f"{PACKAGE}.{env}.env"
+    with _LOCK:
+        if name not in sys.modules:
+            spec = importlib.util.spec_from_file_location(name, os.path.join(ENVS_DIR, env, "env.py"))
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            sys.modules[name] = module
+        return sys.modules[name]
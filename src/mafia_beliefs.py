@@ -0,0 +1,135 @@
+from itertools import combinations
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from observation_parser import MafiaParser
+
+
+class MafiaBeliefs:
+    """
+    Posterior over who the Mafia are, kept as a log-probability vector over all
+    C(n, num_mafia) mafia subsets (1365 for 15 players). Hard evidence (own role,
+    teammates, night victims, detective results) zeroes impossible subsets; day votes
+    are soft evidence: Mafia rarely vote for a teammate and villagers lean towards
+    voting for Mafia.
+
+    Args:
+        mafia_ratio (float): As in `SecretMafiaEnv`; num_mafia = max(1, round(n * ratio)).
+        mafia_vote_teammate (float): Relative likelihood of a Mafia vote landing on a teammate.
+        village_vote_mafia (float): Relative likelihood of a villager vote landing on a Mafia member.
+        parser (MafiaParser, optional): Shared observation parser; a private one by default.
+    """
+
+    def __init__(
+        self,
+        mafia_ratio: float = 0.25,
+        mafia_vote_teammate: float = 0.2,
+        village_vote_mafia: float = 1.5,
+        parser: Optional[MafiaParser] = None,
+    ):
+        self.mafia_ratio = mafia_ratio
+        # likelihood of a vote by [voter is mafia][target is mafia]
+        self._vote_weight = np.log(np.array([[1.0, village_vote_mafia], [1.0, mafia_vote_teammate]]))
+        self.reset(parser)
+
+    def reset(self, parser: Optional[MafiaParser] = None) -> None:
+        self.parser = parser or MafiaParser()
+        self.num_players = 0
+        self.subsets = np.zeros((0, 0), dtype=bool)
+        self.log_post = np.zeros(0)
+        self._pending: List[tuple] = []  # evidence seen before the player count was known
+
+    @property
+    def state(self):
+        return self.parser.state
+
+    def _init_players(self, n: int) -> None:
+        self.num_players = n
+        num_mafia = max(1, round(n * self.mafia_ratio))
+        subsets = list(combinations(range(n), num_mafia))
+        self.subsets = np.zeros((len(subsets), n), dtype=bool)
+        rows = np.repeat(np.arange(len(subsets)), num_mafia)
+        self.subsets[rows, np.array(subsets).ravel()] = True
+        self.log_post = np.zeros(len(subsets))
+        pending, self._pending = self._pending, []
+        for evidence in pending:
+            evidence[0](*evidence[1:])
+
+    def _require(self, pid: int, mafia: bool) -> None:
+        if not self.num_players:
+            self._pending.append((self._require, pid, mafia))
+            return
+        self.log_post[self.subsets[:, pid] != mafia] = -np.inf
+
+    def _vote(self, voter: int, target: int) -> None:
+        if not self.num_players:
+            self._pending.append((self._vote, voter, target))
+            return
+        if 0 <= voter < self.num_players and 0 <= target < self.num_players:
+            self.log_post += self._vote_weight[self.subsets[:, voter].astype(int), self.subsets[:, target].astype(int)]
+
+    def update(self, observation: str) -> int:
+        """Apply the evidence in text not seen yet; returns how many events were parsed."""
+        events = self.parser.feed(observation)
+        for ev in events:
+            if ev.kind == "players":
+                self._init_players(ev.data["num_players"])
+            elif ev.kind == "role":
+                if ev.data["player"] is not None and ev.data["role"] != "Mafia":
+                    self._require(ev.data["player"], False)
+            elif ev.kind == "teammates":
+                for pid in ev.data["players"]:
+                    self._require(pid, True)
+            elif ev.kind == "elimination" and ev.data["how"] == "night":
+                self._require(ev.data["player"], False)  # the Mafia can only target villagers
+            elif ev.kind == "investigation":
+                self._require(ev.data["player"], ev.data["mafia"])
+            elif ev.kind == "vote":
+                self._vote(ev.data["voter"], ev.data["target"])
+        return len(events)
+
+    def is_voting(self) -> bool:
+        """True while the day vote is open (as of the last update)."""
+        return self.state.phase == "voting"
+
+    def posterior(self) -> np.ndarray:
+        """Normalised probability of every mafia subset (rows of `self.subsets`)."""
+        if not len(self.log_post):
+            return self.log_post
+        finite = np.isfinite(self.log_post)
+        if not finite.any():  # contradictory evidence: fall back to the prior
+            return np.full(len(self.log_post), 1.0 / len(self.log_post))
+        p = np.exp(self.log_post - self.log_post[finite].max())
+        return p / p.sum()
+
+    def suspicion(self, alive_only: bool = True) -> Dict[int, float]:
+        """P(player is Mafia) per player."""
+        if not self.num_players:
+            return {}
+        scores = self.posterior() @ self.subsets
+        players = self.state.alive if alive_only else range(self.num_players)
+        return {p: float(scores[p]) for p in players}
+
+    def vote_target(self) -> Optional[int]:
+        """
+        Alive player to vote for: the most suspected one for the village; for the Mafia,
+        the villager already drawing the most votes today (ties: least suspected).
+        """
+        scores = self.suspicion()
+        candidates = [p for p in scores if p != self.state.me]
+        if not candidates:
+            return None
+        if self.state.role == "Mafia":
+            candidates = [p for p in candidates if scores[p] < 1.0] or candidates
+            today = {}
+            for day, _, target in self.state.votes:
+                if day == self.state.day:
+                    today[target] = today.get(target, 0) + 1
+            return max(candidates, key=lambda p: (today.get(p, 0), -scores[p]))
+        return max(candidates, key=lambda p: scores[p])
+
+    def summary(self, top: int = 3) -> str:
+        """Compact one-line digest for prompts."""
+        scores = sorted(self.suspicion().items(), key=lambda kv: -kv[1])[:top]
+        return "Most suspected: " + ", ".join(f"Player {p} ({s:.0%})" for p, s in scores)
@@ -0,0 +1,203 @@
+import math
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from prompts import VALUE_PROMPT_TEMPLATE
+from simulation_utils import _node_messages, _node_actions, _candidate_paths, _show_branch, extract_value
+from transposition import TranspositionTable
+from move_validation import MoveValidator
+from action_table import ActionTable
+
+
+def llm_value(model, system_prompt: str = "You are a game evaluator.") -> Callable[[str, List[str]], float]:
+    """Value function that asks the model for the agent's win probability after a simulated future."""
+    def value(game_state: str, path: List[str]) -> float:
+        if not path:
+            return 0.5
+        prompt = VALUE_PROMPT_TEMPLATE.format(base_state=game_state, future="\n".join(path))
+        resp = model.get_completion([{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}])
+        v = extract_value(resp)
+        return 0.5 if v is None else v
+    return value
+
+
+class MCTSNode:
+    __slots__ = ("path", "role", "prior", "children", "visits", "value_sum", "expanded")
+
+    def __init__(self, path: List[str], role: str, prior: float = 1.0):
+        self.path = path            # tagged actions from the root state to this node
+        self.role = role            # whose move it is at this node ("agent" / "opponent")
+        self.prior = prior
+        self.children: List["MCTSNode"] = []
+        self.visits = 0
+        self.value_sum = 0.0        # sum of agent-perspective values in [0, 1]
+        self.expanded = False
+
+    def q(self) -> float:
+        return self.value_sum / self.visits if self.visits else 0.5
+
+
+class MCTS:
+    """
+    PUCT search over LLM proposals. Each expansion asks the proposal prompt for the
+    node's candidate moves (rank-weighted priors); leaves are scored by `value_fn`
+    (LLM evaluator by default, or any cheap heuristic). Values are always from the
+    agent's perspective; opponent nodes select by 1 - Q.
+
+    Args:
+        model: UnifiedAIClient used for proposals (and for the default value function).
+        game_state (str): Current observation.
+        game (str): Game name as used by `simulate_game_tree`.
+        root_role (str): Who moves first in the simulated future.
+        max_depth (int): Plies below the root that can be expanded.
+        k_per_node (int): Proposals kept per expansion.
+        value_fn (callable, optional): (game_state, path) -> win probability for the agent.
+        c_puct (float): Exploration constant.
+        table (TranspositionTable, optional): Shared node memo so repeated nodes cost no extra calls.
+        validator (MoveValidator, optional): Drops illegal proposals before they become children.
+        action_table (ActionTable, optional): Merges proposals that are the same move spelled differently.
+    """
+
+    def __init__(
+        self,
+        model,
+        game_state: str,
+        game: str,
+        root_role: str = "agent",
+        max_depth: int = 4,
+        k_per_node: int = 5,
+        value_fn: Optional[Callable[[str, List[str]], float]] = None,
+        c_puct: float = 1.5,
+        table: Optional[TranspositionTable] = None,
+        validator: Optional[MoveValidator] = None,
+        action_table: Optional[ActionTable] = None,
+        debug: bool = False,
+        debug_max_chars: int = 160,
+    ):
+        self.model = model
+        self.game_state = game_state
+        self.game = game
+        self.max_depth = max_depth
+        self.k_per_node = k_per_node
+        self.value_fn = value_fn or llm_value(model)
+        self.c_puct = c_puct
+        self.table = table
+        self.validator = validator
+        self.action_table = action_table
+        self.debug = debug
+        self.debug_max_chars = debug_max_chars
+        self.root = MCTSNode([], root_role)
+        self.simulations = 0
+        self._values: Dict[tuple, float] = {}
+
+    def _expand(self, node: MCTSNode) -> None:
+        depth = len(node.path)
+
+        def propose():
+            response = self.model.get_completion(_node_messages(self.game_state, node.path, node.role, self.game))
+            return _node_actions(response, node.role, depth, self.k_per_node, self.debug, self.debug_max_chars, self.validator, self.action_table)
+
+        if self.table is not None:
+            key = self.table.node_key(self.game, self.game_state, node.path, node.role, self.k_per_node, action_table=self.action_table)
+            actions = self.table.expand(key, propose)
+        else:
+            actions = propose()
+        paths = _candidate_paths(actions, node.path, node.role, depth, False, self.debug_max_chars)
+        # proposals come in the model's preference order; weight earlier ones higher
+        weights = [1.0 / (i + 1) for i in range(len(paths))]
+        total = sum(weights)
+        next_role = "opponent" if node.role == "agent" else "agent"
+        node.children = [MCTSNode(p, next_role, w / total) for p, w in zip(paths, weights)]
+        node.expanded = True
+
+    def _select(self, node: MCTSNode) -> MCTSNode:
+        sqrt_n = math.sqrt(max(node.visits, 1))
+        best, best_score = None, -math.inf
+        for child in node.children:
+            q = child.q() if node.role == "agent" else 1.0 - child.q()
+            score = q + self.c_puct * child.prior * sqrt_n / (1 + child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    def _evaluate(self, node: MCTSNode) -> float:
+        key = tuple(node.path)
+        if key not in self._values:
+            self._values[key] = self.value_fn(self.game_state, node.path)
+        return self._values[key]
+
+    def run(self, num_simulations: Optional[int] = 32, time_budget: Optional[float] = None) -> "MCTS":
+        """Run until `num_simulations` playouts or `time_budget` seconds, whichever comes first."""
+        if num_simulations is None and time_budget is None:
+            raise ValueError("MCTS needs a simulation or time budget")
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        if not self.root.expanded:
+            self._expand(self.root)
+        done = 0
+        while num_simulations is None or done < num_simulations:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            node = self.root
+            visited = [node]
+            while node.expanded and node.children:
+                node = self._select(node)
+                visited.append(node)
+            if len(node.path) < self.max_depth:
+                self._expand(node)
+            value = self._evaluate(node)
+            for n in visited:
+                n.visits += 1
+                n.value_sum += value
+            done += 1
+            if self.debug:
+                print(f"[MCTS] sim {done}: v={value:.2f} {_show_branch(node.path, max_steps=6, max_chars=self.debug_max_chars)}")
+        self.simulations += done
+        return self
+
+    def advance(self, matchers: List[Callable[[str], bool]], game_state: str) -> bool:
+        """
+        Promote the subtree reached by the moves actually played to be the new root, so
+        its expansions and statistics carry over to the next turn. `matchers` recognise
+        the played move at each successive ply. Returns False (tree unchanged) when a
+        move was never simulated.
+        """
+        node = self.root
+        for match in matchers:
+            node = next((c for c in node.children if match(c.path[-1])), None)
+            if node is None:
+                return False
+        prefix = tuple(node.path)
+        consumed = len(prefix)
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            n.path = n.path[consumed:]
+            stack.extend(n.children)
+        node.prior = 1.0
+        self.root = node
+        self.game_state = game_state
+        self._values = {k[consumed:]: v for k, v in self._values.items() if k[:consumed] == prefix}
+        return True
+
+    def root_visits(self) -> Dict[str, int]:
+        """
+        Visit counts of the agent's first moves. When the opponent moves first (simultaneous
+        games modelled opponent-first), the agent's replies are pooled across opponent branches.
+        """
+        visits: Dict[str, int] = defaultdict(int)
+        if self.root.role == "agent":
+            for child in self.root.children:
+                visits[child.path[-1]] += child.visits
+        else:
+            for opp in self.root.children:
+                for child in opp.children:
+                    visits[child.path[-1]] += child.visits
+        return dict(visits)
+
+    def best_action(self) -> str:
+        visits = self.root_visits()
+        if not visits:
+            return "pass"
+        best = max(visits, key=visits.get)
+        return best.replace("<action>", "").replace("</action>", "")
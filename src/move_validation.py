@@ -0,0 +1,233 @@
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from observation_parser import ObservationParser
+
+# Legal-move validators. Proposals are checked against the rules the env applies in
+# `step`, right after they are extracted from the LLM response, so illegal moves are never
+# expanded, judged or played. Legal moves are rewritten in one canonical form, which also
+# merges spelling variants of the same move. Where textarena is installed the env's own
+# parsing code is used; otherwise the same rules are mirrored here.
+
+try:
+    from textarena.envs.ColonelBlotto.env import ColonelBlottoEnv
+    from textarena.envs.ThreePlayerIPD.env import ThreePlayerIPDEnv
+except ImportError:
+    ColonelBlottoEnv = ThreePlayerIPDEnv = None
+
+_TAG = re.compile(r"^\s*<(action|opponent_action)>(.*?)</\1>\s*$", re.S)
+
+
+def _untag(move: str):
+    """(role, action) for a tagged tree step, (None, move) for a bare action."""
+    m = _TAG.match(move)
+    if not m:
+        return None, move.strip()
+    return ("agent" if m.group(1) == "action" else "opponent"), m.group(2).strip()
+
+
+class MoveValidator(ABC):
+    """
+    Base class: `canonical(action, role)` returns the canonical form of a legal action and
+    None for an illegal one. Counts every check so the prune rate can be reported.
+
+    Args:
+        parser (ObservationParser): The episode's parser; rules are read from its live state.
+    """
+
+    def __init__(self, parser: ObservationParser):
+        self.parser = parser
+        self.checked = 0
+        self.pruned = 0
+
+    @property
+    def state(self):
+        return self.parser.state
+
+    @abstractmethod
+    def canonical(self, action: str, role: str = "agent") -> Optional[str]:
+        """Canonical form of `action` if it is legal for `role` in the current state, else None."""
+
+    def check(self, action: str, role: str = "agent") -> Optional[str]:
+        self.checked += 1
+        legal = self.canonical(action, role)
+        if legal is None:
+            self.pruned += 1
+        return legal
+
+    def filter(self, actions: List[str], role: str = "agent") -> List[str]:
+        """Canonical forms of the legal `actions`, in order."""
+        out = []
+        for a in actions:
+            tag_role, bare = _untag(a)
+            legal = self.check(bare, tag_role or role)
+            if legal is not None:
+                out.append(legal)
+        return out
+
+    def filter_branches(self, branches: List[List[str]]) -> List[List[str]]:
+        """
+        Branches of tagged steps whose every step is legal, with the steps canonicalised.
+        The tree's 'pass' placeholder for a node without proposals is kept as is.
+        """
+        out = []
+        for branch in branches:
+            steps = []
+            for step in branch:
+                role, bare = _untag(step)
+                if bare == "pass":
+                    steps.append(step)
+                    continue
+                legal = self.check(bare, role or "agent")
+                if legal is None:
+                    break
+                tag = "action" if role != "opponent" else "opponent_action"
+                steps.append(f"<{tag}>{legal}</{tag}>")
+            else:
+                out.append(steps)
+        return out
+
+    def prune_rate(self) -> float:
+        return self.pruned / self.checked if self.checked else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {"checked": self.checked, "pruned": self.pruned, "prune_rate": round(self.prune_rate(), 3)}
+
+
+# Colonel Blotto
+
+def _parse_allocation_input(self, action_string: str) -> Optional[Dict[str, int]]:
+    """Mirror of `ColonelBlottoEnv._parse_allocation_input`."""
+    if not action_string or not action_string.strip(): return None
+    raw = action_string.strip()
+    bracket_match = re.search(r"\[([^\]]+)\]", raw)
+    s = (bracket_match.group(1) if bracket_match else raw).strip()
+    if not s: return None
+    token_re = re.compile(r"([A-Za-z])\s*:?\s*(\d+)", re.IGNORECASE)
+    matches = list(token_re.finditer(s))
+    if not matches: return None
+    allocations: Dict[str, int] = {}
+    for m in matches:
+        field = m.group(1).upper()
+        if field in allocations: return None
+        allocations[field] = int(m.group(2))
+    leftovers = re.sub(r"[\s,]+", "", token_re.sub("", s))
+    if leftovers: return None
+    for fname in self.field_names: allocations.setdefault(fname, 0)
+    return allocations
+
+
+def _validate_allocation(self, allocation_dict: Optional[Dict[str, int]]) -> str:
+    """Mirror of `ColonelBlottoEnv._validate_allocation`."""
+    if allocation_dict is None:                                                 return "Invalid input format. Use: A:5, B:10, C:5"
+    if any(f not in self.field_names for f in allocation_dict):                 return f"Invalid field name(s). Valid fields: {', '.join(self.field_names)}"
+    if any(not isinstance(u, int) or u < 0 for u in allocation_dict.values()):  return "All allocations must be non-negative integers."
+    if sum(allocation_dict.values()) > self.num_total_units:                    return f"You cannot allocate more than {self.num_total_units} units. Current sum: {sum(allocation_dict.values())}"
+    return "Allocation is good."
+
+
+if ColonelBlottoEnv is not None:
+    _parse_allocation_input = ColonelBlottoEnv._parse_allocation_input
+    _validate_allocation = ColonelBlottoEnv._validate_allocation
+
+
+class BlottoValidator(MoveValidator):
+    """Allocations the env accepts, as '[A4 B2 C14]'. Both sides share the same rules."""
+
+    @property
+    def field_names(self) -> List[str]:
+        return self.state.field_names
+
+    @property
+    def num_total_units(self) -> int:
+        return self.state.num_total_units
+
+    def canonical(self, action: str, role: str = "agent") -> Optional[str]:
+        # the env methods only read `field_names` and `num_total_units`, which this class provides
+        allocation = _parse_allocation_input(self, action)
+        if _validate_allocation(self, allocation) != "Allocation is good.":
+            return None
+        return "[" + " ".join(f"{f}{allocation[f]}" for f in self.field_names) + "]"
+
+
+# 3-player IPD
+
+@lru_cache(maxsize=1)
+def _ipd_token() -> "re.Pattern":
+    """The env's decision-token pattern; the env is only built on first use, not at import."""
+    if ThreePlayerIPDEnv is not None:
+        return ThreePlayerIPDEnv().token_pat
+    return re.compile(r"\[\s*(\d+)\s+(cooperate|defect)\s*\]", re.I)
+
+
+class IPDValidator(MoveValidator):
+    """
+    Decision turns: at least one token for a valid opponent (self-targets and unknown ids
+    are ignored by the env). Our own decisions are completed with the env's default
+    'cooperate' and written in opponent order, e.g. '[1 cooperate] [2 defect]'. Chat
+    turns accept any message.
+    """
+
+    def canonical(self, action: str, role: str = "agent") -> Optional[str]:
+        if self.state.phase != "decision":
+            return action.strip() or None
+        me = self.state.me if role == "agent" else None
+        choices = {}
+        for pid, choice in _ipd_token().findall(action):
+            target = int(pid)
+            if target in range(3) and target != me:
+                choices[target] = "defect" if choice.lower().startswith("d") else "cooperate"  # later tokens win
+        if not choices:
+            return None
+        if me is not None:
+            choices = {p: choices.get(p, "cooperate") for p in range(3) if p != me}
+        return " ".join(f"[{p} {c}]" for p, c in sorted(choices.items()))
+
+
+# Codenames
+
+_CLUE = re.compile(r"\[(\w+)\s+(\d+)\]")
+_GUESS = re.compile(r"\[(\w+)\]")
+
+
+class CodenamesValidator(MoveValidator):
+    """
+    Spymaster: '[word n]' whose word neither contains nor is contained in a board word.
+    Operative: '[pass]' or a board word not revealed yet. Opponent moves may be either.
+    Rules as in `CodenamesEnv.step`; without a parsed board only the format is checked.
+    """
+
+    def _clue(self, action: str) -> Optional[str]:
+        m = _CLUE.search(action)
+        if not m:
+            return None
+        word = m.group(1)
+        if any(word in b or b in word for b in self.state.board):
+            return None
+        return f"[{word} {int(m.group(2))}]"
+
+    def _guess(self, action: str) -> Optional[str]:
+        m = _GUESS.search(action)
+        if not m:
+            return None
+        word = m.group(1).lower()
+        if word == "pass":
+            return "[pass]"
+        board = self.state.board
+        if board and (word not in board or word in self.state.revealed):
+            return None
+        return f"[{word}]"
+
+    def canonical(self, action: str, role: str = "agent") -> Optional[str]:
+        if role == "agent":
+            return self._clue(action) if self.state.spymaster else self._guess(action)
+        return self._clue(action) or self._guess(action)
+
+
+VALIDATORS = {
+    "colonel blotto": BlottoValidator,
+    "3-player iterated prisoner's dilemma": IPDValidator,
+    "codenames": CodenamesValidator,
+}
@@ -0,0 +1,387 @@
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+# Stateful per-game observation parsers. textarena observations either grow every turn
+# (the whole transcript) or carry only the messages since the player's last turn; the
+# parser remembers how much it consumed and only scans the new suffix, so per-turn work
+# stays constant however long the game gets. Parsed text becomes `Event`s that update a
+# typed state object.
+
+
+class Event(NamedTuple):
+    kind: str               # e.g. "round", "vote", "clue", "guess", "elimination"
+    data: Dict[str, Any]
+
+
+_ANCHOR = 64  # characters before the consumed offset that must match for a suffix-only scan
+
+
+class ObservationParser(ABC):
+    """
+    Base class: `feed(observation)` returns the events found in text not seen before and
+    applies them to `self.state`. Subclasses define `_new_state()` and `_parse(text)`.
+    """
+
+    game = ""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.state = self._new_state()
+        self.events: List[Event] = []
+        self._consumed = 0
+        self._anchor = ""
+
+    @abstractmethod
+    def _new_state(self):
+        """Empty state object of the game."""
+
+    @abstractmethod
+    def _parse(self, text: str) -> List[Event]:
+        """Events found in `text` (new observation text only), applied to `self.state`."""
+
+    def _suffix(self, observation: str) -> str:
+        """The part of `observation` not consumed yet."""
+        n = self._consumed
+        if n and len(observation) >= n and observation[max(n - _ANCHOR, 0):n] == self._anchor:
+            new_text = observation[n:]  # cumulative observation: only the appended part
+        else:
+            new_text = observation  # observation holds only the messages since our last turn
+        self._consumed = len(observation)
+        self._anchor = observation[-_ANCHOR:]
+        return new_text
+
+    def feed(self, observation: str) -> List[Event]:
+        new_text = self._suffix(observation)
+        if not new_text:
+            return []
+        events = self._parse(new_text)
+        self.events.extend(events)
+        return events
+
+
+# Colonel Blotto
+
+@dataclass
+class BlottoState:
+    me: Optional[int] = None                    # 0 = Commander Alpha, 1 = Commander Beta
+    field_names: List[str] = field(default_factory=lambda: ["A", "B", "C"])
+    num_total_units: int = 20
+    round: int = 1                              # round being played
+    scores: List[int] = field(default_factory=lambda: [0, 0])
+    # (alpha allocation, beta allocation, winner: 0 / 1 / None for a tie), one per finished round
+    history: List[Tuple[Tuple[int, ...], Tuple[int, ...], Optional[int]]] = field(default_factory=list)
+
+    def opponent_allocations(self) -> List[Tuple[int, ...]]:
+        side = 1 if self.me == 0 else 0
+        return [h[side] for h in self.history]
+
+
+_BLOTTO_ME = re.compile(r"You are (Commander Alpha|Commander Beta)")
+_BLOTTO_UNITS = re.compile(r"(?:allocate up to|Units to allocate:)\s*(\d+)")
+_BLOTTO_FIELDS = re.compile(r"(?:across fields|Available fields):\s*([A-Z](?:\s*,\s*[A-Z])*)")
+_BLOTTO_ROUND = re.compile(
+    r"Round (\d+)\s*\nCommander Alpha allocated:\s*(.*)\n\s*Commander Beta allocated:\s*(.*)\n(?:Winner: Commander (Alpha|Beta)|Tie!)"
+)
+_UNITS = re.compile(r"([A-Z]):\s*(\d+)")
+
+
+class BlottoParser(ObservationParser):
+    game = "colonel blotto"
+
+    def _new_state(self) -> BlottoState:
+        return BlottoState()
+
+    def _allocation(self, text: str) -> Tuple[int, ...]:
+        units = dict(_UNITS.findall(text))
+        return tuple(int(units.get(f, 0)) for f in self.state.field_names)
+
+    def _parse(self, text: str) -> List[Event]:
+        s = self.state
+        events = []
+        me = _BLOTTO_ME.findall(text)
+        if me:
+            s.me = 0 if me[-1] == "Commander Alpha" else 1
+        fields = _BLOTTO_FIELDS.findall(text)
+        if fields:
+            s.field_names = [f.strip() for f in fields[-1].split(",")]
+        units = _BLOTTO_UNITS.findall(text)
+        if units:
+            s.num_total_units = int(units[-1])
+        for number, alpha, beta, winner in _BLOTTO_ROUND.findall(text):
+            number = int(number)
+            if number < s.round:  # counter went back: new game
+                self.state = s = BlottoState(me=s.me, field_names=s.field_names, num_total_units=s.num_total_units)
+            winner = {"Alpha": 0, "Beta": 1}.get(winner)
+            if winner is not None:
+                s.scores[winner] += 1
+            s.history.append((self._allocation(alpha), self._allocation(beta), winner))
+            s.round = number + 1
+            events.append(Event("round", {"round": number, "alpha": s.history[-1][0], "beta": s.history[-1][1], "winner": winner}))
+        return events
+
+
+# Three-player iterated prisoner's dilemma
+
+@dataclass
+class IPDState:
+    me: Optional[int] = None
+    num_rounds: int = 5
+    payoffs: Dict[str, int] = field(default_factory=lambda: {"R": 3, "T": 5, "S": 0, "P": 1})
+    round: int = 1
+    phase: str = "conversation"                 # "conversation" / "decision"
+    scores: Dict[int, int] = field(default_factory=dict)
+    # (i, j) with i < j -> [(i cooperated?, j cooperated?), ...] per finished round
+    pairs: Dict[Tuple[int, int], List[Tuple[bool, bool]]] = field(default_factory=dict)
+    chat: List[Tuple[int, int, str]] = field(default_factory=list)  # (round, player, message)
+
+    def history_with(self, opponent: int) -> List[Tuple[bool, bool]]:
+        """(my move, their move) per round against `opponent`, moves as True = cooperate."""
+        if self.me is None:
+            return []
+        i, j = sorted((self.me, opponent))
+        rows = self.pairs.get((i, j), [])
+        return rows if self.me == i else [(b, a) for a, b in rows]
+
+
+_IPD_ME = re.compile(r"You are Player (\d+) in a 3-player Iterated Prisoner's Dilemma")
+_IPD_ROUNDS = re.compile(r"The match lasts (\d+) rounds")
+_IPD_PAYOFF = {
+    "R": re.compile(r"Both cooperate\s*->\s*(-?\d+)"),
+    "P": re.compile(r"Both defect\s*->\s*(-?\d+)"),
+    "T": re.compile(r"You defect, they cooperate\s*->\s*(-?\d+)"),
+    "S": re.compile(r"You cooperate, they defect\s*->\s*(-?\d+)"),
+}
+_IPD_EVENTS = re.compile(
+    r"(?P<start>Starting Round (?P<start_round>\d+))"
+    r"|(?P<decide>Chat finished for round (?P<decide_round>\d+))"
+    r"|(?P<results>### Round (?P<result_round>\d+) - Results:(?P<block>.*?)-> Current scores: (?P<scores>[^\n]*))"
+    r"|(?P<say>^\[Player (?P<speaker>\d+)\][ \t]*(?P<message>[^\n]*)$)",
+    re.S | re.M,
+)
+_IPD_PAIR = re.compile(r"Player (\d+) vs Player (\d+) chose to (cooperate|defect) and (cooperate|defect)")
+_IPD_SCORE = re.compile(r"Player (\d+) \((-?\d+)\)")
+
+
+class IPDParser(ObservationParser):
+    game = "3-player iterated prisoner's dilemma"
+
+    def _new_state(self) -> IPDState:
+        return IPDState()
+
+    def _parse(self, text: str) -> List[Event]:
+        s = self.state
+        events = []
+        me = _IPD_ME.findall(text)
+        if me:
+            s.me = int(me[-1])
+            rounds = _IPD_ROUNDS.findall(text)
+            if rounds:
+                s.num_rounds = int(rounds[-1])
+            payoffs = {k: pat.findall(text) for k, pat in _IPD_PAYOFF.items()}
+            if all(payoffs.values()):
+                s.payoffs = {k: int(v[-1]) for k, v in payoffs.items()}
+        for m in _IPD_EVENTS.finditer(text):
+            if m.group("start"):
+                number = int(m.group("start_round"))
+                if number < s.round:  # counter went back: new game
+                    self.state = s = IPDState(me=s.me, num_rounds=s.num_rounds, payoffs=s.payoffs)
+                s.round, s.phase = number, "conversation"
+            elif m.group("decide"):
+                s.phase = "decision"
+                events.append(Event("decision_phase", {"round": int(m.group("decide_round"))}))
+            elif m.group("results"):
+                number = int(m.group("result_round"))
+                moves = {}
+                for i, j, a, b in _IPD_PAIR.findall(m.group("block")):
+                    pair = (int(i), int(j))
+                    moves[pair] = (a == "cooperate", b == "cooperate")
+                    s.pairs.setdefault(pair, []).append(moves[pair])
+                s.scores = {int(p): int(v) for p, v in _IPD_SCORE.findall(m.group("scores"))}
+                s.round, s.phase = number + 1, "conversation"
+                events.append(Event("round", {"round": number, "moves": moves, "scores": dict(s.scores)}))
+            elif s.phase == "conversation":
+                player, message = int(m.group("speaker")), m.group("message").strip()
+                s.chat.append((s.round, player, message))
+                events.append(Event("chat", {"round": s.round, "player": player, "message": message}))
+        return events
+
+
+# Codenames
+
+@dataclass
+class CodenamesState:
+    me: Optional[int] = None
+    team: Optional[str] = None                  # "R" / "B"
+    spymaster: bool = False
+    board: Dict[str, Optional[str]] = field(default_factory=dict)  # word -> label ("R"/"B"/"N"/"A"), None if unknown
+    revealed: Set[str] = field(default_factory=set)
+    clues: List[Tuple[str, str, int]] = field(default_factory=list)       # (team, word, number)
+    guesses: List[Tuple[str, str, Optional[str]]] = field(default_factory=list)  # (team, word, label if known)
+
+    def words(self, label: str, unrevealed: bool = True) -> List[str]:
+        return [w for w, l in self.board.items() if l == label and not (unrevealed and w in self.revealed)]
+
+
+_CN_ME = re.compile(r"You are Player (\d+), the (Spymaster|Operative) for (Red|Blue) team")
+_CN_EVENTS = re.compile(
+    r"(?P<board>Codenames Words:\n(?P<rows>(?:\w+[ \t]*(?:[RBNA](?![\w]))?[ \t]*(?:revealed)?[ \t]*\n)+))"
+    r"|(?P<clue>Spymaster of (?P<clue_team>Red|Blue) team, Player \d+, submitted \[(?P<clue_word>\w+) (?P<clue_n>\d+)\]\.)"
+    r"|(?P<right>Operator of (?P<right_team>Red|Blue) team, Player \d+, correctly guessed \[(?P<right_word>\w+)\]\.)"
+    r"|(?P<wrong>Operator of (?P<wrong_team>Red|Blue) team, Player \d+, wrongly guessed \[(?P<wrong_word>\w+)\]\. It is a (?P<wrong_label>Red Team|Blue Team|Neutral) word\.)",
+)
+_CN_ROW = re.compile(r"^(\w+)[ \t]*([RBNA](?![\w]))?[ \t]*(revealed)?[ \t]*$", re.M)
+_TEAM = {"Red": "R", "Blue": "B", "Red Team": "R", "Blue Team": "B", "Neutral": "N"}
+
+
+class CodenamesParser(ObservationParser):
+    game = "codenames"
+
+    def _new_state(self) -> CodenamesState:
+        return CodenamesState()
+
+    def _parse(self, text: str) -> List[Event]:
+        s = self.state
+        events = []
+        me = _CN_ME.findall(text)
+        if me:
+            s.me, s.spymaster, s.team = int(me[-1][0]), me[-1][1] == "Spymaster", _TEAM[me[-1][2]]
+        for m in _CN_EVENTS.finditer(text):
+            if m.group("board"):
+                board = {}
+                for word, label, revealed in _CN_ROW.findall(m.group("rows")):
+                    board[word] = label or None
+                    if revealed or (label and not s.spymaster):  # operatives only see labels once revealed
+                        s.revealed.add(word)
+                if set(board) != set(s.board):  # a different board: new game
+                    self.state = s = CodenamesState(me=s.me, team=s.team, spymaster=s.spymaster, revealed=s.revealed & set(board))
+                s.board = {w: board[w] or s.board.get(w) for w in board}
+                events.append(Event("board", {"words": list(board)}))
+            elif m.group("clue"):
+                clue = (_TEAM[m.group("clue_team")], m.group("clue_word").lower(), int(m.group("clue_n")))
+                s.clues.append(clue)
+                events.append(Event("clue", {"team": clue[0], "word": clue[1], "number": clue[2]}))
+            else:
+                right = bool(m.group("right"))
+                team = _TEAM[m.group("right_team") if right else m.group("wrong_team")]
+                word = (m.group("right_word") if right else m.group("wrong_word")).lower()
+                label = team if right else _TEAM[m.group("wrong_label")]
+                s.revealed.add(word)
+                if s.board.get(word) is None and word in s.board:
+                    s.board[word] = label
+                s.guesses.append((team, word, label))
+                events.append(Event("guess", {"team": team, "word": word, "label": label, "correct": right}))
+        return events
+
+
+# SecretMafia
+
+@dataclass
+class MafiaState:
+    me: Optional[int] = None
+    role: Optional[str] = None
+    num_players: int = 0
+    teammates: List[int] = field(default_factory=list)
+    alive: List[int] = field(default_factory=list)
+    day: int = 0
+    phase: str = "night"                        # "night" / "discussion" / "voting"
+    votes: List[Tuple[int, int, int]] = field(default_factory=list)  # (day, voter, target)
+    eliminated: List[Tuple[int, str]] = field(default_factory=list)   # (player, "vote" / "night" / "invalid")
+    investigations: Dict[int, bool] = field(default_factory=dict)     # player -> is mafia (detective only)
+    chat: List[Tuple[int, int, str]] = field(default_factory=list)    # (day, player, message)
+
+
+_MAFIA_EVENTS = re.compile(
+    r"(?P<me>You are Player (?P<me_id>\d+)\.)"
+    r"|(?P<role>Your role: (?P<role_name>\w+))"
+    r"|(?P<players>Players: (?P<player_list>Player \d+(?:, Player \d+)*))"
+    r"|(?P<team>Your teammates are: (?P<teammates>Player \d+(?:, Player \d+)*))"
+    r"|(?P<voting>Voting phase - submit one vote)"
+    r"|(?P<day>Day breaks\.)"
+    r"|(?P<night>Night has fallen\.)"
+    r"|(?P<voted_out>Player (?P<voted_id>\d+) was eliminated by vote\.)"
+    r"|(?P<no_consensus>No consensus - nobody was eliminated\.)"
+    r"|(?P<killed>Player (?P<killed_id>\d+) was killed during the night\.)"
+    r"|(?P<saved>No one was killed tonight\.)"
+    r"|(?P<invalid>Player (?P<invalid_id>\d+) has been eliminated by making an invalid move\.)"
+    r"|(?P<reveal>Player (?P<reveal_id>\d+) IS(?P<reveal_not> NOT)? a Mafia member\.)"
+    r"|(?P<say>^\[Player (?P<speaker>\d+)\][ \t]*(?P<message>.*)$)",
+    re.M,
+)
+_PLAYER_ID = re.compile(r"Player (\d+)")
+_VOTE = re.compile(r".*\[(?:player\s*)?(\d+)\].*", re.I)  # SecretMafiaEnv.voting_pattern
+
+
+class MafiaParser(ObservationParser):
+    game = "secret mafia"
+
+    def _new_state(self) -> MafiaState:
+        return MafiaState()
+
+    def _eliminate(self, pid: int, how: str) -> Event:
+        s = self.state
+        if pid in s.alive:
+            s.alive.remove(pid)
+        s.eliminated.append((pid, how))
+        return Event("elimination", {"player": pid, "how": how})
+
+    def _parse(self, text: str) -> List[Event]:
+        s = self.state
+        events = []
+        for m in _MAFIA_EVENTS.finditer(text):
+            if m.group("me"):
+                s.me = int(m.group("me_id"))
+            elif m.group("role"):
+                s.role = m.group("role_name")
+                events.append(Event("role", {"player": s.me, "role": s.role}))
+            elif m.group("players"):
+                n = len(_PLAYER_ID.findall(m.group("player_list")))
+                if n != s.num_players:
+                    s.num_players, s.alive = n, list(range(n))
+                    events.append(Event("players", {"num_players": n}))
+            elif m.group("team"):
+                s.teammates = [int(p) for p in _PLAYER_ID.findall(m.group("teammates"))]
+                events.append(Event("teammates", {"players": list(s.teammates)}))
+            elif m.group("voting"):
+                s.phase = "voting"
+                events.append(Event("voting_phase", {"day": s.day}))
+            elif m.group("day"):
+                s.day += 1
+                s.phase = "discussion"
+            elif m.group("night"):
+                s.phase = "night"
+            elif m.group("voted_out"):
+                s.phase = "night"
+                events.append(self._eliminate(int(m.group("voted_id")), "vote"))
+            elif m.group("no_consensus"):
+                s.phase = "night"
+            elif m.group("killed"):
+                events.append(self._eliminate(int(m.group("killed_id")), "night"))
+            elif m.group("invalid"):
+                events.append(self._eliminate(int(m.group("invalid_id")), "invalid"))
+            elif m.group("reveal"):
+                pid, is_mafia = int(m.group("reveal_id")), not m.group("reveal_not")
+                s.investigations[pid] = is_mafia
+                events.append(Event("investigation", {"player": pid, "mafia": is_mafia}))
+            elif m.group("say"):
+                player, message = int(m.group("speaker")), m.group("message").strip()
+                if s.phase == "voting":
+                    target = _VOTE.search(message)
+                    if target is not None:
+                        s.votes.append((s.day, player, int(target.group(1))))
+                        events.append(Event("vote", {"day": s.day, "voter": player, "target": int(target.group(1))}))
+                        continue
+                s.chat.append((s.day, player, message))
+                events.append(Event("chat", {"day": s.day, "player": player, "message": message}))
+        return events
+
+
+PARSERS = {
+    "colonel blotto": BlottoParser,
+    "3-player iterated prisoner's dilemma": IPDParser,
+    "codenames": CodenamesParser,
+    "secret mafia": MafiaParser,
+}
@@ -3,20 +3,26 @@ In addition to evaluating your model online, here is a short example of how to
 evaluate it offline against a fixed opponent.
 We evaluate Qwen/Qwen3-1.7B against a fixed opponent
 (google/gemini-2.0-flash-001).
+
+Episodes run NUM_WORKERS at a time and each finished one is appended to
+CHECKPOINT_PATH; rerunning the script resumes where it stopped. Delete the
+checkpoint (or change SEED) for a fresh run.
 """
 import os
-from collections import defaultdict
 
-import numpy as np
 import pandas as pd
-from tqdm import tqdm
-from agent import GPTAgent, GamePlayAgent 
-import textarena as ta
+from agent import GPTAgent, GamePlayAgent
+from completion_cache import CompletionCache
+from eval_runner import episode_counts, episode_specs, run_evaluation, summarize
 
 NUM_EPISODES = 5
 EVAL_ENV_IDS = [("Codenames-v0", 4),("ThreePlayerIPD-v0", 3), ("ColonelBlotto-v0", 2)]  # (env-id, num_players)
 OPPONENT_NAME = "google/gemini-2.0-flash-001"
 FILE_NAME = "eval_summary.csv"
+CACHE_PATH = "eval_results/completion_cache.sqlite"  # set to None to keep the cache in memory only
+CHECKPOINT_PATH = "eval_results/episodes.jsonl"  # one line per finished episode
+NUM_WORKERS = 8  # episodes played concurrently
+SEED = 0  # episode i of every env uses seed SEED + i
 
 # Model to evaluate
 # model = ta.agents.HFLocalAgent(
@@ -26,91 +32,24 @@ FILE_NAME = "eval_summary.csv"
 # model = GPTAgent(max_tokens=4096)
 # opponent = GPTMiniAgent1(max_tokens=4096)
 
-model = GPTMiniAgent()
+completion_cache = CompletionCache(CACHE_PATH)
+
+model = GamePlayAgent(cache=completion_cache)
+# no cache for the opponent: a cached reply to a seed-independent prompt (e.g. the Blotto
+# opening) would be replayed in every episode and across reruns, so its moves would stop
+# being independent samples
 opponent = GPTAgent()
 
 # Fixed opponent
 # opponent = ta.agents.OpenRouterAgent(model_name=OPPONENT_NAME)
 
-
-def run_game(env_id: str, num_players: int, model, opponent) -> dict:
-    """Play one episode and return per-episode stats for the *model* player."""
-    env = ta.make(env_id)
-    env.reset(num_players=num_players)
-
-    model_pid = np.random.randint(0, num_players)    # random seat
-    done = False
-
-    while not done:
-        pid, obs = env.get_observation()
-        action = model(obs) if pid == model_pid else opponent(obs)
-        done, _ = env.step(action=action)
-
-    rewards, game_info = env.close()
-
-    return {
-        "model_reward": rewards[model_pid],
-        "opponent_reward": np.mean([rewards[i] for i in range(num_players) if i != model_pid]),
-        "invalid_move": bool(game_info[model_pid]["invalid_move"]),
-        "turn_count":  game_info[model_pid]["turn_count"],
-    }
-
-
-results = defaultdict(list)
-
-outer_bar = tqdm(EVAL_ENV_IDS, desc="Environments")
-for env_id, num_players in outer_bar:
-
-    # per-environment aggregates
-    stats = dict(
-        wins=0,
-        losses=0,
-        draws=0,
-        total_reward_model=0.0,
-        total_reward_opponent=0.0,
-        total_invalid_moves=0,
-        total_turns=0,
-    )
-
-    inner_bar = tqdm(range(NUM_EPISODES), desc=f"Evaluating {env_id}", leave=False)
-    for _ in inner_bar:
-        outcome = run_game(env_id, num_players, model, opponent)
-
-        # W/L/D
-        if outcome["model_reward"] > outcome["opponent_reward"]:
-            stats["wins"] += 1
-        elif outcome["model_reward"] < outcome["opponent_reward"]:
-            stats["losses"] += 1
-        else:
-            stats["draws"] += 1
-
-        # Accumulate metrics
-        stats["total_reward_model"]     += outcome["model_reward"]
-        stats["total_reward_opponent"]  += outcome["opponent_reward"]
-        stats["total_invalid_moves"]    += int(outcome["invalid_move"])
-        stats["total_turns"]            += outcome["turn_count"]
-
-        # Live progress bar
-        games_done = _ + 1
-        inner_bar.set_postfix({
-            "Win%":   f"{stats['wins']   / games_done:.1%}",
-            "Loss%":  f"{stats['losses'] / games_done:.1%}",
-            "Draw%":  f"{stats['draws']  / games_done:.1%}",
-            "Inv%":   f"{stats['total_invalid_moves'] / games_done:.1%}",
-            "Turns":  f"{stats['total_turns'] / games_done:.1f}",
-        })
-
-    # write per-environment summary
-    results["env_id"].append(env_id)
-    results["win_rate"].append(stats["wins"] / NUM_EPISODES)
-    results["loss_rate"].append(stats["losses"] / NUM_EPISODES)
-    results["draw_rate"].append(stats["draws"] / NUM_EPISODES)
-    results["invalid_rate"].append(stats["total_invalid_moves"] / NUM_EPISODES)
-    results["avg_turns"].append(stats["total_turns"] / NUM_EPISODES)
-    results["avg_model_reward"].append(stats["total_reward_model"] / NUM_EPISODES)
-    results["avg_opponent_reward"].append(stats["total_reward_opponent"] / NUM_EPISODES)
-
-df = pd.DataFrame(results)
+records = run_evaluation(
+    episode_specs(EVAL_ENV_IDS, NUM_EPISODES, seed=SEED), model, opponent,
+    checkpoint_path=CHECKPOINT_PATH, workers=NUM_WORKERS,
+)
+env_ids = [env_id for env_id, _ in EVAL_ENV_IDS]
+df = pd.DataFrame(summarize(records, env_ids, NUM_EPISODES))
+print(f"\nFinished episodes of {NUM_EPISODES} per env: {episode_counts(records, env_ids)}")
 
 # Pretty-print to console (Markdown table looks nice in most terminals/Jupyter)
 print("\n=== Evaluation Summary ===")
@@ -120,3 +59,4 @@ print(df.to_markdown(index=False, floatfmt=".3f"))
 os.makedirs("eval_results", exist_ok=True)
 df.to_csv(f"eval_results/{FILE_NAME}", index=False)
 print(f"\nSaved -> eval_results/{FILE_NAME}")
+print(f"Completion cache: {completion_cache.stats()}")
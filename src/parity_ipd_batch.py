@@ -0,0 +1,59 @@
+"""
+Parity check of the batch IPD engine against the textarena env: random decisions are
+played through `ThreePlayerIPD-v0` (chat turns send a fixed message) and through
+`IPDBatch`; final scores and rewards must match in every game. Also times a round-robin
+tournament of the built-in policies.
+"""
+import re
+import time
+
+import numpy as np
+
+from ipd_batch import IPDBatch, round_robin
+
+NUM_GAMES = 100
+TOURNAMENT_GAMES = 1000
+SEED = 0
+
+rng = np.random.default_rng(SEED)
+
+try:
+    import textarena as ta
+except ImportError:
+    ta = None
+    print("[IPD] textarena is not installed; skipping the env parity check")
+
+if ta is not None:
+    batch = IPDBatch(NUM_GAMES)
+    plan = rng.random((batch.num_rounds, NUM_GAMES, 3, 3)) < 0.5
+    turns_per_round = 3 * 3 + 3  # env defaults: 3 chat turns per player, then one decision each
+    mismatches = 0
+    for g in range(NUM_GAMES):
+        env = ta.make(env_id="ThreePlayerIPD-v0")
+        env.reset(num_players=3)
+        step, done = 0, False
+        while not done:
+            pid, _ = env.get_observation()
+            r, pos = divmod(step, turns_per_round)
+            if pos >= 9:
+                action = " ".join(f"[{q} {'cooperate' if plan[r, g, pid, q] else 'defect'}]" for q in range(3) if q != pid)
+            else:
+                action = "Let's all cooperate."
+            done, _ = env.step(action=action)
+            step += 1
+        rewards, game_info = env.close()
+        scores = {int(p): int(v) for p, v in re.findall(r"P(\d)=(\d+)", str(game_info))}
+        single = IPDBatch(1)
+        for r in range(single.num_rounds):
+            single.step(plan[r, g][None])
+        res = single.results()
+        same = all(res["scores"][0, p] == scores.get(p) and np.isclose(res["rewards"][0, p], rewards[p]) for p in range(3))
+        mismatches += not same
+    print(f"[IPD] Parity: {NUM_GAMES - mismatches}/{NUM_GAMES} games with identical scores and rewards")
+
+start = time.perf_counter()
+table = round_robin(games=TOURNAMENT_GAMES)
+elapsed = time.perf_counter() - start
+print(f"[IPD] Round robin, {TOURNAMENT_GAMES} games per match, {elapsed:.2f}s")
+for name, row in sorted(table.items(), key=lambda kv: -kv[1]["mean_reward"]):
+    print(f"  {name:<22} reward {row['mean_reward']:+.3f}  score {row['mean_score']:.2f}  seats {row['seats']}")
@@ -241,6 +241,23 @@ Output:
 """
 
 
+VALUE_PROMPT_TEMPLATE = """You are estimating how good a simulated future is for one player. The future starts from the base state below.
+The player you are evaluating for makes moves within <action> </action> tags; opponents move within <opponent_action> </opponent_action> tags. Assume rational opponents and standard play.
+
+<base_game_state>
+{base_state}
+</base_game_state>
+
+<future>
+{future}
+</future>
+
+Output:
+1) Your concise reasoning in <think>…</think>
+2) The probability that the player wins from this future, as a number between 0 and 1 in double brackets. For example, [[0.65]].
+"""
+
+
 
 NEXT_STEP_PROMPT_TEMPLATE = """You are playing a game. Given the current game state and the sequence of prior actions (if any), generate all combinatorial possible moves to decide every possible combination of valid moves for the next turn that will lead to a win.
 
@@ -316,4 +333,35 @@ Output format:
 <opponent_action> ... </opponent_action>
 <opponent_action> ... </opponent_action>
 <opponent_action> ... </opponent_action>
-"""
\ No newline at end of file
+"""
+
+# Compact state views, rendered from the parsed game state (see state_render.py) and used in
+# place of the raw transcript in the {game_state} / {base_state} slots above.
+
+BLOTTO_STATE_TEMPLATE = """You are {side} in Colonel Blotto. Each round, allocate up to {units} units across fields {fields} in the format '[A4 B2 C2]'. Winning the majority of fields wins the round.
+Round {round}. Rounds won - you: {mine}, opponent: {theirs}.
+Past rounds (your allocation vs opponent's):
+{history}"""
+
+IPD_STATE_TEMPLATE = """You are Player {me} in a 3-player Iterated Prisoner's Dilemma. Round {round} of {num_rounds}, phase: {phase}.
+Pair-wise payoffs: both cooperate {R}, both defect {P}, you defect and they cooperate {T}, you cooperate and they defect {S}. The highest total score wins.
+{instruction}
+Scores: {scores}
+Past rounds with each opponent (your move / their move):
+{history}
+Recent chat:
+{chat}"""
+
+CODENAMES_STATE_TEMPLATE = """You are Player {me}, the {role} for {team} team in Codenames. {instruction}
+Board (word, label if known, revealed words marked *):
+{board}
+Clues so far: {clues}
+Guesses so far: {guesses}"""
+
+MAFIA_STATE_TEMPLATE = """You are Player {me} in Secret Mafia. Role: {role}.{teammates}
+Day {day}, phase: {phase}. {instruction}
+Alive: {alive}
+Eliminated: {eliminated}
+{investigations}Votes so far: {votes}
+Recent discussion:
+{chat}"""
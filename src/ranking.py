@@ -0,0 +1,171 @@
+import math
+import random
+from itertools import combinations
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+# Tournament strategies for picking the best of n candidates from pairwise judgments.
+# `compare_many` takes a batch of (i, j) pairs and returns (results, replayed): for each
+# pair, +1 if i wins, -1 if j wins and 0 for a tie, and whether the verdict was replayed
+# from a judgment cache rather than judged now; batches let the caller judge pairs in
+# parallel. Every strategy returns (winner index, per-candidate scores, comparisons made),
+# where comparisons count new judgments only.
+
+CompareMany = Callable[[Sequence[Tuple[int, int]]], Tuple[List[int], List[bool]]]
+
+
+def round_robin(n: int, compare_many: CompareMany) -> Tuple[int, List[float], int]:
+    """Every pair once: n(n-1)/2 comparisons. Scores are wins (ties count half)."""
+    pairs = list(combinations(range(n), 2))
+    wins = [0.0] * n
+    results, replayed = compare_many(pairs)
+    for (i, j), r in zip(pairs, results):
+        if r > 0:
+            wins[i] += 1
+        elif r < 0:
+            wins[j] += 1
+        else:
+            wins[i] += 0.5
+            wins[j] += 0.5
+    return max(range(n), key=lambda k: wins[k]), wins, len(pairs) - sum(replayed)
+
+
+def knockout(n: int, compare_many: CompareMany, shuffle: bool = True) -> Tuple[int, List[float], int]:
+    """Single elimination: n-1 comparisons. Ties are settled by a coin flip; odd fields give a bye."""
+    alive = list(range(n))
+    if shuffle:
+        random.shuffle(alive)
+    rounds_won = [0.0] * n
+    comparisons = 0
+    while len(alive) > 1:
+        pairs = [(alive[k], alive[k + 1]) for k in range(0, len(alive) - 1, 2)]
+        nxt = [alive[-1]] if len(alive) % 2 else []
+        results, replayed = compare_many(pairs)
+        for (i, j), r in zip(pairs, results):
+            winner = i if r > 0 or (r == 0 and random.random() < 0.5) else j
+            rounds_won[winner] += 1
+            nxt.append(winner)
+        comparisons += len(pairs) - sum(replayed)
+        alive = nxt
+    return alive[0], rounds_won, comparisons
+
+
+def swiss(n: int, compare_many: CompareMany, rounds: int = None) -> Tuple[int, List[float], int]:
+    """
+    Swiss system: each round pairs candidates with similar scores, avoiding rematches.
+    Defaults to ceil(log2 n) + 1 rounds, i.e. about n/2 * (log2 n + 1) comparisons.
+    """
+    if n == 1:
+        return 0, [0.0], 0
+    rounds = rounds or math.ceil(math.log2(n)) + 1
+    scores = [0.0] * n
+    played = set()
+    comparisons = 0
+    for _ in range(rounds):
+        order = sorted(range(n), key=lambda k: (-scores[k], random.random()))
+        pairs = []
+        while len(order) > 1:
+            i = order.pop(0)
+            # nearest-ranked opponent not met yet, else the nearest one
+            k = next((idx for idx, j in enumerate(order) if (min(i, j), max(i, j)) not in played), 0)
+            j = order.pop(k)
+            pairs.append((i, j))
+            played.add((min(i, j), max(i, j)))
+        if order:
+            scores[order[0]] += 1  # bye
+        results, replayed = compare_many(pairs)
+        for (i, j), r in zip(pairs, results):
+            if r > 0:
+                scores[i] += 1
+            elif r < 0:
+                scores[j] += 1
+            else:
+                scores[i] += 0.5
+                scores[j] += 0.5
+        comparisons += len(pairs) - sum(replayed)
+    return max(range(n), key=lambda k: scores[k]), scores, comparisons
+
+
+def _bradley_terry(wins: np.ndarray, strength: np.ndarray = None, prior: float = 0.5, iters: int = 50) -> np.ndarray:
+    """MM fit of Bradley-Terry strengths; `prior` adds a virtual draw against an average opponent."""
+    n = wins.shape[0]
+    games = wins + wins.T
+    won = wins.sum(axis=1) + prior
+    strength = np.ones(n) if strength is None else strength.copy()
+    for _ in range(iters):
+        den = (games / (strength[:, None] + strength[None, :])).sum(axis=1) + 2 * prior / (strength + 1.0)
+        strength = won / den
+        strength /= strength.mean()
+    return strength
+
+
+def bradley_terry(
+    n: int,
+    compare_many: CompareMany,
+    confidence: float = 0.85,
+    max_comparisons: int = None,
+    batch_size: int = 8,
+) -> Tuple[int, List[float], int]:
+    """
+    Adaptive Bradley-Terry ranking. After a seeding round, each step judges the current
+    leader against the challengers most likely to beat it, refits, and stops once the
+    fitted probability that the leader beats every other candidate is >= `confidence`,
+    after `max_comparisons` (default 3n), or when the leader has met every challenger.
+    Each unordered pair is judged at most once: a second verdict on the same pair (e.g.
+    replayed from a judgment cache) would only inflate the fit's confidence. Verdicts
+    replayed from the cache are evidence like any other but do not use up the budget.
+    """
+    if n == 1:
+        return 0, [1.0], 0
+    max_comparisons = max_comparisons or 3 * n
+    wins = np.zeros((n, n))
+    met = np.zeros((n, n))
+
+    def record(pairs):
+        results, replayed = compare_many(pairs)
+        for (i, j), r in zip(pairs, results):
+            if r > 0:
+                wins[i, j] += 1
+            elif r < 0:
+                wins[j, i] += 1
+            else:
+                wins[i, j] += 0.5
+                wins[j, i] += 0.5
+            met[i, j] += 1
+            met[j, i] += 1
+        return len(pairs) - sum(replayed)
+
+    order = list(range(n))
+    random.shuffle(order)
+    seed = [(order[k], order[k + 1]) for k in range(0, n - 1, 2)]
+    if n % 2:
+        seed.append((order[-1], order[0]))
+    comparisons = record(seed)
+
+    strength = None
+    while True:
+        strength = _bradley_terry(wins, strength, iters=50 if strength is None else 10)  # warm start from the previous fit
+        leader = int(np.argmax(strength))
+        threat = strength / (strength + strength[leader])  # P(k beats leader)
+        threat[leader] = 0.0
+        if threat.max() <= 1.0 - confidence or comparisons >= max_comparisons:
+            return leader, strength.tolist(), comparisons
+        fresh = met[leader] == 0
+        fresh[leader] = False
+        if not fresh.any():
+            return leader, strength.tolist(), comparisons
+        budget = min(batch_size, max_comparisons - comparisons, int(fresh.sum()))
+        # most informative: close to a coin flip against the leader, among those it has not met
+        info = np.where(fresh, threat * (1.0 - threat), -1.0)
+        challengers = np.argsort(-info)[:budget]
+        pairs = [(leader, int(k)) for k in challengers]
+        comparisons += record(pairs)
+
+
+STRATEGIES = {
+    "round_robin": round_robin,
+    "knockout": knockout,
+    "swiss": swiss,
+    "bradley_terry": bradley_terry,
+}
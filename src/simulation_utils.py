@@ -1,9 +1,17 @@
 import re
+import asyncio
 import hashlib
-from typing import List, Optional, Tuple, Dict
-from itertools import combinations
+import threading
+from typing import Callable, List, Optional, Tuple, Dict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from prompts import *
+from game_router import strategy_for
+from transposition import TranspositionTable
+from move_validation import MoveValidator
+from action_table import ActionTable
+from ranking import STRATEGIES
+from token_budget import count_tokens, prompt_budget, truncate_tokens
+from judgment_cache import JudgmentCache
 import random
 # Utility functions to extract actions from tags
 def extract_tagged_items(text: str, tag: str) -> List[str]:
@@ -28,13 +36,14 @@ def _print_candidates(header: str, candidates, max_steps=3, max_chars=120):
 
 # simulation_utils.py (near other helpers)
 
-def _dedup_keep_order(items):
+def _dedup_keep_order(items, key=None):
     seen = set()
     out = []
     for x in items:
         xs = x.strip()
-        if xs not in seen:
-            seen.add(xs)
+        k = key(xs) if key is not None else xs
+        if k not in seen:
+            seen.add(k)
             out.append(xs)
     return out
 
@@ -44,77 +53,58 @@ def _prioritize_non_pass(actions, tag_name):
     non_pass = []
     for a in actions:
         a_clean = a.strip().lower()
-        is_pass = (a_clean == "pass") or (a_clean == f"<{tag_name}>pass</{tag_name}>") or ("pass" == a_clean)
+        is_pass = a_clean in ("pass", "[pass]", f"<{tag_name}>pass</{tag_name}>")
         (pass_like if is_pass else non_pass).append(a)
     return non_pass + pass_like
 
 
 
-def simulate_game_tree(
-    model,
-    game_state: str,
-    prior_actions: List[str],
-    current_role: str,
-    depth: int,
-    max_depth: int,
-    game: str = "Colonel Blotto",
-    k_per_node: int = 5,        # keep top-K proposals per node by prompt order
-    debug: bool = False,
-    debug_max_chars: int = 160,
-) -> List[List[str]]:
-    """
-    Simple ToT with score-based beam pruning (fast). No pairwise inside.
-    Pairwise should be used ONLY at the end on the final set of leaves.
-    """
-    
-    if game == "colonel blotto":
-        if current_role == "agent":
-            prompt = COLONEL_BOLOTTO
-        else:
-            prompt = COLONEL_BOLOTTO_OPPONENT
-    elif game == "3-player iterated prisoner's dilemma":
-        if current_role == "agent":
-            prompt = TPID
-        else:
-            prompt = TPID_OPPONENT
-    elif game == "codenames":
-        if current_role == "agent":
-            prompt = CODENAMES
-        else:
-            prompt = CODENAMES_OPPONENT
-    else:
-        if current_role == "agent":
-            prompt = NEXT_STEP_PROMPT_TEMPLATE
-        else:
-            prompt = OPPONENT_MOVE_PROMPT_TEMPLATE
+def _node_prompt(game: str, current_role: str) -> str:
+    agent_prompt, opponent_prompt = strategy_for(game).prompts
+    return agent_prompt if current_role == "agent" else opponent_prompt
 
-    # Stop: closed leaf
-    if depth >= max_depth:
-        if debug:
-            print(f"[ToT] Reached max_depth={max_depth}. Close leaf:")
-            print(f"      {_show_branch(prior_actions, max_steps=8, max_chars=debug_max_chars)}")
-        return [prior_actions[:]] if prior_actions else []
 
-    # Propose
+def _node_messages(game_state: str, prior_actions: List[str], current_role: str, game: str) -> List[Dict[str, str]]:
+    prompt = _node_prompt(game, current_role)
     prompt_formatted = prompt.format(
         game_state=game_state,
         prior_actions="\n".join(prior_actions) if prior_actions else "None",
         # last_move=prior_actions[-1] if prior_actions else "None"
     )
-    messages = [
+    return [
         {"role": "system", "content": "You are a clever player here to win the game."},
         {"role": "user", "content": prompt_formatted}
     ]
+
+
+def _node_actions(
+    response: str,
+    current_role: str,
+    depth: int,
+    k_per_node: int,
+    debug: bool,
+    debug_max_chars: int,
+    validator: Optional[MoveValidator] = None,
+    action_table: Optional[ActionTable] = None,
+) -> List[str]:
+    """
+    Extract the top-K proposals from a proposal response. Several samples can be
+    joined into one response; their actions are merged and deduped (by canonical
+    key with an `action_table`). With a `validator`, illegal proposals are dropped
+    and the rest canonicalised before anything else.
+    """
     tag = "action" if current_role == "agent" else "opponent_action"
-    response = model.get_completion(messages)
     actions = extract_tagged_items(response, tag)
+    if validator is not None:
+        actions = validator.filter(actions, current_role)
 
     if debug:
         print(f"[ToT][d={depth}] Role={current_role}; got {len(actions)} raw.")
         print(f"   Raw: {_truncate(response, debug_max_chars)}")
 
     # Dedup, push 'pass' last, slice top-K by prompt ordering
-    actions = _dedup_keep_order(actions)
+    key = (lambda a: action_table.key(a, current_role)) if action_table is not None else None
+    actions = _dedup_keep_order(actions, key=key)
     actions = _prioritize_non_pass(actions, tag_name=tag)
     if k_per_node is not None and k_per_node > 0:
         actions = actions[:k_per_node]
@@ -125,8 +115,19 @@ def simulate_game_tree(
         print(f"[ToT][d={depth}] Actions after hygiene (top {k_per_node}):")
         for i, a in enumerate(actions, 1):
             print(f"   - {i}. {_truncate(a, debug_max_chars)}")
+    return actions
 
+
+def _candidate_paths(
+    actions: List[str],
+    prior_actions: List[str],
+    current_role: str,
+    depth: int,
+    debug: bool,
+    debug_max_chars: int,
+) -> List[List[str]]:
     # Build candidate partial paths for this ply
+    tag = "action" if current_role == "agent" else "opponent_action"
     open_tag = f"<{tag}>"; close_tag = f"</{tag}>"
     candidate_paths = []
     for a in actions:
@@ -137,6 +138,54 @@ def simulate_game_tree(
     if debug:
         _print_candidates(f"[ToT][d={depth}] Candidates before beam:", candidate_paths,
                           max_steps=4, max_chars=debug_max_chars)
+    return candidate_paths
+
+
+def simulate_game_tree(
+    model,
+    game_state: str,
+    prior_actions: List[str],
+    current_role: str,
+    depth: int,
+    max_depth: int,
+    game: str = "Colonel Blotto",
+    k_per_node: int = 5,        # keep top-K proposals per node by prompt order
+    debug: bool = False,
+    debug_max_chars: int = 160,
+    samples_per_node: int = 1,  # >1: sample several proposals per node in one n= call and merge them
+    table: Optional[TranspositionTable] = None,  # expand each unique node once
+    opponent_fn: Optional[Callable[[str, List[str]], List[str]]] = None,  # model-free opponent proposals
+    validator: Optional[MoveValidator] = None,  # drops illegal proposals right after extraction
+    action_table: Optional[ActionTable] = None,  # dedups proposals by canonical move
+) -> List[List[str]]:
+    """
+    Simple ToT with score-based beam pruning (fast). No pairwise inside.
+    Pairwise should be used ONLY at the end on the final set of leaves.
+    """
+    # Stop: closed leaf
+    if depth >= max_depth:
+        if debug:
+            print(f"[ToT] Reached max_depth={max_depth}. Close leaf:")
+            print(f"      {_show_branch(prior_actions, max_steps=8, max_chars=debug_max_chars)}")
+        return [prior_actions[:]] if prior_actions else []
+
+    # Propose
+    def propose():
+        messages = _node_messages(game_state, prior_actions, current_role, game)
+        if samples_per_node > 1:
+            response = "\n".join(model.get_completions(messages, n=samples_per_node))
+        else:
+            response = model.get_completion(messages)
+        return _node_actions(response, current_role, depth, k_per_node, debug, debug_max_chars, validator, action_table)
+
+    if opponent_fn is not None and current_role == "opponent":
+        actions = opponent_fn(game_state, prior_actions)[:k_per_node] or ["pass"]
+    elif table is not None:
+        key = table.node_key(game, game_state, prior_actions, current_role, k_per_node, samples_per_node, action_table)
+        actions = table.expand(key, propose)
+    else:
+        actions = propose()
+    candidate_paths = _candidate_paths(actions, prior_actions, current_role, depth, debug, debug_max_chars)
 
     # Recurse
     branches = []
@@ -156,6 +205,11 @@ def simulate_game_tree(
             game=game,
             debug=debug,
             debug_max_chars=debug_max_chars,
+            samples_per_node=samples_per_node,
+            table=table,
+            opponent_fn=opponent_fn,
+            validator=validator,
+            action_table=action_table,
         )
         branches.extend(sub if sub else [new_prior])
 
@@ -166,6 +220,95 @@ def simulate_game_tree(
     return branches
 
 
+async def asimulate_game_tree(
+    model,
+    game_state: str,
+    prior_actions: List[str],
+    current_role: str,
+    depth: int,
+    max_depth: int,
+    game: str = "Colonel Blotto",
+    k_per_node: int = 5,
+    debug: bool = False,
+    debug_max_chars: int = 160,
+    samples_per_node: int = 1,
+    table: Optional[TranspositionTable] = None,
+    opponent_fn: Optional[Callable[[str, List[str]], List[str]]] = None,
+    validator: Optional[MoveValidator] = None,
+    action_table: Optional[ActionTable] = None,
+    max_concurrency: int = 16,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> List[List[str]]:
+    """
+    Async variant of `simulate_game_tree`: sibling nodes are expanded concurrently,
+    with at most `max_concurrency` proposal calls in flight across the whole tree.
+    Requires a model exposing `aget_completion`. Leaves come back in the same order
+    as the sequential version.
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+    # Stop: closed leaf
+    if depth >= max_depth:
+        if debug:
+            print(f"[ToT] Reached max_depth={max_depth}. Close leaf:")
+            print(f"      {_show_branch(prior_actions, max_steps=8, max_chars=debug_max_chars)}")
+        return [prior_actions[:]] if prior_actions else []
+
+    # Propose
+    async def propose():
+        messages = _node_messages(game_state, prior_actions, current_role, game)
+        async with semaphore:
+            if samples_per_node > 1:
+                response = "\n".join(await model.aget_completions(messages, n=samples_per_node))
+            else:
+                response = await model.aget_completion(messages)
+        return _node_actions(response, current_role, depth, k_per_node, debug, debug_max_chars, validator, action_table)
+
+    if opponent_fn is not None and current_role == "opponent":
+        actions = opponent_fn(game_state, prior_actions)[:k_per_node] or ["pass"]
+    elif table is not None:
+        key = table.node_key(game, game_state, prior_actions, current_role, k_per_node, samples_per_node, action_table)
+        actions = await table.aexpand(key, propose)
+    else:
+        actions = await propose()
+    candidate_paths = _candidate_paths(actions, prior_actions, current_role, depth, debug, debug_max_chars)
+
+    # Recurse into all children at once
+    next_role = "opponent" if current_role == "agent" else "agent"
+    subs = await asyncio.gather(*[
+        asimulate_game_tree(
+            model=model,
+            game_state=game_state,
+            prior_actions=new_prior,
+            current_role=next_role,
+            depth=depth + 1,
+            max_depth=max_depth,
+            k_per_node=k_per_node,
+            game=game,
+            debug=debug,
+            debug_max_chars=debug_max_chars,
+            samples_per_node=samples_per_node,
+            table=table,
+            opponent_fn=opponent_fn,
+            validator=validator,
+            action_table=action_table,
+            max_concurrency=max_concurrency,
+            semaphore=semaphore,
+        )
+        for new_prior in candidate_paths
+    ])
+    branches = []
+    for new_prior, sub in zip(candidate_paths, subs):
+        branches.extend(sub if sub else [new_prior])
+
+    if debug and depth == 0:
+        print(f"[ToT] Completed tree: leaves={len(branches)}")
+        _print_candidates("[ToT] Leaf trajectories:", branches, max_steps=6, max_chars=debug_max_chars)
+
+    return branches
+
+
 def extract_chosen_index(text: str) -> Optional[int]:
     """
     Looks for a single <game_state index="i">…</game_state> in the evaluator’s output
@@ -188,6 +331,16 @@ def extract_pair_choice(text: str) -> Optional[int]:
         return 1 if m.group(1).lower() == "a" else 2
     return None
 
+def extract_value(text: str) -> Optional[float]:
+    """
+    Parses a value estimate like [[0.65]] from evaluator output, clipped to [0, 1].
+    Returns None if no number is found.
+    """
+    m = re.search(r'\[\[\s*([01](?:\.\d+)?|\.\d+)\s*\]\]', text)
+    if not m:
+        return None
+    return min(max(float(m.group(1)), 0.0), 1.0)
+
 def _format_branch_for_prompt(branch: List[str]) -> str:
     """
     Convert a branch (list of tagged actions like <action>...</action> / <opponent_action>...</opponent_action>)
@@ -203,29 +356,50 @@ def evaluate_best_branch(
     system_prompt: str = "You are a game evaluator.",
     debug: bool = False,
     debug_max_chars: int = 220,
-    pairs={},
-) -> str:
+    pairs: Optional[JudgmentCache] = None,
+    strategy: str = "round_robin",
+    stats: Optional[Dict] = None,
+    scope: str = "",
+) -> Tuple[str, JudgmentCache]:
+    """
+    Pairwise tournament over branches. `strategy` picks the ranking scheme from
+    `ranking.STRATEGIES`: "round_robin" (every pair, n(n-1)/2 comparisons), "knockout"
+    (n-1), "swiss" (~n/2 per round) or "bradley_terry" (adaptive, stops once the leader
+    is separated). If `stats` is given it is filled with the counts: "comparisons" are
+    pairs judged now, "cached" are verdicts replayed from the cache. Verdicts are read
+    from and written to `pairs` (a JudgmentCache), scoped by `scope` (e.g. the game) and
+    the evaluator deployment; replays are reported to the strategy separately, so they
+    are not mistaken for new evidence nor charged to its comparison budget. Returns
+    (best action, `pairs`), with "pass" as the action when there is nothing to rank.
+    """
+    if pairs is None:
+        pairs = JudgmentCache()
+    scope = f"{scope}|{getattr(model, 'deployment', '')}"
     if not branches:
         if debug: print("[Eval] No branches; returning 'pass'")
-        return "pass"
+        return "pass", pairs
 
     nonempty = [b for b in branches if len(b) > 0]
     if not nonempty:
         if debug: print("[Eval] Branches empty; returning 'pass'")
-        return "pass"
+        return "pass", pairs
     branches = nonempty
 
     n = len(branches)
-    wins = [0.0] * n
+    counts = {"comparisons": 0, "cached": 0, "llm_calls": 0}
+    counts_lock = threading.Lock()
 
     if debug:
-        print(f"[Eval] Starting pairwise evaluation: {n} branches, {rounds_per_pair} round(s) per pair")
+        print(f"[Eval] Starting pairwise evaluation ({strategy}): {n} branches, {rounds_per_pair} round(s) per pair")
         _print_candidates("[Eval] Candidate branches:", branches, max_steps=5, max_chars=debug_max_chars)
 
     def evaluate_pair(i, j, existing_pairs):
-        if (tuple(branches[i]), tuple(branches[j])) in existing_pairs:
-            print(f"[Eval] Using cached pair: {i}, {j}")
-            return i, j, existing_pairs[(tuple(branches[i]), tuple(branches[j]))]
+        cached = existing_pairs.get(scope, base_state, branches[i], branches[j])
+        if cached is not None:
+            if debug: print(f"[Eval] Using cached pair: {i}, {j}")
+            with counts_lock:
+                counts["cached"] += 1
+            return i, j, cached, True
         future_1 = "\n".join(branches[i])
         future_2 = "\n".join(branches[j]).replace("<action>", "<opponent_action>").replace("</action>", "</opponent_action>")
         votes_ij = [0, 0]
@@ -242,6 +416,8 @@ def evaluate_best_branch(
             )
             resp = model.get_completion([{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}])
             resp_reverse = model.get_completion([{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt_reverse}])
+            with counts_lock:
+                counts["llm_calls"] += 2
             choice = extract_pair_choice(resp)
             choice_reverse = extract_pair_choice(resp_reverse)
             if choice == 1 and choice_reverse == 2:
@@ -253,60 +429,48 @@ def evaluate_best_branch(
             else:
                 votes_ij[0] += 0.5
                 votes_ij[1] += 0.5
-        return i, j, votes_ij
+        return i, j, votes_ij, False
 
     with ThreadPoolExecutor(max_workers=50) as executor:
-        futures = {executor.submit(evaluate_pair, i, j, pairs): (i, j) for i, j in combinations(range(n), 2)}
-        for future in as_completed(futures):
-            i, j, votes_ij = future.result()
-            pairs[(tuple(branches[i]), tuple(branches[j]))] = votes_ij
-            if votes_ij[0] > votes_ij[1]:
-                wins[i] += 1
-            elif votes_ij[1] > votes_ij[0]:
-                wins[j] += 1
-            else:
-                wins[i] += 0.5
-                wins[j] += 0.5
-
-    total_wins = sum(wins)
-    probabilities = [win / total_wins for win in wins]
-    winner_idx = random.choices(range(n), weights=probabilities, k=1)[0]
+        def compare_many(batch):
+            results, replayed = {}, set()
+            futures = {executor.submit(evaluate_pair, i, j, pairs): (i, j) for i, j in batch}
+            for future in as_completed(futures):
+                i, j, votes_ij, cached = future.result()
+                if cached:
+                    replayed.add((i, j))
+                else:
+                    pairs.put(scope, base_state, branches[i], branches[j], votes_ij)
+                results[(i, j)] = (votes_ij[0] > votes_ij[1]) - (votes_ij[1] > votes_ij[0])
+            counts["comparisons"] += len(batch) - len(replayed)
+            return [results[(i, j)] for i, j in batch], [(i, j) in replayed for i, j in batch]
+
+        winner_idx, scores, _ = STRATEGIES[strategy](n, compare_many)
+
+    if strategy == "round_robin":
+        # keep the original behaviour: sample the winner in proportion to its wins
+        total_wins = sum(scores)
+        if total_wins > 0:
+            probabilities = [win / total_wins for win in scores]
+            winner_idx = random.choices(range(n), weights=probabilities, k=1)[0]
     first = branches[winner_idx][0]
     action = first.replace("<action>", "").replace("</action>", "")
 
+    if stats is not None:
+        stats.update(strategy=strategy, **counts)
     if debug:
-        print(f"[Eval] Final wins: {wins}")
+        print(f"[Eval] Final scores: {scores}")
+        print(f"[Eval] Comparisons: {counts['comparisons']} judged, {counts['cached']} replayed from the cache ({counts['llm_calls']} LLM calls)")
         print(f"[Eval] Winner: Branch #{winner_idx+1}")
         print(f"[Eval] Selected FIRST ACTION: {action}")
 
     return action, pairs
 
 
-def evaluate_best_branch_old(
-    model,
-    base_state: str,
-    branches: List[List[str]],
-    debug=True,          # <— turn on evaluator logs
-    debug_max_chars=220,
-    role="agent"
-) -> List[str]:
-    """
-    Use the EVAL_PROMPT to pick the best of several simulated branches.
-
-    Args:
-        agent: your GPTMiniAgent
-        base_state: the original game_state description
-        branches: a list of branches, where each branch is a list of tagged actions
-
-    Returns:
-        The branch (list of actions) that the model judged best.
-    """
-    # Build the <futures> section: one block per branch
+def _listwise_pick(model, base_state: str, blocks: List[str], debug: bool = False) -> Optional[int]:
+    """One EVAL_PROMPT_TEMPLATE call over `blocks`; returns the chosen 0-based position or None."""
     futures = []
-    for idx, branch in enumerate(branches):
-        if len(branch) == 2 and role == "opponent":
-            branch[0], branch[1] = branch[1], branch[0]
-        branch = "\n".join(branch) 
+    for idx, branch in enumerate(blocks):
         block = (
             f"<future_game_state index={idx+1}>\n{branch}\n</future_game_state>"
         )
@@ -333,11 +497,97 @@ def evaluate_best_branch_old(
     chosen_idx = extract_chosen_index(response)
     if debug:
         print("[Eval] Chosen index:", chosen_idx)
-    if chosen_idx and 1 <= chosen_idx <= len(branches):
-        # if role == "agent":
-        return branches[chosen_idx - 1][0].replace("<action>", "").replace("</action>", "")
-        # else:
-        #     return branches[chosen_idx - 1][-1].replace("<action>", "").replace("</action>", "")
-    else:
-        # fallback: pick first
-        return branches[0][0].replace("<action>", "").replace("</action>", "")    
\ No newline at end of file
+    if chosen_idx and 1 <= chosen_idx <= len(blocks):
+        return chosen_idx - 1
+    return None
+
+
+def _chunk_by_tokens(costs: List[int], budget: int, max_group_size: int) -> List[List[int]]:
+    """Greedy packing of item indices into groups whose summed cost stays within `budget`."""
+    groups, current, used = [], [], 0
+    for idx, cost in enumerate(costs):
+        if current and (used + cost > budget or len(current) >= max_group_size):
+            groups.append(current)
+            current, used = [], 0
+        current.append(idx)
+        used += cost
+    if current:
+        groups.append(current)
+    return groups
+
+
+def evaluate_best_branch_old(
+    model,
+    base_state: str,
+    branches: List[List[str]],
+    debug=True,          # <— turn on evaluator logs
+    debug_max_chars=220,
+    role="agent",
+    token_budget: Optional[int] = None,
+    max_group_size: int = 25,
+    max_workers: int = 16,
+) -> List[str]:
+    """
+    Use the EVAL_PROMPT to pick the best of several simulated branches.
+
+    When all branches fit in one prompt this is a single listwise call. Otherwise the
+    branches are split into groups sized to the deployment's token budget, groups are
+    judged in parallel and their winners go on to the next round until one remains.
+    A branch longer than half the budget is shown cut to that size (its first moves are
+    kept), so every group holds at least two branches and no prompt exceeds the budget.
+
+    Args:
+        agent: your GPTMiniAgent
+        base_state: the original game_state description
+        branches: a list of branches, where each branch is a list of tagged actions
+        token_budget: prompt tokens per call; defaults to `prompt_budget` for the model's deployment
+        max_group_size: most branches shown to the evaluator in one call
+
+    Returns:
+        The branch (list of actions) that the model judged best.
+    """
+    for branch in branches:
+        if len(branch) == 2 and role == "opponent":
+            branch[0], branch[1] = branch[1], branch[0]
+    blocks = ["\n".join(branch) for branch in branches]
+
+    deployment = getattr(model, "deployment", None)
+    if token_budget is None:
+        token_budget = prompt_budget(deployment, getattr(model, "max_tokens", 4096))
+    overhead = count_tokens(EVAL_PROMPT_TEMPLATE.format(base_state=base_state, futures_blocks=""), deployment)
+    budget = max(token_budget - overhead, 1)
+    blocks = [truncate_tokens(b, max(budget // 2 - 16, 1), deployment) for b in blocks]
+    costs = [count_tokens(b, deployment) + 16 for b in blocks]  # + the <future_game_state> wrapper
+    max_group_size = max(max_group_size, 2)
+
+    alive = list(range(len(branches)))
+    round_no = 0
+    while len(alive) > 1:
+        groups = _chunk_by_tokens([costs[i] for i in alive], budget, max_group_size)
+        groups = [[alive[k] for k in g] for g in groups]
+        if len(groups) == len(alive):
+            # the base state leaves less room than two cut branches: judge them two at a time
+            groups = [alive[k:k + 2] for k in range(0, len(alive), 2)]
+        if debug:
+            print(f"[Eval] Round {round_no}: {len(alive)} branches in {len(groups)} group(s)")
+
+        def judge(group):
+            if len(group) == 1:
+                return group[0]
+            pick = _listwise_pick(model, base_state, [blocks[i] for i in group], debug=debug)
+            return group[pick] if pick is not None else group[0]  # fallback: pick first
+
+        if len(groups) == 1:
+            winners = [judge(groups[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                winners = list(executor.map(judge, groups))
+        alive = winners
+        round_no += 1
+
+    if not alive:
+        return "pass"
+    # if role == "agent":
+    return branches[alive[0]][0].replace("<action>", "").replace("</action>", "")
+    # else:
+    #     return branches[chosen_idx - 1][-1].replace("<action>", "").replace("</action>", "")
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls: while a call for `key` is running, later
+    callers with the same key wait for its result instead of issuing their own.
+    Works for threads (`do`) and for asyncio tasks (`ado`).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._ainflight: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self.calls = 0
+        self.suppressed = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._inflight[key] = fut
+            else:
+                self.suppressed += 1
+        if not leader:
+            return fut.result()
+        try:
+            result = fn()
+            fut.set_result(result)
+            return result
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def ado(self, key: Hashable, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        akey = (id(loop), key)  # asyncio futures are bound to the loop that created them
+        with self._lock:
+            self.calls += 1
+            fut = self._ainflight.get(akey)
+            leader = fut is None
+            if leader:
+                fut = loop.create_future()
+                self._ainflight[akey] = fut
+            else:
+                self.suppressed += 1
+        if not leader:
+            return await asyncio.shield(fut)
+        try:
+            result = await coro_fn()
+            fut.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved so an unawaited failure is not logged twice
+            raise
+        finally:
+            with self._lock:
+                self._ainflight.pop(akey, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "suppressed": self.suppressed}
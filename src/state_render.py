@@ -0,0 +1,146 @@
+import threading
+from typing import Dict, Optional
+
+from observation_parser import BlottoState, CodenamesState, IPDState, MafiaState
+from prompts import BLOTTO_STATE_TEMPLATE, CODENAMES_STATE_TEMPLATE, IPD_STATE_TEMPLATE, MAFIA_STATE_TEMPLATE
+from token_budget import count_tokens
+
+# Compact canonical views of the parsed game state. Prompts built from these stay roughly
+# constant in size instead of growing with the raw transcript.
+
+_TEAMS = {"R": "Red", "B": "Blue"}
+
+
+def _move(cooperated: bool) -> str:
+    return "C" if cooperated else "D"
+
+
+def render_blotto(state: BlottoState, **_) -> str:
+    mine = state.me if state.me is not None else 0
+    rows = []
+    for number, (alpha, beta, winner) in enumerate(state.history, 1):
+        ours, theirs = (alpha, beta) if mine == 0 else (beta, alpha)
+        result = "tie" if winner is None else ("won" if winner == mine else "lost")
+        fmt = lambda alloc: " ".join(f"{f}{u}" for f, u in zip(state.field_names, alloc))
+        rows.append(f"R{number}: [{fmt(ours)}] vs [{fmt(theirs)}] - {result}")
+    return BLOTTO_STATE_TEMPLATE.format(
+        side="Commander Alpha" if mine == 0 else "Commander Beta",
+        units=state.num_total_units,
+        fields=", ".join(state.field_names),
+        round=state.round,
+        mine=state.scores[mine],
+        theirs=state.scores[1 - mine],
+        history="\n".join(rows) or "None",
+    )
+
+
+def render_ipd(state: IPDState, max_chat: int = 9, **_) -> str:
+    opponents = [p for p in range(3) if p != state.me]
+    history = []
+    for opp in opponents:
+        moves = " ".join(f"{_move(a)}/{_move(b)}" for a, b in state.history_with(opp))
+        history.append(f"Player {opp}: {moves or 'none yet'}")
+    if state.phase == "decision":
+        instruction = "Submit one token per opponent: '[<opp-id> cooperate]' or '[<opp-id> defect]'."
+    else:
+        instruction = "Chat freely with the other players; decisions come after the chat turns."
+    chat = [f"Player {p}: {msg}" for _, p, msg in state.chat[-max_chat:]]
+    return IPD_STATE_TEMPLATE.format(
+        me=state.me,
+        round=state.round,
+        num_rounds=state.num_rounds,
+        phase=state.phase,
+        instruction=instruction,
+        scores="; ".join(f"Player {p} ({s})" for p, s in sorted(state.scores.items())) or "all 0",
+        history="\n".join(history),
+        chat="\n".join(chat) or "None",
+        **state.payoffs,
+    )
+
+
+def render_codenames(state: CodenamesState, **_) -> str:
+    if state.spymaster:
+        instruction = (
+            "Give a one-word clue and a number, e.g. '[wind 2]'. The clue may not contain or be part of a board word. "
+            "Avoid opponent words, neutral words (N) and the assassin (A)."
+        )
+    else:
+        last = next((c for c in reversed(state.clues) if c[0] == state.team), None)
+        current = f" Current clue: [{last[1]} {last[2]}]." if last else ""
+        instruction = f"Guess one board word per turn as '[word]', or '[pass]'.{current}"
+    board = [f"{w} {label or '?'}{'*' if w in state.revealed else ''}" for w, label in state.board.items()]
+    return CODENAMES_STATE_TEMPLATE.format(
+        me=state.me,
+        role="Spymaster" if state.spymaster else "Operative",
+        team=_TEAMS.get(state.team, state.team),
+        instruction=instruction,
+        board="\n".join(board) or "None",
+        clues=", ".join(f"{_TEAMS[t]} [{w} {n}]" for t, w, n in state.clues) or "None",
+        guesses=", ".join(f"{_TEAMS[t]} {w} ({label or '?'})" for t, w, label in state.guesses) or "None",
+    )
+
+
+def render_mafia(state: MafiaState, max_chat: int = 15, suspicion: Optional[str] = None, **_) -> str:
+    instruction = {
+        "voting": "Vote to eliminate one alive player in the format [X].",
+        "discussion": "Discuss with the other players; a vote follows.",
+        "night": "Night: act with '[X]' if your role has a night action.",
+    }[state.phase]
+    teammates = f" Mafia teammates: {', '.join(map(str, state.teammates))}." if state.teammates else ""
+    investigations = ""
+    if state.investigations:
+        investigations = "Investigations: " + ", ".join(
+            f"Player {p} {'IS' if m else 'is NOT'} Mafia" for p, m in state.investigations.items()
+        ) + "\n"
+    if suspicion:
+        investigations += suspicion + "\n"
+    votes = ", ".join(f"D{d}: {v}->{t}" for d, v, t in state.votes)
+    chat = [f"Player {p}: {msg}" for _, p, msg in state.chat[-max_chat:]]
+    return MAFIA_STATE_TEMPLATE.format(
+        me=state.me,
+        role=state.role,
+        teammates=teammates,
+        day=state.day,
+        phase=state.phase,
+        instruction=instruction,
+        alive=", ".join(map(str, state.alive)),
+        eliminated=", ".join(f"{p} ({how})" for p, how in state.eliminated) or "None",
+        investigations=investigations,
+        votes=votes or "None",
+        chat="\n".join(chat) or "None",
+    )
+
+
+RENDERERS = {
+    "colonel blotto": render_blotto,
+    "3-player iterated prisoner's dilemma": render_ipd,
+    "codenames": render_codenames,
+    "secret mafia": render_mafia,
+}
+
+
+def render_state(game: str, state, **kwargs) -> str:
+    """Compact prompt view of a parsed game state."""
+    return RENDERERS[game](state, **kwargs)
+
+
+class TokenReduction:
+    """Running raw vs compact prompt-state token counts per game; shared by concurrent episodes."""
+
+    def __init__(self, deployment: Optional[str] = None):
+        self.deployment = deployment
+        self.raw: Dict[str, int] = {}
+        self.compact: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, game: str, raw: str, compact: str) -> float:
+        """Record one turn; returns that turn's raw / compact ratio."""
+        r, c = count_tokens(raw, self.deployment), count_tokens(compact, self.deployment)
+        with self._lock:
+            self.raw[game] = self.raw.get(game, 0) + r
+            self.compact[game] = self.compact.get(game, 0) + c
+        return r / max(c, 1)
+
+    def ratios(self) -> Dict[str, float]:
+        with self._lock:
+            return {g: self.raw[g] / max(self.compact[g], 1) for g in self.raw}
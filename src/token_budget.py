@@ -0,0 +1,66 @@
+from functools import lru_cache
+from typing import Optional
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to a character estimate
+    tiktoken = None
+
+# Context windows (prompt + completion) by deployment name prefix.
+CONTEXT_WINDOWS = {
+    "gpt-4o": 128_000,
+    "gpt-4.1": 1_000_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-4": 8_192,
+    "gpt-3.5-turbo": 16_385,
+    "o1": 200_000,
+    "o3": 200_000,
+    "o4-mini": 200_000,
+    "qwen": 32_768,
+    "llama": 8_192,
+}
+DEFAULT_CONTEXT_WINDOW = 32_768
+
+
+def context_window(deployment: str) -> int:
+    name = (deployment or "").lower()
+    # longest matching prefix, so "gpt-4o-mini" maps to "gpt-4o" rather than "gpt-4"
+    matches = [k for k in CONTEXT_WINDOWS if name.startswith(k) or f"/{k}" in name]
+    return CONTEXT_WINDOWS[max(matches, key=len)] if matches else DEFAULT_CONTEXT_WINDOW
+
+
+@lru_cache(maxsize=32)
+def _encoding(deployment: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(deployment)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, deployment: Optional[str] = None) -> int:
+    """Token count with the deployment's tokenizer when tiktoken is available, else ~4 chars per token."""
+    enc = _encoding(deployment or "gpt-4o")
+    if enc is None:
+        return len(text) // 4 + 1
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def prompt_budget(deployment: str, max_output_tokens: int = 4096, fill: float = 0.5) -> int:
+    """
+    Tokens a prompt may use. `fill` keeps prompts well below the window, since listwise
+    judgments degrade on very long inputs long before the hard limit.
+    """
+    return max(int((context_window(deployment) - max_output_tokens) * fill), 1024)
+
+
+def truncate_tokens(text: str, max_tokens: int, deployment: Optional[str] = None, marker: str = " …") -> str:
+    """`text` cut to at most `max_tokens` tokens (the start is kept), with `marker` appended when cut."""
+    if count_tokens(text, deployment) <= max_tokens:
+        return text
+    keep = max(max_tokens - count_tokens(marker, deployment), 0)
+    enc = _encoding(deployment or "gpt-4o")
+    if enc is None:
+        return text[: keep * 4] + marker
+    return enc.decode(enc.encode(text, disallowed_special=())[:keep]) + marker
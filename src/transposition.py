@@ -0,0 +1,120 @@
+import dataclasses
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from singleflight import SingleFlight
+
+
+def _canonical_action(action: str) -> str:
+    return re.sub(r"\s+", " ", action.strip().lower())
+
+
+def _canonical_state(value: Any) -> Any:
+    """JSON-able form of a parsed state in which equal states are equal: sets and dicts are sorted."""
+    if dataclasses.is_dataclass(value):
+        value = {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    if isinstance(value, dict):
+        return sorted(([_canonical_state(k), _canonical_state(v)] for k, v in value.items()), key=repr)
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical_state(v) for v in value), key=repr)
+    if isinstance(value, (list, tuple)):
+        return [_canonical_state(v) for v in value]
+    return value
+
+
+class TranspositionTable:
+    """
+    Memo of expanded tree nodes, so each unique (game state, prior actions, role) node
+    costs one proposal call no matter how many paths, or turns, reach it.
+
+    Args:
+        max_entries (int, optional): LRU bound on stored nodes. None = unbounded.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 50_000):
+        self.max_entries = max_entries
+        self._nodes: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.expansions = 0
+        self.saved = 0
+        self.seeded = 0
+
+    @staticmethod
+    def node_key(game: str, game_state: str, prior_actions: List[str], role: str, k_per_node: int, samples_per_node: int = 1, action_table=None) -> str:
+        """
+        With an `action_table` whose parser has been fed the observation, the node is the
+        parsed game state plus the canonical keys of the moves leading to it, so a position
+        met again on a later turn of the episode (the "game" scope) hits however much the
+        transcript grew in between. Without one, the raw `game_state` text is the key.
+        """
+        parser = action_table.parser if action_table is not None else None
+        if parser is not None:
+            state, path = _canonical_state(parser.state), [action_table.key(a) for a in prior_actions]
+        else:
+            state, path = game_state, [_canonical_action(a) for a in prior_actions]
+        payload = json.dumps([game, role, k_per_node, samples_per_node, path, state], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            actions = self._nodes.get(key)
+            if actions is not None:
+                self._nodes.move_to_end(key)
+                self.saved += 1
+            return actions
+
+    def _store(self, key: str, actions: List[str]) -> None:
+        with self._lock:
+            self.expansions += 1
+            self._nodes[key] = actions
+            self._nodes.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._nodes) > self.max_entries:
+                    self._nodes.popitem(last=False)
+
+    def seed(self, key: str, actions: List[str]) -> None:
+        """Record node `key`'s actions without a proposal call (e.g. carried over from the previous turn's tree)."""
+        with self._lock:
+            if key not in self._nodes:
+                self.seeded += 1
+            self._nodes[key] = list(actions)
+            self._nodes.move_to_end(key)
+
+    def expand(self, key: str, expand_fn: Callable[[], List[str]]) -> List[str]:
+        """Actions for node `key`, calling `expand_fn` only the first time the node is seen."""
+        actions = self._lookup(key)
+        if actions is not None:
+            return list(actions)
+
+        def fetch():
+            result = expand_fn()
+            self._store(key, result)
+            return result
+
+        return list(self._flight.do(key, fetch))
+
+    async def aexpand(self, key: str, expand_fn: Callable[[], Awaitable[List[str]]]) -> List[str]:
+        actions = self._lookup(key)
+        if actions is not None:
+            return list(actions)
+
+        async def fetch():
+            result = await expand_fn()
+            self._store(key, result)
+            return result
+
+        return list(await self._flight.ado(key, fetch))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            saved = self.saved + self._flight.suppressed  # concurrent duplicates count as saved too
+            return {"nodes": len(self._nodes), "expansions": self.expansions, "saved": saved, "seeded": self.seeded}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._nodes.clear()
@@ -0,0 +1,90 @@
+import re
+from typing import Callable, Dict, Optional, Tuple
+
+# Recognise, in a fresh observation, the opponent move that was actually played, so a
+# stored search tree can be advanced past it instead of being rebuilt from scratch.
+
+_ALLOC_TOKEN = re.compile(r"([A-Za-z])\s*:?\s*(\d+)")
+_BLOTTO_ROUND = re.compile(r"Commander Alpha allocated:\s*(.*)\n\s*Commander Beta allocated:\s*(.*)")
+_CODENAMES_CLUE = re.compile(r"Player (\d+), submitted \[(\w+)\s+(\d+)\]")
+_CLUE = re.compile(r"\[(\w+)\s+(\d+)\]")
+_IPD_PAIR = re.compile(r"Player (\d+) vs Player (\d+) chose to (cooperate|defect) and (cooperate|defect)")
+_IPD_TOKEN = re.compile(r"\[\s*(\d+)\s+(cooperate|defect)\s*\]", re.I)
+_IPD_SENTENCE = re.compile(r"Player (\d+) (cooperates|defects) (?:with|against) Player (\d+)", re.I)
+
+
+def _strip_tags(action: str) -> str:
+    return re.sub(r"</?(?:opponent_)?action>", "", action).strip()
+
+
+def _allocation(text: str) -> Optional[Tuple[Tuple[str, int], ...]]:
+    body = re.search(r"\[([^\]]+)\]", text)
+    tokens = _ALLOC_TOKEN.findall(body.group(1) if body else text)
+    if not tokens:
+        return None
+    alloc: Dict[str, int] = {}
+    for field, units in tokens:
+        alloc[field.upper()] = int(units)
+    return tuple(sorted((f, u) for f, u in alloc.items() if u))
+
+
+def _blotto_opponent(observation: str, agent_action: str) -> Optional[Callable[[str], bool]]:
+    rounds = _BLOTTO_ROUND.findall(observation)
+    if not rounds:
+        return None
+    alpha, beta = (_allocation(x) for x in rounds[-1])
+    mine = _allocation(agent_action)
+    if mine == alpha:
+        opponent = beta
+    elif mine == beta:
+        opponent = alpha
+    else:
+        return None
+    return lambda action: _allocation(_strip_tags(action)) == opponent
+
+
+def _codenames_opponent(observation: str, agent_action: str) -> Optional[Callable[[str], bool]]:
+    mine = _CLUE.search(agent_action)
+    mine = (mine.group(1).lower(), int(mine.group(2))) if mine else None
+    for _, word, number in reversed(_CODENAMES_CLUE.findall(observation)):
+        clue = (word.lower(), int(number))
+        if clue != mine:
+            def match(action: str, clue=clue) -> bool:
+                m = _CLUE.search(_strip_tags(action))
+                return bool(m) and (m.group(1).lower(), int(m.group(2))) == clue
+            return match
+    return None
+
+
+def _ipd_opponent(observation: str, agent_action: str) -> Optional[Callable[[str], bool]]:
+    pairs = _IPD_PAIR.findall(observation)
+    mine = {int(pid) for pid, _ in _IPD_TOKEN.findall(agent_action)}
+    if len(pairs) < 3 or len(mine) != 2:
+        return None
+    me = ({0, 1, 2} - mine).pop()
+    decisions: Dict[Tuple[int, int], str] = {}
+    for i, j, ci, cj in pairs[-3:]:  # last round: one line per unordered pair
+        decisions[(int(i), int(j))] = ci
+        decisions[(int(j), int(i))] = cj
+    expected = {edge: choice for edge, choice in decisions.items() if edge[0] != me}
+
+    def match(action: str) -> bool:
+        claimed: Dict[Tuple[int, int], str] = {}
+        for i, verb, j in _IPD_SENTENCE.findall(action):
+            claimed[(int(i), int(j))] = "defect" if verb.lower().startswith("d") else "cooperate"
+        return bool(claimed) and all(expected.get(edge) == choice for edge, choice in claimed.items())
+    return match
+
+
+def observed_opponent_move(game: str, observation: str, agent_action: str) -> Optional[Callable[[str], bool]]:
+    """
+    Predicate that recognises the opponent move actually played since `agent_action`,
+    or None if it cannot be read from the observation.
+    """
+    if game == "colonel blotto":
+        return _blotto_opponent(observation, agent_action)
+    if game == "codenames":
+        return _codenames_opponent(observation, agent_action)
+    if game == "3-player iterated prisoner's dilemma":
+        return _ipd_opponent(observation, agent_action)
+    return None